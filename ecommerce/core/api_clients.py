@@ -0,0 +1,250 @@
+"""Process-wide pools of API clients and HTTP connections used to call other services on behalf of a site.
+
+Building an EdxRestApiClient creates a new HTTP session, and with it a new connection to the service, so clients
+built for each call, or for each SiteConfiguration instance, never reuse connections. Instead, each process keeps
+one connection pool per site and service, and one client per site for services called as the site's service user.
+
+The access tokens of sites' service users are also kept by each process, and shared between processes through
+the cache. A token is renewed by a single thread, ACCESS_TOKEN_REFRESH_MARGIN seconds before it expires; other
+threads continue to use the current token in the meantime.
+"""
+import datetime
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from edx_rest_api_client.auth import SuppliedJwtAuth
+from edx_rest_api_client.client import EdxRestApiClient
+import requests
+
+from ecommerce.extensions.payment.sessions import PooledHTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+COURSE_CATALOG_SERVICE = 'course_catalog'
+LMS_SERVICE = 'lms'
+
+_adapters = {}
+_clients = {}
+_tokens = {}
+_token_locks = {}
+# IDs of the site configurations whose access tokens this process has stored in the cache.
+_cached_tokens = set()
+_lock = threading.Lock()
+_pid = None
+
+
+def _ensure_process():
+    """ Discards the connections, clients and locks inherited from a parent process. """
+    global _pid  # pylint: disable=global-statement
+
+    pid = os.getpid()
+    if _pid != pid:
+        with _lock:
+            if _pid != pid:
+                # Connections may not be shared between processes, and locks held by other threads at the time of
+                # the fork are never released in the child.
+                _adapters.clear()
+                _clients.clear()
+                _token_locks.clear()
+                _pid = pid
+
+
+def clear_api_clients(site_configuration_id=None):
+    """ Discards the connection pools, clients, access tokens and token locks held by this process.
+
+    Arguments:
+        site_configuration_id (int): If provided, only those of this site configuration are discarded.
+    """
+    with _lock:
+        for registry in (_adapters, _clients, _tokens, _token_locks):
+            for key in list(registry.keys()):
+                if site_configuration_id is None or key[0] == site_configuration_id:
+                    del registry[key]
+
+
+def reset_api_clients():
+    """ Discards everything held by this process, as clear_api_clients does, and the access tokens it has shared
+    through the cache, so that no state is carried over (e.g. from one test to the next). """
+    clear_api_clients()
+
+    with _lock:
+        cache_keys = [_get_access_token_cache_key(site_configuration_id) for site_configuration_id in _cached_tokens]
+        _cached_tokens.clear()
+
+    cache.delete_many(cache_keys)
+
+
+def get_http_adapter(site_configuration, service):
+    """ Returns the process-wide connection pool used to call the given service on behalf of the given site.
+
+    Arguments:
+        site_configuration (SiteConfiguration): Site on whose behalf the service is called.
+        service (str): Name of the service (e.g. lms).
+
+    Returns:
+        requests.adapters.HTTPAdapter
+    """
+    _ensure_process()
+    key = (site_configuration.id, service)
+    adapter = _adapters.get(key)
+
+    if adapter is None:
+        with _lock:
+            adapter = _adapters.get(key)
+            if adapter is None:
+                adapter = _adapters[key] = PooledHTTPAdapter(
+                    service,
+                    timeout=settings.API_CLIENT_TIMEOUT,
+                    metric_prefix='api_clients.http',
+                    pool_connections=settings.API_CLIENT_POOL_SIZE,
+                    pool_maxsize=settings.API_CLIENT_POOL_SIZE
+                )
+
+    return adapter
+
+
+def create_http_session(site_configuration, service):
+    """ Returns a new session whose requests are sent over the process-wide connection pool of the site and service.
+
+    Sessions hold their authentication, so a new session should be used for each set of credentials (e.g. for
+    calls made on behalf of a user), while connections are shared.
+    """
+    adapter = get_http_adapter(site_configuration, service)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def create_api_client(site_configuration, service, url, **kwargs):
+    """ Returns a new API client, whose requests are sent over the connection pool of the site and service.
+
+    Arguments:
+        site_configuration (SiteConfiguration): Site on whose behalf the service is called.
+        service (str): Name of the service (e.g. lms).
+        url (str): Root URL of the API.
+        **kwargs: Additional arguments of EdxRestApiClient (e.g. oauth_access_token).
+
+    Returns:
+        EdxRestApiClient
+    """
+    return EdxRestApiClient(
+        url,
+        session=create_http_session(site_configuration, service),
+        timeout=settings.API_CLIENT_TIMEOUT,
+        **kwargs
+    )
+
+
+def get_course_catalog_api_client(site_configuration):
+    """ Returns the process-wide Course Catalog API client of the given site.
+
+    Requests are authenticated with the site's current access token, so the client is not affected by the
+    renewal of tokens.
+
+    Returns:
+        EdxRestApiClient
+    """
+    _ensure_process()
+    key = (site_configuration.id, COURSE_CATALOG_SERVICE)
+    client = _clients.get(key)
+
+    if client is None:
+        client = EdxRestApiClient(
+            settings.COURSE_CATALOG_API_URL,
+            session=create_http_session(site_configuration, COURSE_CATALOG_SERVICE),
+            timeout=settings.API_CLIENT_TIMEOUT
+        )
+        # The session's authentication is used by every request the client makes.
+        client._store['session'].auth = SiteAccessTokenAuth(site_configuration)  # pylint: disable=protected-access
+
+        with _lock:
+            client = _clients.setdefault(key, client)
+
+    return client
+
+
+class SiteAccessTokenAuth(SuppliedJwtAuth):
+    """ Attaches the current access token of a site's service user to requests. """
+
+    def __init__(self, site_configuration):  # pylint: disable=super-init-not-called
+        self.site_configuration = site_configuration
+
+    @property
+    def token(self):
+        return get_site_access_token(self.site_configuration)
+
+
+def get_site_access_token(site_configuration):
+    """ Returns an access token for the given site's service user.
+
+    The token is retrieved using the site's OAuth credentials and the client credentials grant, and kept until it is
+    about to expire. Only one thread of each process retrieves a new token at a time. While a token that has not yet
+    expired is being renewed, other threads use it rather than wait.
+
+    Returns:
+        str: JWT access token
+    """
+    _ensure_process()
+    key = (site_configuration.id,)
+    entry = _tokens.get(key)
+
+    if entry and time.time() < entry[1] - settings.ACCESS_TOKEN_REFRESH_MARGIN:
+        return entry[0]
+
+    with _lock:
+        token_lock = _token_locks.setdefault(key, threading.Lock())
+
+    is_valid = entry is not None and time.time() < entry[1]
+    if not token_lock.acquire(not is_valid):
+        # Another thread is renewing the token.
+        return entry[0]
+
+    try:
+        latest = _tokens.get(key)
+        if latest and time.time() < latest[1] - settings.ACCESS_TOKEN_REFRESH_MARGIN:
+            # Another thread renewed the token while we waited.
+            return latest[0]
+
+        try:
+            entry = _tokens[key] = _retrieve_access_token(site_configuration)
+        except Exception:  # pylint: disable=broad-except
+            if not is_valid:
+                raise
+            logger.exception('Failed to renew the access token of site configuration [%d]. '
+                             'The current token will be used until it expires.', site_configuration.id)
+
+        return entry[0]
+    finally:
+        token_lock.release()
+
+
+def _get_access_token_cache_key(site_configuration_id):
+    return 'siteconfiguration_access_token_{}'.format(site_configuration_id)
+
+
+def _retrieve_access_token(site_configuration):
+    """ Returns an access token, and the time at which it expires, from the cache, or else from the OAuth provider. """
+    cache_key = _get_access_token_cache_key(site_configuration.id)
+    entry = cache.get(cache_key)
+
+    # pylint: disable=unsubscriptable-object
+    if not isinstance(entry, tuple) or time.time() >= entry[1] - settings.ACCESS_TOKEN_REFRESH_MARGIN:
+        url = '{root}/access_token'.format(root=site_configuration.oauth2_provider_url)
+        access_token, expiration_datetime = EdxRestApiClient.get_oauth_access_token(
+            url,
+            site_configuration.oauth_settings['SOCIAL_AUTH_EDX_OIDC_KEY'],
+            site_configuration.oauth_settings['SOCIAL_AUTH_EDX_OIDC_SECRET'],
+            token_type='jwt'
+        )
+
+        expires_in = (expiration_datetime - datetime.datetime.utcnow()).total_seconds()
+        entry = (access_token, time.time() + expires_in)
+        cache.set(cache_key, entry, max(int(expires_in), 1))
+        _cached_tokens.add(site_configuration.id)
+
+    return entry
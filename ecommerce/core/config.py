@@ -19,6 +19,9 @@ class CoreAppConfig(AppConfig):
         # Allows Celery tasks to bind themselves to an initialized instance of the Celery library.
         from ecommerce import celery_app  # pylint: disable=unused-variable
 
+        # noinspection PyUnresolvedReferences
+        import ecommerce.core.signals  # pylint: disable=unused-variable
+
         from ecommerce.core.models import validate_configuration
         # Operational error means database did not contain SiteConfiguration table - ok to skip since it means there
         # are no SiteConfiguration models to validate. Also, this exception was only observed in tests and test run
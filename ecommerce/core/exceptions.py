@@ -1,3 +1,13 @@
 class MissingRequestError(Exception):
     """ Raised when the current request is missing from threadlocal storage """
     pass
+
+
+class ExecutorUnavailableError(Exception):
+    """ Raised when an executor cannot accept work, because its queue is full or it is shutting down. """
+    pass
+
+
+class HealthCheckError(Exception):
+    """ Raised when a health check finds that a dependency is unavailable. """
+    pass
@@ -0,0 +1,285 @@
+"""Bounded, in-process thread pools used to run work outside of the request/response cycle."""
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+from Queue import Empty, Full, Queue
+
+from django.db import close_old_connections
+from django.utils import six
+
+from ecommerce.core.exceptions import ExecutorUnavailableError
+from ecommerce.core.metrics import get_metrics_sink
+
+logger = logging.getLogger(__name__)
+
+# Sentinel placed on the queue to stop a worker thread.
+_STOP = object()
+
+
+def _count_tasks(queue):
+    """ Returns the number of tasks on the queue, excluding the sentinels queued to stop the workers. """
+    with queue.mutex:
+        return sum(1 for task in queue.queue if task is not _STOP)
+
+
+class BoundedThreadPool(object):
+    """ Fixed-size pool of daemon threads consuming tasks from a bounded queue.
+
+    Worker threads are started lazily, in the process submitting work, so that pools created before a
+    pre-fork server forks its workers are usable in each worker process. On interpreter exit the pool stops
+    accepting work and waits up to drain_timeout seconds for queued tasks to complete.
+
+    The following metrics are reported to the metrics sink:
+
+        executor.<name>.queue_depth (gauge): Number of tasks waiting to run.
+        executor.<name>.wait_time (timing): Time tasks spent in the queue.
+        executor.<name>.run_time (timing): Time spent running tasks.
+        executor.<name>.rejected (counter): Tasks rejected because the queue was full.
+        executor.<name>.failed (counter): Tasks that raised an exception.
+    """
+
+    def __init__(self, name, max_workers, max_queue_size, drain_timeout=None):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.drain_timeout = drain_timeout
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._workers = []
+        self._is_shutdown = False
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._lock:
+            if self._pid == pid:
+                return
+
+            # Threads do not survive a fork. Any queue and workers inherited from a parent process are discarded.
+            self._queue = Queue(maxsize=self.max_queue_size)
+            self._workers = []
+            self._is_shutdown = False
+
+            for index in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._work, args=(self._queue,), name='{name}-{index}'.format(name=self.name, index=index)
+                )
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+
+            self._pid = pid
+
+        atexit.register(self.shutdown, self.drain_timeout)
+
+    def _metric(self, metric):
+        return 'executor.{name}.{metric}'.format(name=self.name, metric=metric)
+
+    @property
+    def queue_depth(self):
+        """ Number of tasks waiting to be picked up by a worker. """
+        return _count_tasks(self._queue) if self._queue is not None and self._pid == os.getpid() else 0
+
+    def submit(self, func, *args, **kwargs):
+        """ Queues a call to func(*args, **kwargs) on one of the pool's threads.
+
+        Raises:
+            ExecutorUnavailableError: If the queue is full, or the pool has been shut down.
+        """
+        self._ensure_started()
+        sink = get_metrics_sink()
+
+        if self._is_shutdown:
+            raise ExecutorUnavailableError('Executor [{}] has been shut down.'.format(self.name))
+
+        try:
+            self._queue.put_nowait((func, args, kwargs, time.time()))
+        except Full:
+            sink.increment(self._metric('rejected'))
+            raise ExecutorUnavailableError('Executor [{}] queue is full.'.format(self.name))
+
+        sink.gauge(self._metric('queue_depth'), self.queue_depth)
+
+    def _work(self, queue):
+        sink = get_metrics_sink()
+
+        while True:
+            task = queue.get()
+            try:
+                if task is _STOP:
+                    return
+
+                func, args, kwargs, enqueued = task
+                start = time.time()
+                sink.timing(self._metric('wait_time'), (start - enqueued) * 1000)
+
+                # Tasks run outside of the request/response cycle, so we must manage database connections
+                # ourselves, as Django does at the start and end of each request.
+                close_old_connections()
+                try:
+                    func(*args, **kwargs)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception('An unexpected error occurred while running [%s] on executor [%s].',
+                                     getattr(func, '__name__', func), self.name)
+                    sink.increment(self._metric('failed'))
+                finally:
+                    close_old_connections()
+                    sink.timing(self._metric('run_time'), (time.time() - start) * 1000)
+                    sink.gauge(self._metric('queue_depth'), _count_tasks(queue))
+            finally:
+                queue.task_done()
+
+    def shutdown(self, timeout=None):
+        """ Stops accepting work, and waits for queued tasks to complete.
+
+        Arguments:
+            timeout (float): Maximum number of seconds to wait. If None, wait until all tasks are complete.
+
+        Returns:
+            bool: True if all tasks completed; otherwise, False.
+        """
+        with self._lock:
+            if self._pid != os.getpid() or self._is_shutdown:
+                return True
+
+            self._is_shutdown = True
+            workers = self._workers
+
+        deadline = None if timeout is None else time.time() + timeout
+
+        def remaining():
+            return None if deadline is None else max(deadline - time.time(), 0)
+
+        try:
+            for __ in workers:
+                self._queue.put(_STOP, timeout=remaining())
+        except Full:
+            pass
+
+        for worker in workers:
+            worker.join(remaining())
+
+        if any(worker.is_alive() for worker in workers):
+            logger.warning('Executor [%s] shut down before completing all tasks.', self.name)
+            return False
+
+        logger.info('Executor [%s] shut down after completing all tasks.', self.name)
+        return True
+
+
+def map_concurrently(func, items, max_workers):
+    """ Calls func with each of the given items, on up to max_workers short-lived threads, and waits for the results.
+
+    This is intended for fanning out I/O-bound calls (e.g. requests to a remote API) made while handling a single
+    operation. The threads do not manage database connections, so func should not use the database; load any
+    data it needs beforehand.
+
+    Arguments:
+        func (callable): Function called with each item.
+        items (list): Items to be processed.
+        max_workers (int): Maximum number of threads to use. Items are processed on the calling thread if this,
+            or the number of items, is 1.
+
+    Returns:
+        list: The result of each call, in the order of the given items.
+
+    Raises:
+        Exception: The first exception raised by func, if any, once all calls have completed.
+    """
+    items = list(items)
+    workers = min(max_workers, len(items))
+
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    results = [None] * len(items)
+    errors = []
+    queue = Queue()
+    for index, item in enumerate(items):
+        queue.put((index, item))
+
+    def work():
+        while True:
+            try:
+                index, item = queue.get_nowait()
+            except Empty:
+                return
+
+            try:
+                results[index] = func(item)
+            except Exception:  # pylint: disable=broad-except
+                errors.append(sys.exc_info())
+
+    threads = [threading.Thread(target=work) for __ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        six.reraise(*errors[0])
+
+    return results
+
+
+def iter_concurrently(func, items, max_workers):
+    """ Calls func with each of the given items, on up to max_workers short-lived threads, yielding results as
+    they become available.
+
+    Unlike map_concurrently, results are yielded in the order in which the calls complete, so that callers can
+    report progress while the remaining calls are in flight. As with map_concurrently, func should not rely on
+    the calling thread's database connection.
+
+    Arguments:
+        func (callable): Function called with each item.
+        items (list): Items to be processed.
+        max_workers (int): Maximum number of threads to use. Items are processed on the calling thread, one at a
+            time as the results are consumed, if this, or the number of items, is 1.
+
+    Yields:
+        tuple: Each item, and the result of calling func with it.
+
+    Raises:
+        Exception: Any exception raised by func, when the result of the corresponding call is reached.
+    """
+    items = list(items)
+    workers = min(max_workers, len(items))
+
+    if workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    pending = Queue()
+    completed = Queue()
+    for item in items:
+        pending.put(item)
+
+    def work():
+        while True:
+            try:
+                item = pending.get_nowait()
+            except Empty:
+                return
+
+            try:
+                completed.put((item, func(item), None))
+            except Exception:  # pylint: disable=broad-except
+                completed.put((item, None, sys.exc_info()))
+
+    for __ in range(workers):
+        thread = threading.Thread(target=work)
+        thread.daemon = True
+        thread.start()
+
+    for __ in range(len(items)):
+        item, result, exc_info = completed.get()
+        if exc_info:
+            six.reraise(*exc_info)
+        yield item, result
@@ -0,0 +1,256 @@
+"""Health checks of the services on which the ecommerce front-end depends.
+
+Load balancers probe the health endpoint every few seconds, each from several hosts. Rather than checking every
+dependency on each probe, a background thread of each process checks them every HEALTH_CHECK_INTERVAL seconds, and
+the endpoint serves the latest results. Results older than HEALTH_CHECK_MAX_AGE seconds (e.g. if the thread has
+stalled), and those of dependencies that have not yet been checked, are refreshed while the caller waits, as are all
+results when a deep check is requested.
+"""
+import atexit
+import datetime
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from urlparse import urljoin, urlparse
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+
+from ecommerce.celery_app import app as celery_app
+from ecommerce.core.constants import ISO_8601_FORMAT, Status
+from ecommerce.core.exceptions import HealthCheckError
+
+logger = logging.getLogger(__name__)
+
+DATABASE = 'database'
+CACHE = 'cache'
+BROKER = 'broker'
+LMS = 'lms'
+CATALOG = 'catalog'
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_health_monitor():
+    """ Returns the process-wide health monitor. """
+    global _monitor  # pylint: disable=global-statement
+
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = HealthMonitor(
+                    'health-monitor', settings.HEALTH_CHECK_INTERVAL, settings.HEALTH_CHECK_MAX_AGE
+                )
+
+    return _monitor
+
+
+class Probe(namedtuple('Probe', ['name', 'check', 'target'])):
+    """ Check of a dependency.
+
+    The check is a callable that raises an exception if the dependency is unavailable. Probes of the same
+    dependency at different targets (e.g. the LMS of each site) are checked, and their results kept, separately.
+    """
+
+    @property
+    def key(self):
+        return self.name, self.target
+
+
+class ProbeResult(namedtuple('ProbeResult', ['status', 'checked_at', 'latency', 'error'])):
+    """ Result of a probe, holding the time (in seconds since the epoch) at which it was checked, and the time (in
+    milliseconds) the check took. """
+
+    def as_dict(self, include_error=False):
+        """ Returns the result as a dict. Errors may reveal details of the dependency, so they are only included
+        if requested. """
+        data = {
+            'status': self.status,
+            'checked_at': datetime.datetime.utcfromtimestamp(self.checked_at).strftime(ISO_8601_FORMAT),
+            'latency_ms': round(self.latency, 1),
+        }
+
+        if include_error:
+            data['error'] = self.error
+
+        return data
+
+
+def get_probes(lms_heartbeat_url):
+    """ Returns the probes of the dependencies of the ecommerce front-end.
+
+    Arguments:
+        lms_heartbeat_url (str): URL of the heartbeat page of the LMS of the current site.
+
+    Returns:
+        list of Probe
+    """
+    probes = [
+        Probe(DATABASE, check_database, None),
+        Probe(CACHE, check_cache, None),
+    ]
+
+    if settings.BROKER_URL:
+        # The broker URL may include credentials. The check uses the app's connection, so only the host is kept.
+        probes.append(Probe(BROKER, check_broker, redact_url(settings.BROKER_URL)))
+
+    probes.append(Probe(LMS, check_url, lms_heartbeat_url))
+
+    if settings.COURSE_CATALOG_API_URL:
+        probes.append(Probe(CATALOG, check_url, urljoin(settings.COURSE_CATALOG_API_URL, '/health/')))
+
+    return probes
+
+
+def redact_url(url):
+    """ Returns the scheme, host and port of the URL, omitting any credentials, path or query string. """
+    parsed = urlparse(url)
+    netloc = parsed.hostname or ''
+    if parsed.port:
+        netloc = '{}:{}'.format(netloc, parsed.port)
+
+    return '{}://{}'.format(parsed.scheme, netloc)
+
+
+def check_database(_target):
+    cursor = connection.cursor()
+    try:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+    finally:
+        cursor.close()
+
+
+def check_cache(_target):
+    # Some cache backends (e.g. memcached) fail silently, so the value is read back.
+    key = 'health_check_{}'.format(os.getpid())
+    value = time.time()
+    cache.set(key, value, 60)
+    if cache.get(key) != value:
+        raise HealthCheckError('Value written to the cache could not be read.')
+
+
+def check_broker(_target):
+    conn = celery_app.connection()
+    try:
+        conn.connect()
+    finally:
+        conn.release()
+
+
+def check_url(url):
+    response = requests.get(url, timeout=settings.HEALTH_CHECK_TIMEOUT)
+    if response.status_code != 200:
+        raise HealthCheckError('Status code [{}] returned.'.format(response.status_code))
+
+
+def run_probe(probe):
+    """ Checks the dependency of the probe, and returns the result. """
+    start = time.time()
+    try:
+        probe.check(probe.target)
+        status, error = Status.OK, None
+    except Exception as ex:  # pylint: disable=broad-except
+        status, error = Status.UNAVAILABLE, '{}: {}'.format(type(ex).__name__, ex)
+
+    return ProbeResult(status, start, (time.time() - start) * 1000, error)
+
+
+class HealthMonitor(object):
+    """ Checks, on a daemon thread, the dependencies whose health has been requested, and keeps the latest results.
+
+    As with BoundedThreadPool, the thread is started lazily, in the process requesting results, so that monitors
+    created before a pre-fork server forks its workers are usable in each worker process. If the interval is
+    zero, no thread is started, and each request checks the dependencies.
+    """
+
+    def __init__(self, name, interval, max_age):
+        self.name = name
+        self.interval = interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pid = None
+        self._probes = {}
+        self._results = {}
+        self._stopped = threading.Event()
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if not self.interval or self._pid == pid:
+            return
+
+        with self._lock:
+            if self._pid == pid:
+                return
+
+            # Threads do not survive a fork. Probes and results inherited from a parent process are discarded.
+            self._probes = {}
+            self._results = {}
+            self._stopped = threading.Event()
+            worker = threading.Thread(target=self._work, args=(self._stopped,), name=self.name)
+            worker.daemon = True
+            worker.start()
+            self._pid = pid
+
+        atexit.register(self.stop)
+
+    def get_results(self, probes, deep=False):
+        """ Returns the results of the given probes.
+
+        Arguments:
+            probes (list of Probe): Probes whose results are returned. They are checked by the monitor's thread
+                from now on.
+            deep (bool): If True, the probes are checked while the caller waits.
+
+        Returns:
+            dict: ProbeResult of each probe, keyed by probe name.
+        """
+        self._ensure_started()
+        now = time.time()
+        results = {}
+
+        for probe in probes:
+            result = self._results.get(probe.key)
+            if deep or not self.interval or result is None or now - result.checked_at > self.max_age:
+                result = self._record(probe, run_probe(probe))
+            results[probe.name] = result
+
+        return results
+
+    def refresh(self):
+        """ Checks all of the probes whose results have been requested. """
+        for probe in list(self._probes.values()):
+            self._record(probe, run_probe(probe))
+
+    def _record(self, probe, result):
+        previous = self._results.get(probe.key)
+        if previous is not None and previous.status != result.status:
+            logger.warning('Health of [%s] at [%s] changed from [%s] to [%s]. %s',
+                           probe.name, probe.target, previous.status, result.status, result.error or '')
+
+        with self._lock:
+            self._probes[probe.key] = probe
+            self._results[probe.key] = result
+
+        return result
+
+    def _work(self, stopped):
+        while not stopped.wait(self.interval):
+            # Probes run outside of the request/response cycle, so we must manage database connections
+            # ourselves, as Django does at the start and end of each request.
+            close_old_connections()
+            try:
+                self.refresh()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('An unexpected error occurred while checking health on [%s].', self.name)
+            finally:
+                close_old_connections()
+
+    def stop(self):
+        """ Stops the monitor's thread. """
+        self._stopped.set()
@@ -0,0 +1,212 @@
+"""Pluggable metrics sinks used to record latency and counters for internal operations.
+
+The sink used by the application is configured by the METRICS_SINK setting, which holds the dotted path of a
+class extending BaseMetricsSink. Keyword arguments for the sink may be supplied via METRICS_SINK_OPTIONS.
+"""
+import bisect
+import logging
+import socket
+import threading
+
+from django.conf import settings
+from django.utils import importlib
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (in milliseconds, or raw counts for non-timing metrics) of the histogram buckets
+# maintained by HistogramMetricsSink. Values above the last bound fall into an overflow bucket.
+DEFAULT_HISTOGRAM_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+
+class BaseMetricsSink(object):  # pragma: no cover
+    """ Base class for metrics sinks.
+
+    Metric names are dotted, statsd-style strings (e.g. fulfillment.module.EnrollmentFulfillmentModule.wall_time).
+    """
+
+    def timing(self, name, value):
+        """ Records a duration, in milliseconds. """
+        raise NotImplementedError
+
+    def histogram(self, name, value):
+        """ Records a value, other than a duration, whose distribution should be tracked (e.g. a query count). """
+        raise NotImplementedError
+
+    def increment(self, name, value=1):
+        """ Increments a counter. """
+        raise NotImplementedError
+
+    def gauge(self, name, value):
+        """ Records the current value of a gauge. """
+        raise NotImplementedError
+
+    def snapshot(self):
+        """ Returns a JSON-serializable representation of the data collected by this sink, if any. """
+        return {}
+
+
+class NullMetricsSink(BaseMetricsSink):
+    """ Sink that discards all metrics. """
+
+    def timing(self, name, value):
+        pass
+
+    def histogram(self, name, value):
+        pass
+
+    def increment(self, name, value=1):
+        pass
+
+    def gauge(self, name, value):
+        pass
+
+
+class StatsdMetricsSink(BaseMetricsSink):
+    """ Sink that emits metrics, using the statsd line protocol, to a statsd daemon over UDP. """
+
+    def __init__(self, host='localhost', port=8125, prefix='ecommerce'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _send(self, name, value, metric_type):
+        if self.prefix:
+            name = '{prefix}.{name}'.format(prefix=self.prefix, name=name)
+
+        try:
+            self.socket.sendto('{name}:{value}|{type}'.format(name=name, value=value, type=metric_type), self.address)
+        except socket.error:
+            # Metrics must never interfere with the operation being measured.
+            logger.debug('Failed to send metric [%s] to statsd.', name)
+
+    def timing(self, name, value):
+        self._send(name, int(round(value)), 'ms')
+
+    def histogram(self, name, value):
+        self._send(name, value, 'h')
+
+    def increment(self, name, value=1):
+        self._send(name, value, 'c')
+
+    def gauge(self, name, value):
+        self._send(name, value, 'g')
+
+
+class Histogram(object):
+    """ Bucketed distribution of recorded values. Instances are NOT thread-safe. """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent):
+        """ Returns the upper bound of the bucket containing the given percentile, or None if nothing was recorded.
+
+        The overflow bucket reports the largest recorded value.
+        """
+        if not self.count:
+            return None
+
+        threshold = self.count * percent / 100.0
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= threshold:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+
+        return self.max  # pragma: no cover
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / float(self.count) if self.count else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+class HistogramMetricsSink(BaseMetricsSink):
+    """ In-process sink that aggregates timings and other distributions into histograms, and keeps counters and
+    gauges in memory.
+
+    Data is kept per process; the snapshot exposed by the metrics view reflects only the serving process.
+    """
+
+    def __init__(self, buckets=DEFAULT_HISTOGRAM_BUCKETS):
+        self.bucket_bounds = tuple(sorted(buckets))
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+            self.gauges = {}
+
+    def timing(self, name, value):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.bucket_bounds)
+            histogram.record(value)
+
+    histogram = timing
+
+    def increment(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'histograms': {name: histogram.as_dict() for name, histogram in self.histograms.items()},
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+            }
+
+
+def get_metrics_sink():
+    """ Returns the process-wide instance of the sink configured by the METRICS_SINK setting.
+
+    If the configured sink cannot be loaded, the error is logged and a NullMetricsSink is used instead.
+    """
+    cls_path = getattr(settings, 'METRICS_SINK', 'ecommerce.core.metrics.NullMetricsSink')
+    sink = _sinks.get(cls_path)
+
+    if sink is None:
+        with _sinks_lock:
+            sink = _sinks.get(cls_path)
+            if sink is None:
+                try:
+                    module_path, _, name = cls_path.rpartition('.')
+                    sink_class = getattr(importlib.import_module(module_path), name)
+                    sink = sink_class(**getattr(settings, 'METRICS_SINK_OPTIONS', {}))
+                except (ImportError, ValueError, AttributeError, TypeError):
+                    logger.exception('Could not load metrics sink at [%s]', cls_path)
+                    sink = NullMetricsSink()
+
+                _sinks[cls_path] = sink
+
+    return sink
@@ -1,28 +1,32 @@
-import datetime
+import hashlib
 import logging
 from urlparse import urljoin
 
-from analytics import Client as SegmentClient
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.sites.models import Site
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
-from edx_rest_api_client.client import EdxRestApiClient
 from jsonfield.fields import JSONField
 from requests.exceptions import ConnectionError, Timeout
 from slumber.exceptions import SlumberBaseException
+from threadlocals.threadlocals import get_current_request
 
-from ecommerce.core.url_utils import get_lms_url
-from ecommerce.courses.utils import mode_for_seat
+from ecommerce.core.api_clients import (LMS_SERVICE, create_api_client, get_course_catalog_api_client,
+                                        get_site_access_token)
+from ecommerce.courses.utils import get_enrollment_status_cache_key, mode_for_seat
+from ecommerce.credit.utils import get_credit_eligibility
+from ecommerce.extensions.analytics.utils import get_segment_client
 from ecommerce.extensions.payment.exceptions import ProcessorNotFoundError
-from ecommerce.extensions.payment.helpers import get_processor_class_by_name, get_processor_class
+from ecommerce.extensions.payment.helpers import get_processor_class_by_name, get_processor_registry
 
 log = logging.getLogger(__name__)
 
+# Default of memoized values that have not been read yet, which distinguishes them from values read as None.
+_NOT_READ = object()
+
 
 class SiteConfiguration(models.Model):
     """Custom Site model for custom sites/microsites.
@@ -137,10 +141,9 @@ class SiteConfiguration(models.Model):
         Returns:
             list[BasePaymentProcessor]: Returns payment processor classes enabled for the corresponding Site
         """
-        all_processors = [get_processor_class(path) for path in settings.PAYMENT_PROCESSORS]
-        all_processor_names = {processor.NAME for processor in all_processors}
+        all_processors = get_processor_registry()
 
-        missing_processor_configurations = self.payment_processors_set - all_processor_names
+        missing_processor_configurations = self.payment_processors_set - set(all_processors)
         if missing_processor_configurations:
             processor_config_repr = ", ".join(missing_processor_configurations)
             log.warning(
@@ -148,7 +151,7 @@ class SiteConfiguration(models.Model):
             )
 
         return [
-            processor for processor in all_processors
+            processor for processor in all_processors.values()
             if processor.NAME in self.payment_processors_set and processor.is_enabled()
         ]
 
@@ -167,9 +170,9 @@ class SiteConfiguration(models.Model):
         if not exclude or 'payment_processors' not in exclude:
             self._clean_payment_processors()
 
-    @cached_property
+    @property
     def segment_client(self):
-        return SegmentClient(self.segment_key, debug=settings.DEBUG)
+        return get_segment_client(self.segment_key)
 
     def save(self, *args, **kwargs):
         # Clear Site cache upon SiteConfiguration changed
@@ -226,40 +229,25 @@ class SiteConfiguration(models.Model):
         """ Returns an access token for this site's service user.
 
         The access token is retrieved using the current site's OAuth credentials and the client credentials grant.
-        The token is cached for the lifetime of the token, as specified by the OAuth provider's response. The token
-        type is JWT.
+        The token is cached until shortly before it expires, as specified by the OAuth provider's response, and
+        renewed by a single thread of each process. The token type is JWT.
 
         Returns:
             str: JWT access token
         """
-        key = 'siteconfiguration_access_token_{}'.format(self.id)
-        access_token = cache.get(key)
-
-        # pylint: disable=unsubscriptable-object
-        if not access_token:
-            url = '{root}/access_token'.format(root=self.oauth2_provider_url)
-            access_token, expiration_datetime = EdxRestApiClient.get_oauth_access_token(
-                url,
-                self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_KEY'],
-                self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_SECRET'],
-                token_type='jwt'
-            )
-
-            expires = (expiration_datetime - datetime.datetime.utcnow()).seconds
-            cache.set(key, access_token, expires)
-
-        return access_token
+        return get_site_access_token(self)
 
-    @cached_property
+    @property
     def course_catalog_api_client(self):
         """
         Returns an API client to access the Course Catalog service.
 
+        The client, and its connections, are shared by all instances of this site configuration in the process.
+
         Returns:
             EdxRestApiClient: The client to access the Course Catalog service.
         """
-
-        return EdxRestApiClient(settings.COURSE_CATALOG_API_URL, jwt=self.access_token)
+        return get_course_catalog_api_client(self)
 
 
 class User(AbstractUser):
@@ -269,10 +257,16 @@ class User(AbstractUser):
 
     @property
     def access_token(self):
-        try:
-            return self.social_auth.first().extra_data[u'access_token']  # pylint: disable=no-member
-        except Exception:  # pylint: disable=broad-except
-            return None
+        # The token, or its absence, is kept once read, since it is read by every call made to the LMS on behalf of
+        # the user.
+        access_token = getattr(self, '_access_token', _NOT_READ)
+        if access_token is _NOT_READ:
+            try:
+                access_token = self.social_auth.first().extra_data[u'access_token']  # pylint: disable=no-member
+            except Exception:  # pylint: disable=broad-except
+                access_token = None
+            self._access_token = access_token  # pylint: disable=attribute-defined-outside-init
+        return access_token
 
     tracking_context = JSONField(blank=True, null=True)
 
@@ -283,11 +277,117 @@ class User(AbstractUser):
     def get_full_name(self):
         return self.full_name or super(User, self).get_full_name()
 
+    def _get_enrollment_api_client(self, request):
+        site_configuration = request.site.siteconfiguration
+        return create_api_client(
+            site_configuration,
+            LMS_SERVICE,
+            site_configuration.build_lms_url('/api/enrollment/v1'),
+            oauth_access_token=self.access_token,
+            append_slash=False
+        )
+
+    def get_enrollment_status(self, request, course_key):
+        """
+        Returns the status of the user's enrollment in the course.
+
+        The status is retrieved from the LMS enrollment API endpoint, and cached for
+        ENROLLMENT_STATUS_CACHE_TIMEOUT seconds.
+
+        Arguments:
+            request (WSGIRequest): the request from which the LMS enrollment API endpoint is created.
+            course_key (str): the course for which the enrollment status is retrieved.
+
+        Returns:
+            A dictionary holding the mode and is_active status of the enrollment, or an empty dictionary
+            if the user has never enrolled in the course.
+
+        Raises:
+            ConnectionError, SlumberBaseException and Timeout for failures in establishing a
+            connection with the LMS enrollment API endpoint.
+        """
+        cache_key = get_enrollment_status_cache_key(self.username, course_key)
+        enrollment_status = cache.get(cache_key)
+
+        if enrollment_status is None:
+            try:
+                api = self._get_enrollment_api_client(request)
+                enrollment = api.enrollment(','.join([self.username, course_key])).get()
+            except (ConnectionError, SlumberBaseException, Timeout) as ex:
+                log.exception(
+                    'Failed to retrieve enrollment details for [%s] in course [%s], because of [%s]',
+                    self.username,
+                    course_key,
+                    ex,
+                )
+                raise ex
+
+            enrollment_status = _get_enrollment_status(enrollment)
+            if settings.ENROLLMENT_STATUS_CACHE_TIMEOUT:
+                cache.set(cache_key, enrollment_status, settings.ENROLLMENT_STATUS_CACHE_TIMEOUT)
+
+        return enrollment_status
+
+    def get_enrollment_statuses(self, request, course_keys):
+        """
+        Returns the status of the user's enrollments in the given courses.
+
+        Statuses that are not cached are retrieved with a single call to the LMS enrollment API endpoint, which
+        lists all of the user's enrollments. Every status retrieved is cached for ENROLLMENT_STATUS_CACHE_TIMEOUT
+        seconds, so later checks of any of the user's courses are made without calling the LMS.
+
+        Arguments:
+            request (WSGIRequest): the request from which the LMS enrollment API endpoint is created.
+            course_keys (list): the courses for which the enrollment status is retrieved.
+
+        Returns:
+            A dictionary mapping each course key to the status of the user's enrollment in the course,
+            as returned by get_enrollment_status.
+
+        Raises:
+            ConnectionError, SlumberBaseException and Timeout for failures in establishing a
+            connection with the LMS enrollment API endpoint.
+        """
+        cache_keys = {
+            course_key: get_enrollment_status_cache_key(self.username, course_key) for course_key in course_keys
+        }
+        cached = cache.get_many(cache_keys.values())
+        enrollment_statuses = {
+            course_key: cached[cache_key] for course_key, cache_key in cache_keys.items() if cache_key in cached
+        }
+
+        if len(enrollment_statuses) < len(cache_keys):
+            try:
+                enrollments = self._get_enrollment_api_client(request).enrollment.get()
+            except (ConnectionError, SlumberBaseException, Timeout) as ex:
+                log.exception('Failed to retrieve enrollments of [%s], because of [%s]', self.username, ex)
+                raise ex
+
+            retrieved = {
+                enrollment['course_details']['course_id']: _get_enrollment_status(enrollment)
+                for enrollment in enrollments or []
+            }
+            # Courses missing from the list are those in which the user has never enrolled.
+            for course_key in course_keys:
+                if course_key not in enrollment_statuses:
+                    enrollment_statuses[course_key] = retrieved.setdefault(course_key, {})
+
+            if settings.ENROLLMENT_STATUS_CACHE_TIMEOUT:
+                cache.set_many(
+                    {
+                        get_enrollment_status_cache_key(self.username, course_key): enrollment_status
+                        for course_key, enrollment_status in retrieved.items()
+                    },
+                    settings.ENROLLMENT_STATUS_CACHE_TIMEOUT
+                )
+
+        return enrollment_statuses
+
     def is_user_already_enrolled(self, request, seat):
         """
         Check if a user is already enrolled in the course.
-        Calls the LMS enrollment API endpoint and sends the course ID and username query parameters
-        and returns the status of the user's enrollment in the course.
+        Retrieves the status of the user's enrollment in the course, from the cache or the LMS
+        enrollment API endpoint, and compares it with the mode of the seat.
 
         Arguments:
             request (WSGIRequest): the request from which the LMS enrollment API endpoint is created.
@@ -300,23 +400,7 @@ class User(AbstractUser):
             ConnectionError, SlumberBaseException and Timeout for failures in establishing a
             connection with the LMS enrollment API endpoint.
         """
-        course_key = seat.attr.course_key
-        try:
-            api = EdxRestApiClient(
-                request.site.siteconfiguration.build_lms_url('/api/enrollment/v1'),
-                oauth_access_token=self.access_token,
-                append_slash=False
-            )
-            status = api.enrollment(','.join([self.username, course_key])).get()
-        except (ConnectionError, SlumberBaseException, Timeout) as ex:
-            log.exception(
-                'Failed to retrieve enrollment details for [%s] in course [%s], because of [%s]',
-                self.username,
-                course_key,
-                ex,
-            )
-            raise ex
-
+        status = self.get_enrollment_status(request, seat.attr.course_key)
         seat_type = mode_for_seat(seat)
         if status and status.get('mode') == seat_type and status.get('is_active'):
             return True
@@ -325,6 +409,9 @@ class User(AbstractUser):
     def account_details(self, request):
         """ Returns the account details from LMS.
 
+        The details of active accounts are cached for ACCOUNT_DETAILS_CACHE_TIMEOUT seconds. Those of inactive
+        accounts are not, so that accounts can be used as soon as they are activated.
+
         Args:
             request (WSGIRequest): The request from which the LMS account API endpoint is created.
 
@@ -335,14 +422,21 @@ class User(AbstractUser):
             ConnectionError, SlumberBaseException and Timeout for failures in establishing a
             connection with the LMS account API endpoint.
         """
+        cache_key = 'account_details_{}'.format(hashlib.md5(self.username.encode('utf-8')).hexdigest())
+        response = cache.get(cache_key)
+        if response is not None:
+            return response
+
         try:
-            api = EdxRestApiClient(
-                request.site.siteconfiguration.build_lms_url('/api/user/v1'),
+            site_configuration = request.site.siteconfiguration
+            api = create_api_client(
+                site_configuration,
+                LMS_SERVICE,
+                site_configuration.build_lms_url('/api/user/v1'),
                 oauth_access_token=self.access_token,
                 append_slash=False
             )
             response = api.accounts(self.username).get()
-            return response
         except (ConnectionError, SlumberBaseException, Timeout) as ex:
             log.exception(
                 'Failed to retrieve account details for [%s], because of [%s]',
@@ -351,11 +445,16 @@ class User(AbstractUser):
             )
             raise ex
 
+        if settings.ACCOUNT_DETAILS_CACHE_TIMEOUT and response and response.get('is_active'):
+            cache.set(cache_key, response, settings.ACCOUNT_DETAILS_CACHE_TIMEOUT)
+
+        return response
+
     def is_eligible_for_credit(self, course_key):
         """
         Check if a user is eligible for a credit course.
-        Calls the LMS eligibility API endpoint and sends the username and course key
-        query parameters and returns eligibility details for the user and course combination.
+        Calls the LMS eligibility API endpoint, unless the eligibility is cached, and returns
+        eligibility details for the user and course combination.
 
         Args:
             course_key (string): The course key for which the eligibility is checked for.
@@ -367,25 +466,15 @@ class User(AbstractUser):
             ConnectionError, SlumberBaseException and Timeout for failures in establishing a
             connection with the LMS eligibility API endpoint.
         """
-        query_strings = {
-            'username': self.username,
-            'course_key': course_key
-        }
-        try:
-            api = EdxRestApiClient(
-                get_lms_url('api/credit/v1/'),
-                oauth_access_token=self.access_token
-            )
-            response = api.eligibility().get(**query_strings)
-        except (ConnectionError, SlumberBaseException, Timeout) as ex:  # pragma: no cover
-            log.exception(
-                'Failed to retrieve eligibility details for [%s] in course [%s], Because of [%s]',
-                self.username,
-                course_key,
-                ex,
-            )
-            raise ex
-        return response
+        site_configuration = get_current_request().site.siteconfiguration
+        return get_credit_eligibility(site_configuration, self.username, self.access_token, course_key)
+
+
+def _get_enrollment_status(enrollment):
+    """ Returns the parts of an LMS enrollment API response that make up the cached enrollment status. """
+    if not enrollment:
+        return {}
+    return {'mode': enrollment.get('mode'), 'is_active': enrollment.get('is_active')}
 
 
 class Client(User):
@@ -0,0 +1,21 @@
+import logging
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ecommerce.core.api_clients import clear_api_clients
+from ecommerce.core.models import SiteConfiguration
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=SiteConfiguration)
+@receiver(post_delete, sender=SiteConfiguration)
+def invalidate_api_clients(*_args, **kwargs):
+    """
+    When a site configuration is changed (e.g. its LMS URL or OAuth settings),
+    the API clients and access token held for the site must be discarded.
+    """
+    site_configuration = kwargs['instance']
+    clear_api_clients(site_configuration.id)
+    logger.info('Invalidated API clients after changing site configuration [%d].', site_configuration.id)
@@ -0,0 +1,112 @@
+import json
+import time
+
+from django.test import override_settings
+import httpretty
+import mock
+
+from ecommerce.core import api_clients
+from ecommerce.core.api_clients import (LMS_SERVICE, create_api_client, get_course_catalog_api_client,
+                                        get_http_adapter, get_site_access_token)
+from ecommerce.core.models import SiteConfiguration
+from ecommerce.tests.testcases import TestCase
+
+COURSE_CATALOG_API_URL = 'https://catalog.example.com/api/v1/'
+
+
+class ApiClientPoolTests(TestCase):
+    def setUp(self):
+        super(ApiClientPoolTests, self).setUp()
+        self.site_configuration = self.site.siteconfiguration
+
+    def mock_access_token_response(self, token='abc123', expires_in=3600):
+        """ Mock the response from the OAuth provider's access token endpoint. """
+        url = '{root}/access_token'.format(root=self.site_configuration.oauth2_provider_url)
+        body = json.dumps({'access_token': token, 'expires_in': expires_in})
+        httpretty.register_uri(httpretty.POST, url, body=body, content_type='application/json')
+
+    @override_settings(COURSE_CATALOG_API_URL=COURSE_CATALOG_API_URL)
+    def test_get_course_catalog_api_client(self):
+        """ Verify a single client is shared by all instances of a site configuration. """
+        client = get_course_catalog_api_client(self.site_configuration)
+        self.assertIs(SiteConfiguration.objects.get(id=self.site_configuration.id).course_catalog_api_client, client)
+
+    def test_create_api_client(self):
+        """ Verify clients share the connection pool of their site and service, but not their session. """
+        url = self.site_configuration.build_lms_url('/api/user/v1')
+        client = create_api_client(self.site_configuration, LMS_SERVICE, url, oauth_access_token='first')
+        other_client = create_api_client(self.site_configuration, LMS_SERVICE, url, oauth_access_token='second')
+
+        session = client._store['session']  # pylint: disable=protected-access
+        other_session = other_client._store['session']  # pylint: disable=protected-access
+        self.assertIsNot(session, other_session)
+        self.assertEqual(session.auth.token, 'first')
+        self.assertEqual(other_session.auth.token, 'second')
+
+        adapter = get_http_adapter(self.site_configuration, LMS_SERVICE)
+        self.assertIs(session.get_adapter(url), adapter)
+        self.assertIs(other_session.get_adapter(url), adapter)
+
+    def test_save_invalidates_clients(self):
+        """ Verify saving a site configuration discards its clients. """
+        client = get_course_catalog_api_client(self.site_configuration)
+        self.site_configuration.save()
+        self.assertIsNot(get_course_catalog_api_client(self.site_configuration), client)
+
+    @httpretty.activate
+    def test_get_site_access_token(self):
+        """ Verify the token is retrieved once, and kept until it is about to expire. """
+        self.mock_access_token_response()
+        self.assertEqual(get_site_access_token(self.site_configuration), 'abc123')
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+        api_clients.clear_api_clients()
+        self.assertEqual(get_site_access_token(self.site_configuration), 'abc123')
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1, 'The token should be read from the cache.')
+
+    @httpretty.activate
+    def test_reset_api_clients(self):
+        """ Verify resetting discards the token locks and the tokens shared through the cache. """
+        self.mock_access_token_response()
+        get_site_access_token(self.site_configuration)
+        api_clients._token_locks[(self.site_configuration.id,)] = mock.MagicMock()  # pylint: disable=protected-access
+
+        api_clients.reset_api_clients()
+        self.assertEqual(api_clients._token_locks, {})  # pylint: disable=protected-access
+        self.assertEqual(get_site_access_token(self.site_configuration), 'abc123')
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 2, 'The token should not be read from the cache.')
+
+    @override_settings(ACCESS_TOKEN_REFRESH_MARGIN=60)
+    def test_get_site_access_token_renewal(self):
+        """ Verify tokens are renewed before they expire, and the current token is used if renewal fails. """
+        key = (self.site_configuration.id,)
+        api_clients._tokens[key] = ('old', time.time() + 30)  # pylint: disable=protected-access
+
+        with mock.patch.object(api_clients, '_retrieve_access_token', return_value=('new', time.time() + 3600)):
+            self.assertEqual(get_site_access_token(self.site_configuration), 'new')
+
+        api_clients._tokens[key] = ('old', time.time() + 30)  # pylint: disable=protected-access
+        with mock.patch.object(api_clients, '_retrieve_access_token', side_effect=Exception):
+            self.assertEqual(get_site_access_token(self.site_configuration), 'old')
+
+        api_clients._tokens[key] = ('old', time.time() - 1)  # pylint: disable=protected-access
+        with mock.patch.object(api_clients, '_retrieve_access_token', side_effect=Exception):
+            with self.assertRaises(Exception):
+                get_site_access_token(self.site_configuration)
+
+    @override_settings(ACCESS_TOKEN_REFRESH_MARGIN=60)
+    def test_get_site_access_token_single_flight(self):
+        """ Verify threads use the current token while another thread is renewing it. """
+        api_clients._ensure_process()  # pylint: disable=protected-access
+        key = (self.site_configuration.id,)
+        api_clients._tokens[key] = ('old', time.time() + 30)  # pylint: disable=protected-access
+
+        # Another thread holds the lock.
+        token_lock = api_clients._token_locks[key] = mock.MagicMock()  # pylint: disable=protected-access
+        token_lock.acquire.return_value = False
+
+        with mock.patch.object(api_clients, '_retrieve_access_token') as mock_retrieve:
+            self.assertEqual(get_site_access_token(self.site_configuration), 'old')
+
+        self.assertFalse(mock_retrieve.called)
+        token_lock.acquire.assert_called_once_with(False)
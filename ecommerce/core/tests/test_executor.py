@@ -0,0 +1,153 @@
+"""Tests for the in-process executor."""
+import threading
+
+from django.test.utils import override_settings
+
+from ecommerce.core import metrics
+from ecommerce.core.exceptions import ExecutorUnavailableError
+from ecommerce.core.executor import BoundedThreadPool, iter_concurrently, map_concurrently
+from ecommerce.core.metrics import get_metrics_sink
+from ecommerce.tests.testcases import TestCase
+
+
+@override_settings(METRICS_SINK='ecommerce.core.metrics.HistogramMetricsSink')
+class BoundedThreadPoolTests(TestCase):
+    """ Tests for BoundedThreadPool. """
+
+    def setUp(self):
+        super(BoundedThreadPoolTests, self).setUp()
+        metrics._sinks.clear()  # pylint: disable=protected-access
+
+    def test_submit(self):
+        """ Verify submitted tasks are run, and shutdown waits for queued tasks to complete. """
+        pool = BoundedThreadPool('test', max_workers=2, max_queue_size=10)
+        results = []
+
+        for value in range(5):
+            pool.submit(results.append, value)
+
+        self.assertTrue(pool.shutdown(timeout=5))
+        self.assertEqual(sorted(results), range(5))
+
+        snapshot = get_metrics_sink().snapshot()
+        self.assertEqual(snapshot['histograms']['executor.test.run_time']['count'], 5)
+        self.assertEqual(snapshot['gauges']['executor.test.queue_depth'], 0)
+
+    def test_task_failure(self):
+        """ Verify an exception raised by a task is logged, and does not stop the worker. """
+        pool = BoundedThreadPool('test', max_workers=1, max_queue_size=10)
+        results = []
+
+        def fail():
+            raise Exception('clunk')
+
+        pool.submit(fail)
+        pool.submit(results.append, 1)
+        self.assertTrue(pool.shutdown(timeout=5))
+
+        self.assertEqual(results, [1])
+        self.assertEqual(get_metrics_sink().snapshot()['counters']['executor.test.failed'], 1)
+
+    def test_queue_full(self):
+        """ Verify work is rejected when the queue is full. """
+        pool = BoundedThreadPool('test', max_workers=1, max_queue_size=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        pool.submit(block)
+        started.wait(5)
+        pool.submit(block)
+
+        with self.assertRaises(ExecutorUnavailableError):
+            pool.submit(block)
+
+        self.assertEqual(pool.queue_depth, 1)
+        self.assertEqual(get_metrics_sink().snapshot()['counters']['executor.test.rejected'], 1)
+
+        release.set()
+        self.assertTrue(pool.shutdown(timeout=5))
+
+    def test_submit_after_shutdown(self):
+        """ Verify work is rejected after the pool has been shut down. """
+        pool = BoundedThreadPool('test', max_workers=1, max_queue_size=1)
+        pool.submit(lambda: None)
+        pool.shutdown(timeout=5)
+
+        with self.assertRaises(ExecutorUnavailableError):
+            pool.submit(lambda: None)
+
+
+class MapConcurrentlyTests(TestCase):
+    def test_map_concurrently(self):
+        """ Verify each item is processed on a separate thread, and the results are returned in order. """
+        lock = threading.Lock()
+        started = []
+        all_started = threading.Event()
+
+        def process(item):
+            with lock:
+                started.append(item)
+                if len(started) == 3:
+                    all_started.set()
+
+            # All items can only be in progress at once if each is being processed on its own thread.
+            self.assertTrue(all_started.wait(5))
+            return item * 2
+
+        self.assertEqual(map_concurrently(process, [1, 2, 3], max_workers=3), [2, 4, 6])
+
+    def test_single_worker(self):
+        """ Verify items are processed on the calling thread if a single worker is allowed. """
+        thread = threading.current_thread()
+        self.assertEqual(map_concurrently(lambda item: threading.current_thread() is thread, [1, 2], 1), [True, True])
+
+    def test_exception(self):
+        """ Verify exceptions raised while processing an item are re-raised once all items are processed. """
+        processed = []
+
+        def process(item):
+            processed.append(item)
+            if item == 1:
+                raise ValueError
+
+        with self.assertRaises(ValueError):
+            map_concurrently(process, [1, 2, 3], max_workers=2)
+
+        self.assertEqual(sorted(processed), [1, 2, 3])
+
+
+class IterConcurrentlyTests(TestCase):
+    def test_iter_concurrently(self):
+        """ Verify results are yielded as soon as they are available, while other items are still processed. """
+        first_consumed = threading.Event()
+
+        def process(item):
+            # The second item can only complete once the result of the first has been consumed.
+            if item == 2:
+                self.assertTrue(first_consumed.wait(5))
+            return item * 2
+
+        results = iter_concurrently(process, [1, 2], max_workers=2)
+        self.assertEqual(next(results), (1, 2))
+        first_consumed.set()
+        self.assertEqual(list(results), [(2, 4)])
+
+    def test_single_worker(self):
+        """ Verify items are processed on the calling thread, in order, if a single worker is allowed. """
+        thread = threading.current_thread()
+        results = iter_concurrently(lambda item: threading.current_thread() is thread, [1, 2], 1)
+        self.assertEqual(list(results), [(1, True), (2, True)])
+
+    def test_exception(self):
+        """ Verify exceptions raised while processing an item are re-raised when its result is reached. """
+        def process(item):
+            if item == 1:
+                raise ValueError
+            return item
+
+        with self.assertRaises(ValueError):
+            list(iter_concurrently(process, [1, 2], max_workers=2))
@@ -0,0 +1,114 @@
+"""Tests for the metrics sinks."""
+import json
+
+import mock
+from django.core.urlresolvers import reverse
+from django.test.utils import override_settings
+from testfixtures import LogCapture
+
+from ecommerce.core import metrics
+from ecommerce.core.metrics import HistogramMetricsSink, NullMetricsSink, StatsdMetricsSink, get_metrics_sink
+from ecommerce.tests.testcases import TestCase
+
+
+class HistogramMetricsSinkTests(TestCase):
+    """ Tests for HistogramMetricsSink. """
+
+    def setUp(self):
+        super(HistogramMetricsSinkTests, self).setUp()
+        self.sink = HistogramMetricsSink(buckets=(10, 100, 1000))
+
+    def test_timing(self):
+        """ Verify timings are aggregated into a histogram. """
+        for value in (5, 50, 50, 500, 5000):
+            self.sink.timing('foo', value)
+
+        histogram = self.sink.snapshot()['histograms']['foo']
+        self.assertEqual(histogram['count'], 5)
+        self.assertEqual(histogram['sum'], 5605)
+        self.assertEqual(histogram['min'], 5)
+        self.assertEqual(histogram['max'], 5000)
+        self.assertEqual(histogram['p50'], 100)
+        # Values in the overflow bucket are reported as the largest recorded value.
+        self.assertEqual(histogram['p99'], 5000)
+
+    def test_counters_and_gauges(self):
+        """ Verify counters are summed, and only the latest gauge value is kept. """
+        self.sink.increment('foo')
+        self.sink.increment('foo', 2)
+        self.sink.gauge('bar', 3)
+        self.sink.gauge('bar', 1)
+
+        snapshot = self.sink.snapshot()
+        self.assertEqual(snapshot['counters'], {'foo': 3})
+        self.assertEqual(snapshot['gauges'], {'bar': 1})
+
+        self.sink.reset()
+        self.assertEqual(self.sink.snapshot(), {'histograms': {}, 'counters': {}, 'gauges': {}})
+
+
+class StatsdMetricsSinkTests(TestCase):
+    """ Tests for StatsdMetricsSink. """
+
+    def test_send(self):
+        """ Verify metrics are sent using the statsd line protocol. """
+        sink = StatsdMetricsSink(host='statsd', port=1234, prefix='test')
+
+        with mock.patch.object(sink, 'socket') as mock_socket:
+            sink.timing('foo', 1.6)
+            sink.increment('bar')
+            sink.gauge('baz', 3)
+
+            mock_socket.sendto.assert_has_calls([
+                mock.call('test.foo:2|ms', ('statsd', 1234)),
+                mock.call('test.bar:1|c', ('statsd', 1234)),
+                mock.call('test.baz:3|g', ('statsd', 1234)),
+            ])
+
+
+class GetMetricsSinkTests(TestCase):
+    """ Tests for get_metrics_sink. """
+
+    def setUp(self):
+        super(GetMetricsSinkTests, self).setUp()
+        metrics._sinks.clear()  # pylint: disable=protected-access
+
+    @override_settings(METRICS_SINK='ecommerce.core.metrics.HistogramMetricsSink')
+    def test_sink_is_shared(self):
+        """ Verify a single instance of the configured sink is used by the process. """
+        sink = get_metrics_sink()
+        self.assertIsInstance(sink, HistogramMetricsSink)
+        self.assertIs(get_metrics_sink(), sink)
+
+    @override_settings(METRICS_SINK='ecommerce.core.metrics.NotARealSink')
+    def test_invalid_sink(self):
+        """ Verify an error is logged, and metrics discarded, if the configured sink cannot be loaded. """
+        logger_name = 'ecommerce.core.metrics'
+
+        with LogCapture(logger_name) as l:
+            self.assertIsInstance(get_metrics_sink(), NullMetricsSink)
+            l.check((logger_name, 'ERROR', 'Could not load metrics sink at [ecommerce.core.metrics.NotARealSink]'))
+
+
+@override_settings(METRICS_SINK='ecommerce.core.metrics.HistogramMetricsSink')
+class MetricsViewTests(TestCase):
+    """ Tests for the metrics view. """
+    path = reverse('metrics')
+
+    def test_staff_only(self):
+        """ Verify the view is only available to staff users. """
+        user = self.create_user()
+        self.client.login(username=user.username, password=self.password)
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 404)
+
+    def test_get(self):
+        """ Verify the view returns the snapshot of the process's metrics sink. """
+        sink = get_metrics_sink()
+        sink.increment('metrics_view_test')
+
+        user = self.create_user(is_staff=True)
+        self.client.login(username=user.username, password=self.password)
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), sink.snapshot())
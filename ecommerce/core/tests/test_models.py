@@ -5,6 +5,7 @@ import httpretty
 import mock
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.test import override_settings
 from edx_rest_api_client.auth import SuppliedJwtAuth
@@ -12,6 +13,7 @@ from requests.exceptions import ConnectionError
 
 from ecommerce.core.models import BusinessClient, User, SiteConfiguration, validate_configuration
 from ecommerce.core.tests import toggle_switch
+from ecommerce.courses.utils import invalidate_enrollment_status
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
 from ecommerce.extensions.payment.tests.processors import DummyProcessor, AnotherDummyProcessor
 from ecommerce.tests.factories import SiteConfigurationFactory
@@ -40,7 +42,9 @@ class UserTests(CourseCatalogTestMixin, LmsApiMockMixin, TestCase):
         self.assertIsNone(user.access_token)
 
         self.create_access_token(user)
-        self.assertEqual(user.access_token, self.access_token)
+        # The absence of a token is memoized, so the token is only read by other instances.
+        self.assertIsNone(user.access_token)
+        self.assertEqual(User.objects.get(id=user.id).access_token, self.access_token)
 
     def test_tracking_context(self):
         """ Ensures that the tracking_context dictionary is written / read
@@ -90,6 +94,74 @@ class UserTests(CourseCatalogTestMixin, LmsApiMockMixin, TestCase):
         self.mock_enrollment_api(self.request, user, course_id2, is_active=False, mode=mode)
         self.assertFalse(user.is_user_already_enrolled(self.request, not_enrolled_seat))
 
+    @httpretty.activate
+    @override_settings(ENROLLMENT_STATUS_CACHE_TIMEOUT=60)
+    def test_enrollment_status_cached(self):
+        """ Verify the status of the user's enrollment is cached. """
+        self.addCleanup(cache.clear)
+        user = self.create_user()
+        course_id = 'course-v1:test+test+test'
+        __, seat = self.create_course_and_seat(course_id=course_id, seat_type='verified')
+        self.mock_enrollment_api(self.request, user, course_id, mode='verified')
+
+        self.assertTrue(user.is_user_already_enrolled(self.request, seat))
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+        self.assertTrue(user.is_user_already_enrolled(self.request, seat))
+        self.assertEqual(user.get_enrollment_status(self.request, course_id), {'mode': 'verified', 'is_active': True})
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+        invalidate_enrollment_status(user.username, course_id)
+        self.mock_enrollment_api(self.request, user, course_id, is_active=False, mode='verified')
+        self.assertFalse(user.is_user_already_enrolled(self.request, seat))
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 2)
+
+    @httpretty.activate
+    @override_settings(ENROLLMENT_STATUS_CACHE_TIMEOUT=60)
+    def test_get_enrollment_statuses(self):
+        """ Verify the statuses of the user's enrollments are retrieved with a single call, and cached. """
+        self.addCleanup(cache.clear)
+        user = self.create_user()
+        enrolled_course_id = 'course-v1:test+test+test'
+        other_course_id = 'course-v1:not+enrolled+here'
+        url = self.request.site.siteconfiguration.build_lms_url('/api/enrollment/v1/enrollment')
+        body = [
+            {'course_details': {'course_id': enrolled_course_id}, 'mode': 'verified', 'is_active': True},
+            {'course_details': {'course_id': 'course-v1:another+test+test'}, 'mode': 'audit', 'is_active': False},
+        ]
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(body), content_type='application/json')
+
+        expected = {
+            enrolled_course_id: {'mode': 'verified', 'is_active': True},
+            other_course_id: {},
+        }
+        self.assertEqual(user.get_enrollment_statuses(self.request, [enrolled_course_id, other_course_id]), expected)
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+        # Every retrieved status is cached, including those of courses that were not requested.
+        self.assertEqual(user.get_enrollment_statuses(self.request, [enrolled_course_id, other_course_id]), expected)
+        self.assertEqual(
+            user.get_enrollment_status(self.request, 'course-v1:another+test+test'),
+            {'mode': 'audit', 'is_active': False}
+        )
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+    @httpretty.activate
+    def test_get_enrollment_statuses_error(self):
+        """ Verify errors raised when retrieving the user's enrollments are logged and re-raised. """
+        user = self.create_user()
+        url = self.request.site.siteconfiguration.build_lms_url('/api/enrollment/v1/enrollment')
+
+        def callback(request, uri, headers):  # pylint: disable=unused-argument
+            raise ConnectionError
+
+        httpretty.register_uri(httpretty.GET, url, body=callback, content_type='application/json')
+
+        with mock.patch('ecommerce.core.models.log.exception') as mock_log_exception:
+            with self.assertRaises(ConnectionError):
+                user.get_enrollment_statuses(self.request, ['course-v1:test+test+test'])
+            self.assertTrue(mock_log_exception.called)
+
     @httpretty.activate
     def test_user_details(self):
         """ Verify user details are returned. """
@@ -98,6 +170,20 @@ class UserTests(CourseCatalogTestMixin, LmsApiMockMixin, TestCase):
         self.mock_account_api(self.request, user.username, data=user_details)
         self.assertDictEqual(user.account_details(self.request), user_details)
 
+    @httpretty.activate
+    @override_settings(ACCOUNT_DETAILS_CACHE_TIMEOUT=60)
+    @ddt.data(True, False)
+    def test_user_details_cached(self, is_active):
+        """ Verify the details of active accounts are cached, and those of inactive accounts are not. """
+        self.addCleanup(cache.clear)
+        user = self.create_user()
+        user_details = {'is_active': is_active}
+        self.mock_account_api(self.request, user.username, data=user_details)
+
+        self.assertDictEqual(user.account_details(self.request), user_details)
+        self.assertDictEqual(user.account_details(self.request), user_details)
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1 if is_active else 2)
+
     def test_no_user_details(self):
         """ Verify False is returned when there is a connection error. """
         user = self.create_user()
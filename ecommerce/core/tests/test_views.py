@@ -14,6 +14,7 @@ from rest_framework import status
 from testfixtures import LogCapture
 
 from ecommerce.core.constants import Status, UnavailabilityMessage
+from ecommerce.core.health import HealthMonitor
 from ecommerce.tests.testcases import TestCase
 
 LOGGER_NAME = 'ecommerce.core.views'
@@ -77,20 +78,57 @@ class HealthTests(TestCase):
             )
             l.check((LOGGER_NAME, 'CRITICAL', UnavailabilityMessage.LMS))
 
+    def test_deep_check(self, mock_lms_request):
+        """Test that results are served from the health monitor, unless a staff user requests a deep check."""
+        self.fake_lms_response.status_code = status.HTTP_200_OK
+        mock_lms_request.return_value = self.fake_lms_response
+        # A large interval prevents the monitor's thread from checking the LMS during the test.
+        monitor = HealthMonitor('test-health', 3600, 3600)
+        self.addCleanup(monitor.stop)
+
+        with mock.patch('ecommerce.core.views.get_health_monitor', mock.Mock(return_value=monitor)):
+            self._assert_health(status.HTTP_200_OK, Status.OK, Status.OK, Status.OK)
+
+            mock_lms_request.side_effect = RequestException
+            with LogCapture(LOGGER_NAME):
+                self._assert_health(status.HTTP_200_OK, Status.OK, Status.OK, Status.OK)
+
+                response = self.client.get(reverse('health'), {'deep': 1})
+                self.assertEqual(json.loads(response.content)['detailed_status']['lms_status'], Status.OK)
+
+                user = self.create_user(is_staff=True)
+                self.client.login(username=user.username, password=self.password)
+                response = self.client.get(reverse('health'), {'deep': 1})
+                self.assertEqual(json.loads(response.content)['detailed_status']['lms_status'], Status.UNAVAILABLE)
+
+    def test_deep_check_errors(self, mock_lms_request):
+        """Test that the errors of failed checks are only reported to staff users requesting a deep check."""
+        mock_lms_request.side_effect = RequestException('Connection refused')
+
+        with LogCapture(LOGGER_NAME):
+            response = self.client.get(reverse('health'), {'deep': 1})
+            self.assertNotIn('error', json.loads(response.content)['checks']['lms'])
+
+            user = self.create_user(is_staff=True)
+            self.client.login(username=user.username, password=self.password)
+            response = self.client.get(reverse('health'), {'deep': 1})
+            self.assertEqual(json.loads(response.content)['checks']['lms']['error'],
+                             'RequestException: Connection refused')
+
     def _assert_health(self, status_code, overall_status, database_status, lms_status):
         """Verify that the response matches expectations."""
         response = self.client.get(reverse('health'))
         self.assertEqual(response.status_code, status_code)
         self.assertEqual(response['content-type'], 'application/json')
 
-        expected_data = {
-            'overall_status': overall_status,
-            'detailed_status': {
-                'database_status': database_status,
-                'lms_status': lms_status
-            }
-        }
-        self.assertDictEqual(json.loads(response.content), expected_data)
+        data = json.loads(response.content)
+        self.assertEqual(data['overall_status'], overall_status)
+        self.assertEqual(data['detailed_status']['database_status'], database_status)
+        self.assertEqual(data['detailed_status']['lms_status'], lms_status)
+        self.assertEqual(data['checks']['database']['status'], database_status)
+        self.assertEqual(data['checks']['lms']['status'], lms_status)
+        self.assertEqual(set(data['checks']), {'database', 'cache', 'lms', 'catalog'})
+        self.assertNotIn('error', data['checks']['lms'])
 
 
 class AutoAuthTests(TestCase):
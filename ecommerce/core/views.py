@@ -2,18 +2,19 @@
 import logging
 import uuid
 
-import requests
 from auth_backends.views import EdxOpenIdConnectLogoutView
 from django.conf import settings
 from django.contrib.auth import get_user_model, login, authenticate
 from django.contrib.auth.decorators import login_required
-from django.db import transaction, connection, DatabaseError
+from django.db import transaction
 from django.http import Http404, JsonResponse
 from django.shortcuts import redirect
 from django.utils.decorators import method_decorator
 from django.views.generic import View
 
 from ecommerce.core.constants import Status, UnavailabilityMessage
+from ecommerce.core.health import DATABASE, LMS, get_health_monitor, get_probes
+from ecommerce.core.metrics import get_metrics_sink
 from ecommerce.core.url_utils import get_lms_heartbeat_url
 
 logger = logging.getLogger(__name__)
@@ -21,56 +22,43 @@ User = get_user_model()
 
 
 @transaction.non_atomic_requests
-def health(_):
+def health(request):
     """Allows a load balancer to verify that the ecommerce front-end service is up.
 
-    Checks the status of the database connection and the LMS, the two services
-    on which the ecommerce front-end currently depends.
+    Reports the status of the database, the cache, the message broker, the LMS and the Course Catalog, as last
+    checked by the process's health monitor, with the time at which, and the time in which, each was checked.
+    Only the database is required for the ecommerce front-end to be available. If a staff user sets the deep
+    query string parameter to 1, each service is checked before responding, and the error raised by each failed
+    check is shown. Other users are always served the results of the health monitor, so that they cannot load
+    the services by requesting deep checks.
 
     Returns:
         HttpResponse: 200 if the ecommerce front-end is available, with JSON data
-            indicating the health of each required service
+            indicating the health of each service
         HttpResponse: 503 if the ecommerce front-end is unavailable, with JSON data
-            indicating the health of each required service
+            indicating the health of each service
 
     Example:
         >>> response = requests.get('https://ecommerce.edx.org/health')
         >>> response.status_code
         200
         >>> response.content
-        '{"overall_status": "OK", "detailed_status": {"database_status": "OK", "lms_status": "OK"}}'
+        '{"overall_status": "OK", "detailed_status": {"database_status": "OK", "lms_status": "OK", ...},
+          "checks": {"database": {"status": "OK", "checked_at": "2016-06-01T12:00:00Z", "latency_ms": 0.4},
+          ...}}'
     """
-    overall_status = database_status = lms_status = Status.UNAVAILABLE
-
-    try:
-        cursor = connection.cursor()
-        cursor.execute("SELECT 1")
-        cursor.fetchone()
-        cursor.close()
-        database_status = Status.OK
-    except DatabaseError:
-        database_status = Status.UNAVAILABLE
-
-    try:
-        response = requests.get(get_lms_heartbeat_url(), timeout=1)
-
-        if response.status_code == 200:
-            lms_status = Status.OK
-        else:
-            logger.critical(UnavailabilityMessage.LMS)
-            lms_status = Status.UNAVAILABLE
-    except requests.exceptions.RequestException:
+    deep = request.GET.get('deep') in ('1', 'true') and request.user.is_staff
+    results = get_health_monitor().get_results(get_probes(get_lms_heartbeat_url()), deep=deep)
+
+    if results[LMS].status != Status.OK:
         logger.critical(UnavailabilityMessage.LMS)
-        lms_status = Status.UNAVAILABLE
 
-    overall_status = Status.OK if (database_status == Status.OK) else Status.UNAVAILABLE
+    overall_status = results[DATABASE].status
 
     data = {
         'overall_status': overall_status,
-        'detailed_status': {
-            'database_status': database_status,
-            'lms_status': lms_status,
-        },
+        'detailed_status': {'{}_status'.format(name): result.status for name, result in results.items()},
+        'checks': {name: result.as_dict(include_error=deep) for name, result in results.items()},
     }
 
     if overall_status == Status.OK:
@@ -113,6 +101,13 @@ class StaffOnlyMixin(object):
         return super(StaffOnlyMixin, self).dispatch(request, *args, **kwargs)
 
 
+class MetricsView(StaffOnlyMixin, View):
+    """ Returns, as JSON, the metrics collected by this process's metrics sink. """
+
+    def get(self, request):  # pylint: disable=unused-argument
+        return JsonResponse(get_metrics_sink().snapshot())
+
+
 class LogoutView(EdxOpenIdConnectLogoutView):
     """ Logout view that redirects the user to the LMS logout page. """
 
@@ -4,7 +4,9 @@ import urllib
 import httpretty
 import pytz
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.test import override_settings
 from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from oscar.core.loading import get_class, get_model
@@ -12,6 +14,7 @@ from oscar.test.factories import (
     ConditionalOfferFactory, OrderFactory, OrderLineFactory, RangeFactory, VoucherFactory
 )
 from oscar.test.utils import RequestFactory
+from requests.exceptions import ConnectionError
 
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.coupons.tests.mixins import CouponMixin
@@ -369,6 +372,24 @@ class CouponRedeemViewTests(CouponMixin, CourseCatalogTestMixin, LmsApiMockMixin
         msg = 'You are already enrolled in the course.'
         self.assertEqual(response.context['error'], _(msg))
 
+    @httpretty.activate
+    @override_settings(ENROLLMENT_STATUS_CACHE_TIMEOUT=60)
+    def test_already_enrolled_rejection_cached(self):
+        """ Verify the enrollment status checked when redeeming a coupon is cached. """
+        self.addCleanup(cache.clear)
+        self.mock_enrollment_api(self.request, self.user, self.course.id, is_active=True, mode=self.course_mode)
+        self.mock_account_api(self.request, self.user.username, data={'is_active': True})
+        self.create_and_test_coupon()
+
+        for __ in range(2):
+            response = self.client.get(self.redeem_url_with_params)
+            self.assertEqual(response.context['error'], _('You are already enrolled in the course.'))
+
+        enrollment_requests = [
+            request for request in httpretty.httpretty.latest_requests if '/api/enrollment/' in request.path
+        ]
+        self.assertEqual(len(enrollment_requests), 1)
+
     @httpretty.activate
     def test_invalid_email_domain_rejection(self):
         """ Verify a user with invalid email domain is rejected. """
@@ -387,6 +408,25 @@ class CouponRedeemViewTests(CouponMixin, CourseCatalogTestMixin, LmsApiMockMixin
         msg = 'You need to activate your account in order to redeem this coupon.'
         self.assertEqual(response.context['error'], _(msg))
 
+    @httpretty.activate
+    def test_inactive_user_enrollment_error(self):
+        """ Verify that a user who hasn't activated the account is rejected, even if the enrollment check fails. """
+        self.mock_account_api(self.request, self.user.username, data={'is_active': False})
+        self.mock_enrollment_api_error(self.request, self.user, self.course.id, ConnectionError)
+        self.create_and_test_coupon()
+        response = self.client.get(self.redeem_url_with_params)
+        msg = 'You need to activate your account in order to redeem this coupon.'
+        self.assertEqual(response.context['error'], _(msg))
+
+    @httpretty.activate
+    def test_enrollment_error(self):
+        """ Verify errors raised by the enrollment check of an active user are raised. """
+        self.mock_account_api(self.request, self.user.username, data={'is_active': True})
+        self.mock_enrollment_api_error(self.request, self.user, self.course.id, ConnectionError)
+        self.create_and_test_coupon()
+        with self.assertRaises(ConnectionError):
+            self.client.get(self.redeem_url_with_params)
+
 
 class EnrollmentCodeCsvViewTests(TestCase):
     """ Tests for the EnrollmentCodeCsvView view. """
@@ -2,6 +2,7 @@ from __future__ import unicode_literals
 
 import csv
 import logging
+import sys
 
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
@@ -11,10 +12,11 @@ from django.utils.decorators import method_decorator
 from django.utils.text import slugify
 from django.utils.translation import ugettext_lazy as _
 from django.shortcuts import render
-from django.utils import timezone
+from django.utils import six, timezone
 from django.views.generic import TemplateView, View
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.executor import map_concurrently
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.core.views import StaffOnlyMixin
 from ecommerce.coupons.decorators import login_required_for_credit
@@ -79,6 +81,47 @@ def voucher_is_valid(voucher, products, request):
     return True, ''
 
 
+def check_account_and_enrollment(request, product):
+    """
+    Checks whether the user's account is active, and whether the user is already enrolled in the product's course.
+
+    Both checks call the LMS, unless their results are cached, so they are made concurrently.
+
+    Arguments:
+        request (Request): WSGI request.
+        product (Product): Seat the user is redeeming.
+
+    Returns:
+        is_account_active (bool): True if the user's account is active, False otherwise.
+        is_enrolled (bool): True if the user is enrolled in the course, False otherwise. None if the account
+            is not active, in which case the result of the enrollment check is ignored.
+    """
+    user = request.user
+    # The checks run on threads that do not use the database, so the data they read is loaded beforehand.
+    __ = user.access_token, request.site.siteconfiguration, product.attr.course_key
+
+    def check(func):
+        try:
+            return func(), None
+        except Exception:  # pylint: disable=broad-except
+            return None, sys.exc_info()
+
+    (account_details, account_exc_info), (is_enrolled, enrollment_exc_info) = map_concurrently(
+        check,
+        [lambda: user.account_details(request), lambda: user.is_user_already_enrolled(request, product)],
+        2
+    )
+
+    if account_exc_info:
+        six.reraise(*account_exc_info)
+    if not account_details['is_active']:
+        return False, None
+
+    if enrollment_exc_info:
+        six.reraise(*enrollment_exc_info)
+    return True, is_enrolled
+
+
 class CouponAppView(StaffOnlyMixin, TemplateView):
     template_name = 'coupons/coupon_app.html'
 
@@ -157,12 +200,13 @@ class CouponRedeemView(EdxOrderPlacementMixin, View):
         if not voucher.offers.first().is_email_valid(request.user.email):
             return render(request, template_name, {'error': _('You are not eligible to use this coupon.')})
 
-        if not request.user.account_details(request)['is_active']:
+        is_account_active, is_enrolled = check_account_and_enrollment(request, product)
+        if not is_account_active:
             return render(request, template_name, {
                 'error': _('You need to activate your account in order to redeem this coupon.')
             })
 
-        if request.user.is_user_already_enrolled(request, product):
+        if is_enrolled:
             return render(request, template_name, {'error': _('You are already enrolled in the course.')})
 
         basket = prepare_basket(request, product, voucher)
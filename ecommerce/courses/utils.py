@@ -33,6 +33,21 @@ def get_course_info_from_catalog(site, course_key):
     return course_run
 
 
+def get_enrollment_status_cache_key(username, course_key):
+    """ Returns the key of the cached status of the user's enrollment in the course. """
+    key = u'{}|{}'.format(username, course_key).encode('utf-8')
+    return 'enrollment_status_{}'.format(hashlib.md5(key).hexdigest())
+
+
+def invalidate_enrollment_status(username, course_key):
+    """ Discards the cached status of the user's enrollment in the course.
+
+    This should be called whenever we change the enrollment (e.g. when fulfilling or revoking a seat), so the
+    change is visible before the cached status expires.
+    """
+    cache.delete(get_enrollment_status_cache_key(username, course_key))
+
+
 def get_certificate_type_display_value(certificate_type):
     display_values = {
         'audit': _('Audit'),
@@ -0,0 +1,115 @@
+import json
+
+import httpretty
+from django.core.cache import cache
+from django.test import override_settings
+from requests.exceptions import ConnectionError
+
+from ecommerce.credit.utils import (get_credit_eligibilities, get_credit_eligibility, get_credit_provider_details,
+                                    get_credit_providers)
+from ecommerce.tests.mixins import LmsApiMockMixin
+from ecommerce.tests.testcases import TestCase
+
+JSON = 'application/json'
+
+
+@httpretty.activate
+@override_settings(CREDIT_ELIGIBILITY_CACHE_TIMEOUT=60, CREDIT_PROVIDER_CACHE_TIMEOUT=60)
+class CreditUtilsTests(LmsApiMockMixin, TestCase):
+    def setUp(self):
+        super(CreditUtilsTests, self).setUp()
+        self.addCleanup(cache.clear)
+        self.site_configuration = self.site.siteconfiguration
+        self.user = self.create_user()
+        self.access_token = 'abc123'
+
+    def mock_providers_api(self, providers):
+        url = self.site_configuration.build_lms_url('/api/credit/v1/providers/')
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(providers), content_type=JSON)
+
+    def test_get_credit_providers(self):
+        """ Verify all providers are retrieved with a single call, sorted by display name, and cached. """
+        self.mock_providers_api([
+            {'id': 'shk', 'display_name': 'School of Hard Knocks'},
+            {'id': 'acme', 'display_name': 'Acme University'},
+        ])
+        expected = [
+            {'id': 'acme', 'display_name': 'Acme University'},
+            {'id': 'shk', 'display_name': 'School of Hard Knocks'},
+        ]
+
+        self.assertEqual(get_credit_providers(self.site_configuration, self.access_token), expected)
+        self.assertEqual(get_credit_providers(self.site_configuration, self.access_token), expected)
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+    def test_get_credit_provider_details(self):
+        """ Verify the details of the given providers are taken from the cached list of all providers. """
+        self.mock_providers_api([
+            {'id': 'shk', 'display_name': 'School of Hard Knocks'},
+            {'id': 'acme', 'display_name': 'Acme University'},
+        ])
+
+        self.assertEqual(
+            get_credit_provider_details(self.site_configuration, self.access_token, ['shk', 'missing']),
+            [{'id': 'shk', 'display_name': 'School of Hard Knocks'}]
+        )
+
+        # Changes made to the returned details do not affect the cached list.
+        details = get_credit_provider_details(self.site_configuration, self.access_token, ['acme'])
+        details[0]['price'] = 100
+        self.assertEqual(
+            get_credit_provider_details(self.site_configuration, self.access_token, ['acme']),
+            [{'id': 'acme', 'display_name': 'Acme University'}]
+        )
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+    def test_get_credit_eligibility(self):
+        """ Verify the user's eligibility is cached per course. """
+        course_key = 'a/b/c'
+        self.mock_eligibility_api(self.request, self.user, course_key, eligible=False)
+
+        for __ in range(2):
+            self.assertEqual(
+                get_credit_eligibility(self.site_configuration, self.user.username, self.access_token, course_key),
+                []
+            )
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+    def test_get_credit_eligibility_error(self):
+        """ Verify errors are re-raised, and not cached. """
+        url = self.site_configuration.build_lms_url('/api/credit/v1/eligibility/')
+
+        def callback(request, uri, headers):  # pylint: disable=unused-argument
+            raise ConnectionError
+
+        httpretty.register_uri(httpretty.GET, url, body=callback, content_type=JSON)
+
+        for __ in range(2):
+            with self.assertRaises(ConnectionError):
+                get_credit_eligibility(self.site_configuration, self.user.username, self.access_token, 'a/b/c')
+
+    def test_get_credit_eligibilities(self):
+        """ Verify eligibility is only retrieved for the courses whose eligibility is not cached. """
+        eligible_course_key = 'a/b/c'
+        url = self.site_configuration.build_lms_url('/api/credit/v1/eligibility/')
+
+        def callback(request, uri, headers):  # pylint: disable=unused-argument
+            course_key = request.querystring['course_key'][0]
+            body = [{'course_key': course_key}] if course_key == eligible_course_key else []
+            return 200, headers, json.dumps(body)
+
+        httpretty.register_uri(httpretty.GET, url, body=callback, content_type=JSON)
+        get_credit_eligibility(self.site_configuration, self.user.username, self.access_token, eligible_course_key)
+
+        eligibilities = get_credit_eligibilities(
+            self.site_configuration, self.user.username, self.access_token, [eligible_course_key, 'd/e/f', 'g/h/i']
+        )
+        self.assertEqual(eligibilities, {
+            eligible_course_key: [{'course_key': eligible_course_key}],
+            'd/e/f': [],
+            'g/h/i': [],
+        })
+        self.assertEqual(
+            sorted(request.querystring['course_key'][0] for request in httpretty.httpretty.latest_requests),
+            [eligible_course_key, 'd/e/f', 'g/h/i']
+        )
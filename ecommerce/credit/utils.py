@@ -0,0 +1,149 @@
+"""Cached access to the LMS Credit API.
+
+Credit provider details change rarely, and are the same for every user, so the full list of a site's providers is
+retrieved with a single call, cached for CREDIT_PROVIDER_CACHE_TIMEOUT seconds, and used to look up the details of
+individual providers. Users' eligibility for credit is cached, per user and course, for
+CREDIT_ELIGIBILITY_CACHE_TIMEOUT seconds.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from requests.exceptions import ConnectionError, Timeout
+from slumber.exceptions import SlumberBaseException
+
+from ecommerce.core.api_clients import LMS_SERVICE, create_api_client
+from ecommerce.core.executor import map_concurrently
+
+logger = logging.getLogger(__name__)
+
+
+def get_credit_api_client(site_configuration, access_token):
+    """ Returns a client of the given site's LMS Credit API, authenticated with the given access token. """
+    return create_api_client(
+        site_configuration,
+        LMS_SERVICE,
+        site_configuration.build_lms_url('api/credit/v1/'),
+        oauth_access_token=access_token
+    )
+
+
+def get_credit_providers(site_configuration, access_token):
+    """ Returns the details of all of the site's credit providers, sorted by display name.
+
+    Arguments:
+        site_configuration (SiteConfiguration): Site whose LMS offers the credit.
+        access_token (str): Access token used to call the Credit API, if the providers are not cached.
+
+    Returns:
+        list: Dictionaries holding the details of each provider.
+
+    Raises:
+        ConnectionError, SlumberBaseException and Timeout for failures in establishing a
+        connection with the LMS Credit API endpoint.
+    """
+    cache_key = 'credit_providers_{}'.format(site_configuration.id)
+    providers = cache.get(cache_key)
+
+    if providers is None:
+        providers = get_credit_api_client(site_configuration, access_token).providers.get()
+        providers.sort(key=lambda provider: provider['display_name'])
+        cache.set(cache_key, providers, settings.CREDIT_PROVIDER_CACHE_TIMEOUT)
+
+    return providers
+
+
+def get_credit_provider_details(site_configuration, access_token, provider_ids):
+    """ Returns the details of the given credit providers.
+
+    The details are taken from the cached list of all providers, so the Credit API is called at most once.
+
+    Arguments:
+        site_configuration (SiteConfiguration): Site whose LMS offers the credit.
+        access_token (str): Access token used to call the Credit API, if the providers are not cached.
+        provider_ids (list): IDs of the providers.
+
+    Returns:
+        list: Copies of the details of each provider that exists, in the order of the given IDs.
+
+    Raises:
+        ConnectionError, SlumberBaseException and Timeout for failures in establishing a
+        connection with the LMS Credit API endpoint.
+    """
+    providers = {provider['id']: provider for provider in get_credit_providers(site_configuration, access_token)}
+    return [dict(providers[provider_id]) for provider_id in provider_ids if provider_id in providers]
+
+
+def _get_eligibility_cache_key(username, course_key):
+    key = u'{}|{}'.format(username, course_key).encode('utf-8')
+    return 'credit_eligibility_{}'.format(hashlib.md5(key).hexdigest())
+
+
+def get_credit_eligibility(site_configuration, username, access_token, course_key):
+    """ Returns the user's eligibility for credit in the given course.
+
+    Arguments:
+        site_configuration (SiteConfiguration): Site whose LMS offers the credit.
+        username (str): Username of the user.
+        access_token (str): Access token used to call the Credit API, if the eligibility is not cached.
+        course_key (str): The course for which the eligibility is checked.
+
+    Returns:
+        list: Eligibility details, or an empty list if the user is not eligible.
+
+    Raises:
+        ConnectionError, SlumberBaseException and Timeout for failures in establishing a
+        connection with the LMS Credit API endpoint.
+    """
+    cache_key = _get_eligibility_cache_key(username, course_key)
+    eligibility = cache.get(cache_key)
+
+    if eligibility is None:
+        try:
+            api = get_credit_api_client(site_configuration, access_token)
+            eligibility = api.eligibility().get(username=username, course_key=course_key)
+        except (ConnectionError, SlumberBaseException, Timeout) as ex:
+            logger.exception(
+                'Failed to retrieve eligibility details for [%s] in course [%s], Because of [%s]',
+                username,
+                course_key,
+                ex,
+            )
+            raise ex
+
+        if settings.CREDIT_ELIGIBILITY_CACHE_TIMEOUT:
+            cache.set(cache_key, eligibility, settings.CREDIT_ELIGIBILITY_CACHE_TIMEOUT)
+
+    return eligibility
+
+
+def get_credit_eligibilities(site_configuration, username, access_token, course_keys):
+    """ Returns the user's eligibility for credit in each of the given courses.
+
+    The Credit API only checks one course at a time, so eligibilities that are not cached are retrieved
+    concurrently, on up to CREDIT_ELIGIBILITY_CONCURRENCY threads.
+
+    Returns:
+        dict: Eligibility details, as returned by get_credit_eligibility, keyed by course key.
+
+    Raises:
+        ConnectionError, SlumberBaseException and Timeout for failures in establishing a
+        connection with the LMS Credit API endpoint.
+    """
+    course_keys = list(set(course_keys))
+    cache_keys = {course_key: _get_eligibility_cache_key(username, course_key) for course_key in course_keys}
+    cached = cache.get_many(cache_keys.values())
+    eligibilities = {
+        course_key: cached[cache_key] for course_key, cache_key in cache_keys.items() if cache_key in cached
+    }
+
+    missing = [course_key for course_key in course_keys if course_key not in eligibilities]
+    results = map_concurrently(
+        lambda course_key: get_credit_eligibility(site_configuration, username, access_token, course_key),
+        missing,
+        settings.CREDIT_ELIGIBILITY_CONCURRENCY
+    )
+    eligibilities.update(zip(missing, results))
+
+    return eligibilities
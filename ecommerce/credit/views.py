@@ -6,15 +6,14 @@ from dateutil.parser import parse
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
-from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import TemplateView
-from edx_rest_api_client.client import EdxRestApiClient
 from oscar.core.loading import get_model
 from slumber.exceptions import SlumberHttpBaseException
 
-from ecommerce.core.url_utils import get_lms_url
+from ecommerce.core.executor import map_concurrently
 from ecommerce.courses.models import Course
+from ecommerce.credit.utils import get_credit_eligibility, get_credit_provider_details
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
 from ecommerce.extensions.offer.utils import format_benefit_value
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
@@ -36,14 +35,6 @@ class Checkout(TemplateView):
         course = get_object_or_404(Course, id=kwargs.get('course_id'))
         context['course'] = course
 
-        deadline = self._check_credit_eligibility(self.request.user, kwargs.get('course_id'))
-        if not deadline:
-            context.update({
-                'error': _('An error has occurred. We could not confirm that you are eligible for course credit. '
-                           'Try the transaction again.')
-            })
-            return context
-
         partner = get_partner_for_site(self.request)
         strategy = self.request.strategy
         # Audit seats do not have a `certificate_type` attribute, so
@@ -58,6 +49,26 @@ class Checkout(TemplateView):
             if purchase_info.availability.is_available_to_buy and seat.stockrecords.filter(partner=partner).exists():
                 credit_seats.append(seat)
 
+        # The user's eligibility, and the details of the seats' providers, are retrieved from the Credit API
+        # concurrently. The calls are made on threads that do not use the database, so the data they read is
+        # loaded beforehand.
+        user = self.request.user
+        site_configuration = self.request.site.siteconfiguration
+        access_token = user.access_token
+        provider_ids = [seat.attr.credit_provider for seat in credit_seats if seat.attr.credit_provider]
+
+        deadline, providers = map_concurrently(lambda func: func(), [
+            lambda: self._check_credit_eligibility(site_configuration, user.username, access_token, course.id),
+            lambda: self._get_providers_from_lms(site_configuration, access_token, provider_ids),
+        ], 2)
+
+        if not deadline:
+            context.update({
+                'error': _('An error has occurred. We could not confirm that you are eligible for course credit. '
+                           'Try the transaction again.')
+            })
+            return context
+
         if not credit_seats:
             msg = _(
                 'Credit is not currently available for "{course_name}". If you are currently enrolled in the '
@@ -71,7 +82,7 @@ class Checkout(TemplateView):
             context.update({'error': msg})
             return context
 
-        providers = self._get_providers_detail(credit_seats)
+        providers = self._get_providers_detail(credit_seats, providers)
         if not providers:
             context.update({
                 'error': _('An error has occurred. We could not confirm that the institution you selected offers this '
@@ -96,18 +107,20 @@ class Checkout(TemplateView):
     def get(self, request, *args, **kwargs):
         return super(Checkout, self).get(request, args, **kwargs)
 
-    def _check_credit_eligibility(self, user, course_key):
+    def _check_credit_eligibility(self, site_configuration, username, access_token, course_key):
         """ Check that the user is eligible for credit.
 
         Arguments:
-            user(User): User object for which checking the eligibility.
+            site_configuration (SiteConfiguration): Site whose LMS offers the credit.
+            username (str): Username of the user for which the eligibility is checked.
+            access_token (str): Access token of the user.
             course_key(string): The course identifier.
 
         Returns:
             Eligibility deadline date or None if user is not eligible.
         """
         try:
-            eligibilities = self.credit_api_client.eligibility.get(username=user.username, course_key=course_key)
+            eligibilities = get_credit_eligibility(site_configuration, username, access_token, course_key)
             if not eligibilities:
                 return None
 
@@ -117,16 +130,17 @@ class Checkout(TemplateView):
         except SlumberHttpBaseException:
             logging.exception(
                 'Credit API request failed to get eligibility for user [%s] for course [%s].',
-                user.username,
+                username,
                 course_key
             )
             return None
 
-    def _get_providers_detail(self, credit_seats):
+    def _get_providers_detail(self, credit_seats, providers):
         """ Get details for the credit providers for the given credit seats.
 
         Arguments:
             credit_seats (Products[]): List of credit_seats objects.
+            providers (list): Details of the seats' providers, retrieved from the LMS.
 
         Returns:
             A list of dictionaries with provider(s) detail.
@@ -137,7 +151,6 @@ class Checkout(TemplateView):
             discount_type = voucher.benefit.type
             discount_value = voucher.benefit.value
 
-        providers = self._get_providers_from_lms(credit_seats)
         if not providers:
             return None
 
@@ -167,29 +180,22 @@ class Checkout(TemplateView):
 
         return providers_dict.values()
 
-    def _get_providers_from_lms(self, credit_seats):
+    def _get_providers_from_lms(self, site_configuration, access_token, provider_ids):
         """ Helper method for getting provider info from LMS.
 
         Arguments:
-            credit_seats (Products): List of credit_seats objects.
+            site_configuration (SiteConfiguration): Site whose LMS offers the credit.
+            access_token (str): Access token of the user.
+            provider_ids (list): IDs of the providers.
 
         Returns:
-            Response from LMS as json, containing list of providers.
+            List of the providers' details, or None if there are no providers, or they could not be retrieved.
         """
-
-        provider_ids = ",".join([seat.attr.credit_provider for seat in credit_seats if seat.attr.credit_provider])
+        if not provider_ids:
+            return None
 
         try:
-            return self.credit_api_client.providers.get(provider_ids=provider_ids)
+            return get_credit_provider_details(site_configuration, access_token, provider_ids)
         except SlumberHttpBaseException:
             logger.exception('An error occurred while retrieving credit provider details.')
             return None
-
-    @cached_property
-    def credit_api_client(self):
-        """ Returns an instance of the Credit API client. """
-
-        return EdxRestApiClient(
-            get_lms_url('api/credit/v1/'),
-            oauth_access_token=self.request.user.access_token
-        )
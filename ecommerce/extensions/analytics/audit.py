@@ -0,0 +1,201 @@
+"""Structured audit events, and logging handlers that record them off the request path.
+
+Audit events are emitted by ``ecommerce.extensions.analytics.utils.audit_log`` as log records whose message is an
+``AuditMessage``, which holds the event's name and data. Formatting is deferred until a handler formats the record,
+so that, when the audit logger is served by an ``AuditQueueHandler``, emitting an event does no string formatting
+or I/O on the calling thread.
+
+This module is loaded while logging is configured, before applications are ready, so it must not import models.
+"""
+from __future__ import unicode_literals
+
+import atexit
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from Queue import Empty, Full, Queue
+
+from django.utils import six
+from django.utils.encoding import python_2_unicode_compatible
+
+# Sentinel placed on the queue to stop the worker thread.
+_STOP = object()
+
+
+@python_2_unicode_compatible
+class AuditMessage(object):
+    """ Message of an audit event log record.
+
+    Converting the message to a string yields the original audit log format: the event name, followed by the
+    event's data as comma-separated key-value pairs, ordered alphabetically by key. For example:
+
+        payment_received: amount="9.99", basket_id="1", currency="USD"
+    """
+
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+
+    def __str__(self):
+        # Joins sorted keyword argument keys and values with an "=", wraps each value
+        # in quotes, and separates each pair with a comma and a space.
+        payload = ', '.join(['{k}="{v}"'.format(k=k, v=v) for k, v in sorted(self.data.items())])
+        return '{name}: {payload}'.format(name=self.name, payload=payload)
+
+    def as_dict(self):
+        """ Returns the event as a dict, with its name under the 'event' key and its data under the 'data' key. """
+        return {'event': self.name, 'data': self.data}
+
+
+class AuditJSONFormatter(logging.Formatter):
+    """ Formats records as single-line JSON objects.
+
+    Audit events are formatted as their name and data, along with the time at which they were emitted. Other
+    records are formatted as their message.
+    """
+
+    def format(self, record):
+        if isinstance(record.msg, AuditMessage):
+            payload = record.msg.as_dict()
+        else:
+            payload = {'message': record.getMessage()}
+
+        payload.update({
+            'timestamp': datetime.utcfromtimestamp(record.created).isoformat() + 'Z',
+            'level': record.levelname,
+            'logger': record.name,
+        })
+
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+
+        # Values that are not natively serializable (e.g. Decimal amounts) are serialized as strings.
+        return json.dumps(payload, default=six.text_type, sort_keys=True)
+
+
+class AuditQueueHandler(logging.Handler):
+    """ Handler that queues records, to be handled in batches by the handlers of another logger.
+
+    Records are placed on a bounded, in-memory queue, and handled on a background thread by the handlers of the
+    target logger, which are flushed after each batch. If the queue is full, records are dropped, and counted
+    in ``dropped``. The worker thread is started lazily, in the process emitting records, so that handlers
+    created before a pre-fork server forks its workers are usable in each worker process. On interpreter exit,
+    queued records are handled for up to drain_timeout seconds.
+
+    Example configuration:
+
+        'handlers': {
+            'audit_queue': {
+                'class': 'ecommerce.extensions.analytics.audit.AuditQueueHandler',
+                'target': 'ecommerce.audit',
+            },
+        },
+        'loggers': {
+            'ecommerce.extensions.analytics.utils': {'handlers': ['audit_queue'], 'propagate': False},
+            'ecommerce.audit': {'handlers': ['local'], 'propagate': False},
+        }
+    """
+
+    def __init__(self, target, max_queue_size=10000, batch_size=100, drain_timeout=5, level=logging.NOTSET):
+        super(AuditQueueHandler, self).__init__(level=level)
+        self.target = target
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.drain_timeout = drain_timeout
+        self.dropped = 0
+        self._queue = None
+        self._worker = None
+        self._pid = None
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self.lock:
+            if self._pid == pid:
+                return
+
+            # Threads do not survive a fork. Any queue inherited from a parent process is discarded.
+            self._queue = Queue(maxsize=self.max_queue_size)
+            self._worker = threading.Thread(target=self._work, args=(self._queue,), name='audit-log')
+            self._worker.daemon = True
+            self._worker.start()
+            self._pid = pid
+
+        atexit.register(self.drain, self.drain_timeout)
+
+    def emit(self, record):
+        self._ensure_started()
+
+        try:
+            self._queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def _work(self, queue):
+        target = logging.getLogger(self.target)
+
+        while True:
+            batch = [queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except Empty:
+                    break
+
+            for record in batch:
+                if record is _STOP:
+                    self._flush_target(target)
+                    return
+
+                target.handle(record)
+
+            self._flush_target(target)
+
+    def _flush_target(self, target):
+        for handler in target.handlers:
+            handler.flush()
+
+    def drain(self, timeout=None):
+        """ Waits up to timeout seconds for queued records to be handled, and stops the worker thread.
+
+        Returns:
+            bool: True if all queued records were handled; otherwise, False.
+        """
+        with self.lock:
+            if self._pid != os.getpid():
+                return True
+
+            self._pid = None
+            queue, worker = self._queue, self._worker
+
+        try:
+            queue.put(_STOP, timeout=timeout)
+        except Full:
+            return False
+
+        worker.join(timeout)
+        return not worker.is_alive()
+
+
+class BatchedFileHandler(logging.FileHandler):
+    """ File handler that writes records without flushing them, leaving that to the caller.
+
+    Used as a target of AuditQueueHandler, which flushes handlers after each batch of records, records are
+    written to the file with one flush per batch rather than one per record.
+    """
+
+    def __init__(self, filename, mode='a', encoding='utf-8', delay=False):
+        super(BatchedFileHandler, self).__init__(filename, mode=mode, encoding=encoding, delay=delay)
+
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+
+        try:
+            self.stream.write('{}\n'.format(self.format(record)))
+        except Exception:  # pylint: disable=broad-except
+            self.handleError(record)
@@ -0,0 +1,135 @@
+from decimal import Decimal
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+from testfixtures import LogCapture
+
+from ecommerce.extensions.analytics.audit import (AuditJSONFormatter, AuditMessage, AuditQueueHandler,
+                                                  BatchedFileHandler)
+from ecommerce.extensions.analytics.utils import audit_log
+from ecommerce.tests.testcases import TestCase
+
+LOGGER_NAME = 'ecommerce.extensions.analytics.utils'
+TARGET_LOGGER_NAME = 'ecommerce.tests.audit'
+
+
+def make_record(msg):
+    return logging.LogRecord(LOGGER_NAME, logging.INFO, __file__, 1, msg, (), None)
+
+
+class CallbackFilter(logging.Filter):
+    """ Filter that calls the given function with each record, and passes the records for which it returns True. """
+
+    def __init__(self, callback):
+        super(CallbackFilter, self).__init__()
+        self.callback = callback
+
+    def filter(self, record):
+        return self.callback(record)
+
+
+class AuditMessageTests(TestCase):
+    def test_str(self):
+        """ Verify the message is formatted as the event name, followed by the sorted key-value pairs. """
+        message = AuditMessage('payment_received', {'currency': 'USD', 'amount': Decimal('9.99')})
+        self.assertEqual(unicode(message), 'payment_received: amount="9.99", currency="USD"')
+
+    def test_audit_log(self):
+        """ Verify audit_log emits a record whose message holds the event. """
+        with LogCapture(LOGGER_NAME) as l:
+            audit_log('order_placed', order_number='EDX-100001', user_id=1)
+
+            record = l.records[0]
+            self.assertEqual(record.msg.as_dict(), {
+                'event': 'order_placed',
+                'data': {'order_number': 'EDX-100001', 'user_id': 1}
+            })
+            l.check((LOGGER_NAME, 'INFO', 'order_placed: order_number="EDX-100001", user_id="1"'))
+
+
+class AuditJSONFormatterTests(TestCase):
+    def test_format_audit_event(self):
+        """ Verify audit events are formatted as JSON objects holding the event's name and data. """
+        record = make_record(AuditMessage('payment_received', {'amount': Decimal('9.99')}))
+        actual = json.loads(AuditJSONFormatter().format(record))
+
+        self.assertEqual(actual['event'], 'payment_received')
+        self.assertEqual(actual['data'], {'amount': '9.99'})
+        self.assertEqual(actual['level'], 'INFO')
+        self.assertEqual(actual['logger'], LOGGER_NAME)
+        self.assertIn('timestamp', actual)
+
+    def test_format_message(self):
+        """ Verify other records are formatted as JSON objects holding their message. """
+        actual = json.loads(AuditJSONFormatter().format(make_record('Hello')))
+        self.assertEqual(actual['message'], 'Hello')
+
+
+class AuditQueueHandlerTests(TestCase):
+    def test_emit(self):
+        """ Verify records are handled by the target logger's handlers on a background thread. """
+        handler = AuditQueueHandler(TARGET_LOGGER_NAME)
+        thread_names = []
+
+        with LogCapture(TARGET_LOGGER_NAME) as l:
+            l.addFilter(CallbackFilter(lambda record: thread_names.append(threading.current_thread().name) or True))
+            handler.handle(make_record(AuditMessage('order_placed', {'order_number': 'EDX-100001'})))
+            self.assertTrue(handler.drain(5))
+
+            l.check((LOGGER_NAME, 'INFO', 'order_placed: order_number="EDX-100001"'))
+
+        self.assertEqual(thread_names, ['audit-log'])
+
+    def test_queue_full(self):
+        """ Verify records are dropped if the queue is full. """
+        handler = AuditQueueHandler(TARGET_LOGGER_NAME, max_queue_size=1)
+        started = threading.Event()
+        release = threading.Event()
+
+        def block(__):
+            started.set()
+            release.wait(5)
+            return True
+
+        with LogCapture(TARGET_LOGGER_NAME) as l:
+            l.addFilter(CallbackFilter(block))
+
+            # The first record is being handled, and the second is queued, when the third is emitted.
+            handler.handle(make_record('first'))
+            self.assertTrue(started.wait(5))
+            handler.handle(make_record('second'))
+            handler.handle(make_record('third'))
+
+            release.set()
+            self.assertTrue(handler.drain(5))
+
+            l.check((LOGGER_NAME, 'INFO', 'first'), (LOGGER_NAME, 'INFO', 'second'))
+
+        self.assertEqual(handler.dropped, 1)
+
+
+class BatchedFileHandlerTests(TestCase):
+    def setUp(self):
+        super(BatchedFileHandlerTests, self).setUp()
+        self.log_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.log_dir)
+
+    def test_emit(self):
+        """ Verify records are written to the file, one per line, when the handler is flushed. """
+        filename = os.path.join(self.log_dir, 'audit.log')
+        handler = BatchedFileHandler(filename)
+        handler.setFormatter(AuditJSONFormatter())
+        self.addCleanup(handler.close)
+
+        handler.handle(make_record('first'))
+        handler.handle(make_record('second'))
+        handler.flush()
+
+        with open(filename) as f:
+            messages = [json.loads(line)['message'] for line in f]
+
+        self.assertEqual(messages, ['first', 'second'])
@@ -1,8 +1,11 @@
 import json
 
 from django.contrib.auth.models import AnonymousUser
+from django.test import override_settings
+import mock
 
-from ecommerce.extensions.analytics.utils import prepare_analytics_data
+from ecommerce.extensions.analytics import utils
+from ecommerce.extensions.analytics.utils import get_segment_client, prepare_analytics_data
 from ecommerce.tests.testcases import TestCase
 
 
@@ -33,3 +36,33 @@ class UtilsTest(TestCase):
             'tracking': {'segmentApplicationId': self.site.siteconfiguration.segment_key},
             'user': 'AnonymousUser'
         })
+
+
+class SegmentClientTests(TestCase):
+    """ Tests for the Segment client registry. """
+
+    def setUp(self):
+        super(SegmentClientTests, self).setUp()
+        utils._segment_clients.clear()  # pylint: disable=protected-access
+        self.addCleanup(utils._segment_clients.clear)  # pylint: disable=protected-access
+
+    @override_settings(SEGMENT_MAX_QUEUE_SIZE=5)
+    def test_get_segment_client(self):
+        """ Verify a single client, with a bounded queue, is created for each Segment key. """
+        client = get_segment_client('key-a')
+        self.assertEqual(client.write_key, 'key-a')
+        self.assertEqual(client.queue.maxsize, 5)
+        self.assertIs(get_segment_client('key-a'), client)
+        self.assertIsNot(get_segment_client('key-b'), client)
+
+    def test_site_configuration_segment_client(self):
+        """ Verify site configurations sharing a Segment key share a client. """
+        site_configuration = self.site.siteconfiguration
+        self.assertIs(site_configuration.segment_client, get_segment_client(site_configuration.segment_key))
+
+    def test_get_segment_client_after_fork(self):
+        """ Verify clients created by a parent process are not reused after a fork. """
+        client = get_segment_client('key-a')
+
+        with mock.patch('ecommerce.extensions.analytics.utils.os.getpid', return_value=-1):
+            self.assertIsNot(get_segment_client('key-a'), client)
@@ -1,12 +1,61 @@
 from functools import wraps
 import json
 import logging
+import os
+import threading
 
+from analytics import Client as SegmentClient
+from django.conf import settings
 from threadlocals.threadlocals import get_current_request
 
+from ecommerce.extensions.analytics.audit import AuditMessage
+
 
 logger = logging.getLogger(__name__)
 
+# Relations of order lines read while building tracking event payloads. Selecting them with the lines avoids
+# querying them separately for each line.
+ORDER_LINE_TRACKING_RELATIONS = ('product__course', 'product__product_class', 'product__parent__product_class')
+
+_segment_clients = {}
+_segment_clients_lock = threading.Lock()
+_segment_clients_pid = None
+
+
+def get_segment_client(segment_key):
+    """Returns the process-wide Segment client for the given write key.
+
+    Each client queues tracked events in a bounded, in-memory queue, from which a background thread sends them
+    to Segment in batches. Sharing a client per key, rather than creating one for each site configuration
+    instance, keeps the number of queues and threads bounded by the number of Segment projects. Events tracked
+    while the queue is full are dropped.
+
+    Arguments:
+        segment_key (str): Segment write/API key.
+
+    Returns:
+        analytics.Client
+    """
+    global _segment_clients_pid  # pylint: disable=global-statement
+
+    pid = os.getpid()
+    client = _segment_clients.get(segment_key) if _segment_clients_pid == pid else None
+
+    if client is None:
+        with _segment_clients_lock:
+            # Threads do not survive a fork. Clients inherited from a parent process are discarded.
+            if _segment_clients_pid != pid:
+                _segment_clients.clear()
+                _segment_clients_pid = pid
+
+            client = _segment_clients.get(segment_key)
+            if client is None:
+                client = _segment_clients[segment_key] = SegmentClient(
+                    segment_key, debug=settings.DEBUG, max_queue_size=settings.SEGMENT_MAX_QUEUE_SIZE
+                )
+
+    return client
+
 
 def is_segment_configured():
     """Returns a Boolean indicating if Segment has been configured for use."""
@@ -60,7 +109,7 @@ def silence_exceptions(msg):
 
 
 def audit_log(name, **kwargs):
-    """DRY helper used to emit an INFO-level log message.
+    """DRY helper used to emit an INFO-level audit event.
 
     Messages logged with this function are used to construct an audit trail. Log messages
     should be emitted immediately after the event they correspond to has occurred and, if
@@ -68,6 +117,10 @@ def audit_log(name, **kwargs):
     key-value pair syntax to make it easier to extract fields when parsing the application's
     logs.
 
+    The logged message is an AuditMessage, which is only formatted when the record is handled. When this
+    module's logger is served by an AuditQueueHandler, emitting the event does no string formatting or I/O.
+    Handlers may also format the event as structured data (e.g. with AuditJSONFormatter).
+
     This function is variadic, accepting a variable number of keyword arguments.
 
     Arguments:
@@ -80,12 +133,7 @@ def audit_log(name, **kwargs):
     Returns:
         None
     """
-    # Joins sorted keyword argument keys and values with an "=", wraps each value
-    # in quotes, and separates each pair with a comma and a space.
-    payload = u', '.join([u'{k}="{v}"'.format(k=k, v=v) for k, v in sorted(kwargs.items())])
-    message = u'{name}: {payload}'.format(name=name, payload=payload)
-
-    logger.info(message)
+    logger.info(AuditMessage(name, kwargs))
 
 
 def prepare_analytics_data(user, segment_key, course_id=None):
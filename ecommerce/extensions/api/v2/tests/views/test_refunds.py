@@ -177,6 +177,54 @@ class RefundCreateViewTests(RefundTestMixin, AccessTokenMixin, JwtMixin, TestCas
         self.assertEqual(Refund.objects.count(), 0)
 
 
+@ddt.ddt
+class RefundBulkCreateViewTests(RefundTestMixin, TestCase):
+    path = reverse('api:v2:refunds:bulk_create')
+
+    def setUp(self):
+        super(RefundBulkCreateViewTests, self).setUp()
+        self.user = self.create_user(is_staff=True)
+        self.client.login(username=self.user.username, password=self.password)
+
+    def post(self, data):
+        return self.client.post(self.path, json.dumps(data), JSON_CONTENT_TYPE)
+
+    def test_staff_only(self):
+        """ The view should only be accessible to staff users. """
+        user = self.create_user(is_staff=False)
+        self.client.login(username=user.username, password=self.password)
+        response = self.post({'course_id': self.course.id})
+        self.assertEqual(response.status_code, 403)
+
+    @ddt.data({}, {'course_id': ' '}, {'course_id': 'a/b/c', 'usernames': 'not-a-list'})
+    def test_invalid_data(self, data):
+        """ The view should return HTTP 400 if the data is invalid. """
+        response = self.post(data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_no_orders(self):
+        """ If there are no eligible orders, no refund IDs should be returned. HTTP status should be 200. """
+        response = self.post({'course_id': self.course.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), [])
+
+    @ddt.data(False, True)
+    def test_create(self, approve):
+        """ The view should create refunds for the eligible orders of the given users, and return their IDs. """
+        learner = self.create_user()
+        order = self.create_order(user=learner)
+        self.create_order(user=self.create_user())
+
+        with mock.patch.object(Refund, 'approve', autospec=True, return_value=True) as mock_approve:
+            response = self.post({'course_id': self.course.id, 'usernames': [learner.username], 'approve': approve})
+
+        refund = Refund.objects.get()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content), [refund.id])
+        self.assertEqual(refund.order, order)
+        self.assertEqual(mock_approve.called, approve)
+
+
 @ddt.ddt
 class RefundProcessViewTests(ThrottlingMixin, TestCase):
     def setUp(self):
@@ -243,3 +291,66 @@ class RefundProcessViewTests(ThrottlingMixin, TestCase):
             response = self.put(decision)
             self.assertEqual(response.status_code, 500)
             self.assertEqual(response.data, RefundSerializer(self.refund).data)
+
+
+@ddt.ddt
+class RefundBulkProcessViewTests(TestCase):
+    path = reverse('api:v2:refunds:bulk_process')
+
+    def setUp(self):
+        super(RefundBulkProcessViewTests, self).setUp()
+        self.user = self.create_user(is_staff=True)
+        self.client.login(username=self.user.username, password=self.password)
+        self.refunds = [RefundFactory(user=self.user), RefundFactory(user=self.user)]
+
+    def post(self, action, ids=None):
+        ids = [refund.id for refund in self.refunds] if ids is None else ids
+        return self.client.post(self.path, json.dumps({'action': action, 'ids': ids}), JSON_CONTENT_TYPE)
+
+    def test_staff_only(self):
+        """ The view should only be accessible to staff users. """
+        user = self.create_user(is_staff=False)
+        self.client.login(username=user.username, password=self.password)
+        response = self.post('approve')
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalid_action(self):
+        """ If the action is neither approve, approve_payment_only, nor deny, the view should return HTTP 400. """
+        response = self.post('reject')
+        self.assertEqual(response.status_code, 400)
+
+    @ddt.data([], 'abc', ['abc'])
+    def test_invalid_ids(self, ids):
+        """ If the refund ids are missing or invalid, the view should return HTTP 400. """
+        response = self.post('approve', ids=ids)
+        self.assertEqual(response.status_code, 400)
+
+    def test_missing_refunds(self):
+        """ If any of the refunds does not exist, the view should return HTTP 400, and process no refunds. """
+        with mock.patch('ecommerce.extensions.refund.models.Refund.approve') as mock_approve:
+            response = self.post('approve', ids=[self.refunds[0].id, 0])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content), {'detail': 'Refunds [0] do not exist.'})
+        self.assertFalse(mock_approve.called)
+
+    @ddt.data(
+        ('approve', 'approve'),
+        ('approve', 'approve_payment_only'),
+        ('deny', 'deny')
+    )
+    @ddt.unpack
+    def test_process(self, action, decision):
+        """ The view should process each refund, and stream the result for each refund. """
+        with mock.patch('ecommerce.extensions.refund.models.Refund.{}'.format(action),
+                        mock.Mock(side_effect=[True, False])):
+            response = self.post(decision)
+            content = ''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        expected = [
+            {'id': refund.id, 'status': refund.status, 'success': success}
+            for refund, success in zip(self.refunds, [True, False])
+        ]
+        self.assertEqual([json.loads(line) for line in content.splitlines()], expected)
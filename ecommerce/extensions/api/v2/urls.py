@@ -44,7 +44,9 @@ PAYMENT_URLS = [
 
 REFUND_URLS = [
     url(r'^$', refund_views.RefundCreateView.as_view(), name='create'),
+    url(r'^bulk/$', refund_views.RefundBulkCreateView.as_view(), name='bulk_create'),
     url(r'^(?P<pk>[\d]+)/process/$', refund_views.RefundProcessView.as_view(), name='process'),
+    url(r'^process/$', refund_views.RefundBulkProcessView.as_view(), name='bulk_process'),
 ]
 
 COUPON_URLS = [
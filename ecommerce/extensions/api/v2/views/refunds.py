@@ -1,15 +1,22 @@
 """HTTP endpoints for interacting with refunds."""
+import json
+
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
 from oscar.core.loading import get_model
 from rest_framework import status, generics
 from rest_framework.exceptions import ParseError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.exceptions import BadRequestException
 from ecommerce.extensions.api.permissions import CanActForUser
-from ecommerce.extensions.refund.api import find_orders_associated_with_course, create_refunds
+from ecommerce.extensions.refund.api import (create_refunds, create_refunds_for_course,
+                                             find_orders_associated_with_course, process_refunds, REFUND_ACTIONS)
 
 
 Refund = get_model('refund', 'Refund')
@@ -70,6 +77,60 @@ class RefundCreateView(generics.CreateAPIView):
         return Response([], status=status.HTTP_200_OK)
 
 
+class RefundBulkCreateView(generics.CreateAPIView):
+    """Creates refunds for all learners of a course.
+
+    Given a course ID, this view creates a refund for each order matching the following criteria:
+
+        * Order is in the COMPLETE state.
+        * Order has at least one unrefunded line item associated with the course ID.
+        * Order was placed by one of the users linked to the (optional) list of usernames.
+
+    As with RefundCreateView, only the line items associated with the course ID will be refunded. If approve is
+    true, the refunds are also approved; revoke_fulfillment (default true) determines whether approval revokes
+    fulfillment of the refunded items.
+
+    Only staff users are permitted to use this view.
+
+    If refunds are created, a list of the refund IDs will be returned along with HTTP 201.
+    If no refunds are created, HTTP 200 will be returned.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser,)
+
+    # Refunds must be committed before they are approved, since approval may be done by other threads.
+    @method_decorator(transaction.non_atomic_requests)
+    def dispatch(self, request, *args, **kwargs):
+        return super(RefundBulkCreateView, self).dispatch(request, *args, **kwargs)
+
+    def create(self, request, *args, **kwargs):
+        """ Creates refunds, if eligible orders exist. """
+        course_id = request.data.get('course_id')
+        usernames = request.data.get('usernames')
+        approve = request.data.get('approve', False)
+        revoke_fulfillment = request.data.get('revoke_fulfillment', True)
+
+        if not course_id:
+            raise BadRequestException('No course_id specified.')
+
+        if usernames is not None and not isinstance(usernames, list):
+            raise BadRequestException('usernames must be a list.')
+
+        try:
+            refunds = create_refunds_for_course(
+                course_id, usernames=usernames, approve=approve, revoke_fulfillment=revoke_fulfillment
+            )
+        except ValueError as e:
+            raise BadRequestException(e.message)
+
+        # Return HTTP 201 if we created refunds.
+        if refunds:
+            refund_ids = [refund.id for refund in refunds]
+            return Response(refund_ids, status=status.HTTP_201_CREATED)
+
+        # Return HTTP 200 if we did NOT create refunds.
+        return Response([], status=status.HTTP_200_OK)
+
+
 class RefundProcessView(generics.UpdateAPIView):
     """Process--approve or deny--refunds.
 
@@ -105,3 +166,61 @@ class RefundProcessView(generics.UpdateAPIView):
         http_status = status.HTTP_200_OK if result else status.HTTP_500_INTERNAL_SERVER_ERROR
         serializer = self.get_serializer(refund)
         return Response(serializer.data, status=http_status)
+
+
+class RefundBulkProcessView(APIView):
+    """Process--approve or deny--many refunds.
+
+    Given a list of refund IDs and an action (approve, approve_payment_only, or deny), this view processes each
+    refund, as RefundProcessView would. Refunds are processed concurrently, grouped by the payment processor that
+    will issue their credits.
+
+    The response is a stream of newline-delimited JSON objects, one per refund, each written as soon as the
+    refund has been processed:
+
+        {"id": 1, "status": "Complete", "success": true}
+
+    Only staff users are permitted to use this view.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser,)
+
+    # Refunds are processed while the response is streamed, on threads with their own database connections.
+    @method_decorator(transaction.non_atomic_requests)
+    def dispatch(self, request, *args, **kwargs):
+        return super(RefundBulkProcessView, self).dispatch(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):  # pylint: disable=unused-argument
+        action = request.data.get('action', '').lower()
+        ids = request.data.get('ids')
+
+        if action not in REFUND_ACTIONS:
+            raise ParseError('The action [{}] is not valid.'.format(action))
+
+        if not ids or not isinstance(ids, list):
+            raise BadRequestException('No refund ids specified.')
+
+        try:
+            ids = set(int(refund_id) for refund_id in ids)
+        except (TypeError, ValueError):
+            raise BadRequestException('Refund ids must be integers.')
+
+        refunds = list(
+            Refund.objects.filter(id__in=ids).select_related('order', 'user').prefetch_related(
+                'order__sources__source_type'
+            ).order_by('id')
+        )
+
+        missing_ids = ids - set(refund.id for refund in refunds)
+        if missing_ids:
+            raise BadRequestException('Refunds [{}] do not exist.'.format(
+                ', '.join(str(refund_id) for refund_id in sorted(missing_ids))))
+
+        # The refunds are processed while the response is streamed, after this method has returned. The processors are
+        # set up now, while this request is the current request.
+        results = process_refunds(refunds, action)
+
+        def report():
+            for refund, result in results:
+                yield json.dumps({'id': refund.id, 'status': refund.status, 'success': result}) + '\n'
+
+        return StreamingHttpResponse(report(), content_type='application/x-ndjson')
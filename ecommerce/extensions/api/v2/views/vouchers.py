@@ -16,6 +16,7 @@ from ecommerce.core.constants import DEFAULT_CATALOG_PAGE_SIZE
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import get_course_info_from_catalog
 from ecommerce.coupons.utils import get_range_catalog_query_results
+from ecommerce.credit.utils import get_credit_eligibilities
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.permissions import IsOffersOrIsAuthenticatedAndStaff
 from ecommerce.extensions.api.v2.views import NonDestroyableModelViewSet
@@ -136,6 +137,16 @@ class VoucherViewSet(NonDestroyableModelViewSet):
         next_page = response['next']
         products, stock_records = self.retrieve_course_objects(response['results'], course_seat_types)
         contains_verified_course = (course_seat_types == 'verified')
+
+        if course_seat_types == 'credit':
+            # Eligibility for all of the page's courses is retrieved in one pass, rather than once per product.
+            credit_eligibilities = get_credit_eligibilities(
+                request.site.siteconfiguration,
+                request.user.username,
+                request.user.access_token,
+                [product.course_id for product in products]
+            )
+
         for product in products:
             # Omit unavailable seats from the offer results so that one seat does not cause an
             # error message for every seat in the query result.
@@ -150,7 +161,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
             )
             if course_seat_types == 'credit':
                 # Omit credit seats for which the user is not eligible or which the user already bought.
-                if request.user.is_eligible_for_credit(product.course_id):
+                if credit_eligibilities[product.course_id]:
                     if Order.objects.filter(user=request.user, lines__product=product).exists():
                         continue
                 else:
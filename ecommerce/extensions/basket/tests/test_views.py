@@ -173,6 +173,23 @@ class BasketSingleItemViewTests(CouponMixin, CourseCatalogTestMixin, CourseCatal
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.content, expected_content)
 
+    @httpretty.activate
+    @override_settings(ENROLLMENT_STATUS_CACHE_TIMEOUT=60)
+    def test_enrolled_student_cached(self):
+        """ Verify the enrollment status checked when adding a seat to the basket is cached. """
+        self.addCleanup(cache.clear)
+        self.mock_enrollment_api_success_enrolled(self.course.id, mode='verified')
+        url = '{path}?sku={sku}'.format(path=self.path, sku=self.stock_record.partner_sku)
+
+        for __ in range(2):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 400)
+
+        enrollment_requests = [
+            request for request in httpretty.httpretty.latest_requests if '/api/enrollment/' in request.path
+        ]
+        self.assertEqual(len(enrollment_requests), 1)
+
     @httpretty.activate
     @ddt.data(('verified', False), ('professional', True), ('no-id-professional', False))
     @ddt.unpack
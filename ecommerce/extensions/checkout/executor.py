@@ -0,0 +1,119 @@
+""" In-process execution of post-checkout receivers.
+
+Deployments without a Celery broker can use this executor, instead of the ecommerce-worker, to fulfill orders
+asynchronously. It is enabled by setting ASYNC_ORDER_FULFILLMENT_EXECUTOR to 'in_process'; the
+async_order_fulfillment Waffle sample continues to determine which orders are fulfilled asynchronously.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.core.signals import got_request_exception, request_finished, request_started
+from django.db import transaction
+from django.dispatch import receiver
+from oscar.core.loading import get_class, get_model
+from threadlocals.threadlocals import get_current_request, set_thread_variable
+
+from ecommerce.core.exceptions import ExecutorUnavailableError
+from ecommerce.core.executor import BoundedThreadPool
+
+logger = logging.getLogger(__name__)
+Order = get_model('order', 'Order')
+post_checkout = get_class('checkout.signals', 'post_checkout')
+
+CELERY_EXECUTOR = 'celery'
+IN_PROCESS_EXECUTOR = 'in_process'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Tracks, per thread, whether a request is being handled, and the orders whose post-checkout receivers
+# should run once the request's transaction is committed.
+_state = threading.local()
+
+
+def get_post_checkout_executor():
+    """ Returns the process-wide thread pool used to run post-checkout receivers. """
+    global _executor  # pylint: disable=global-statement
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedThreadPool(
+                    'post_checkout',
+                    settings.IN_PROCESS_FULFILLMENT_WORKERS,
+                    settings.IN_PROCESS_FULFILLMENT_QUEUE_SIZE,
+                    drain_timeout=settings.IN_PROCESS_FULFILLMENT_DRAIN_TIMEOUT
+                )
+
+    return _executor
+
+
+def _run_post_checkout(sender, order_number, request):
+    """ Sends the post_checkout signal for the given order. Runs on an executor thread. """
+    # Receivers may rely on the current request (e.g. to determine the site).
+    set_thread_variable('request', request)
+
+    try:
+        order = Order.objects.get(number=order_number)
+        post_checkout.send(sender=sender, order=order, request=request)
+    except Order.DoesNotExist:
+        logger.error('Order [%s] does not exist. Its post-checkout receivers will not be run.', order_number)
+    finally:
+        set_thread_variable('request', None)
+
+
+def _submit(sender, order, request):
+    try:
+        get_post_checkout_executor().submit(_run_post_checkout, sender, order.number, request)
+    except ExecutorUnavailableError:
+        logger.warning('Post-checkout executor is unavailable. Running receivers for order [%s] synchronously.',
+                       order.number)
+        post_checkout.send(sender=sender, order=order, request=request)
+
+
+def submit_post_checkout(sender, order, request=None):
+    """ Runs the post-checkout receivers for the given order on the in-process executor.
+
+    The executor's threads use their own database connections, so the order must be committed before they
+    can see it. If called during a request with an open transaction (e.g. with ATOMIC_REQUESTS), submission is
+    deferred until the request has finished. Outside of a request, receivers are run synchronously when a
+    transaction is open. If the executor's queue is full, receivers are run synchronously.
+
+    Arguments:
+        sender (object): Sender of the post_checkout signal.
+        order (Order): Order whose receivers should be run.
+        request (HttpRequest): Request in which the order was placed, if any.
+    """
+    request = request or get_current_request()
+
+    if not transaction.get_connection().in_atomic_block:
+        _submit(sender, order, request)
+    elif getattr(_state, 'in_request', False):
+        _state.pending.append((sender, order, request))
+    else:
+        logger.info('Order [%s] was placed in an open transaction, outside of a request. '
+                    'Running its post-checkout receivers synchronously.', order.number)
+        post_checkout.send(sender=sender, order=order, request=request)
+
+
+@receiver(request_started, dispatch_uid='checkout.executor.request_started')
+def _start_request(sender, **kwargs):  # pylint: disable=unused-argument
+    _state.in_request = True
+    _state.pending = []
+
+
+@receiver(got_request_exception, dispatch_uid='checkout.executor.got_request_exception')
+def _discard_pending(sender, **kwargs):  # pylint: disable=unused-argument
+    # The request's transaction is rolled back, so the pending orders do not exist.
+    _state.pending = []
+
+
+@receiver(request_finished, dispatch_uid='checkout.executor.request_finished')
+def _finish_request(sender, **kwargs):  # pylint: disable=unused-argument
+    pending = getattr(_state, 'pending', [])
+    _state.in_request = False
+    _state.pending = []
+
+    for order_sender, order, request in pending:
+        _submit(order_sender, order, request)
@@ -4,6 +4,7 @@ from __future__ import unicode_literals
 import abc
 import logging
 
+from django.conf import settings
 from django.db import transaction
 from ecommerce_worker.fulfillment.v1.tasks import fulfill_order
 from oscar.apps.checkout.mixins import OrderPlacementMixin
@@ -13,6 +14,7 @@ import waffle
 from ecommerce.extensions.analytics.utils import audit_log
 from ecommerce.extensions.api import data as data_api
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
+from ecommerce.extensions.checkout.executor import IN_PROCESS_EXECUTOR, submit_post_checkout
 from ecommerce.extensions.customer.utils import Dispatcher
 
 CommunicationEventType = get_model('customer', 'CommunicationEventType')
@@ -108,11 +110,15 @@ class EdxOrderPlacementMixin(OrderPlacementMixin):
         )
 
         if waffle.sample_is_active('async_order_fulfillment'):
-            # Always commit transactions before sending tasks depending on state from the current transaction!
-            # There's potential for a race condition here if the task starts executing before the active
-            # transaction has been committed; the necessary order doesn't exist in the database yet.
-            # See http://celery.readthedocs.org/en/latest/userguide/tasks.html#database-transactions.
-            fulfill_order.delay(order.number, site_code=order.site.siteconfiguration.partner.short_code)
+            if settings.ASYNC_ORDER_FULFILLMENT_EXECUTOR == IN_PROCESS_EXECUTOR:
+                # Receivers are run on a thread pool in this process, once the active transaction is committed.
+                submit_post_checkout(self, order, request)
+            else:
+                # Always commit transactions before sending tasks depending on state from the current transaction!
+                # There's potential for a race condition here if the task starts executing before the active
+                # transaction has been committed; the necessary order doesn't exist in the database yet.
+                # See http://celery.readthedocs.org/en/latest/userguide/tasks.html#database-transactions.
+                fulfill_order.delay(order.number, site_code=order.site.siteconfiguration.partner.short_code)
         else:
             post_checkout.send(sender=self, order=order, request=request)
 
@@ -8,7 +8,8 @@ import waffle
 
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.utils import mode_for_seat
-from ecommerce.extensions.analytics.utils import is_segment_configured, parse_tracking_context, silence_exceptions
+from ecommerce.extensions.analytics.utils import (is_segment_configured, ORDER_LINE_TRACKING_RELATIONS,
+                                                  parse_tracking_context, silence_exceptions)
 from ecommerce.extensions.checkout.utils import get_provider_data
 from ecommerce.notifications.notifications import send_notification
 
@@ -48,7 +49,7 @@ def track_completed_order(sender, order=None, **kwargs):  # pylint: disable=unus
                     'price': str(line.line_price_excl_tax),
                     'quantity': line.quantity,
                     'category': line.product.get_product_class().name,
-                } for line in order.lines.all()
+                } for line in order.lines.select_related(*ORDER_LINE_TRACKING_RELATIONS)
             ],
         },
         context={
@@ -0,0 +1,70 @@
+"""Tests for the in-process post-checkout executor."""
+from django.core.signals import got_request_exception, request_finished, request_started
+from django.db import transaction
+from mock import patch
+from oscar.core.loading import get_class
+
+from ecommerce.core.exceptions import ExecutorUnavailableError
+from ecommerce.extensions.checkout import executor
+from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.tests.testcases import TestCase
+
+post_checkout = get_class('checkout.signals', 'post_checkout')
+
+
+@patch('ecommerce.extensions.checkout.executor.get_post_checkout_executor')
+class SubmitPostCheckoutTests(RefundTestMixin, TestCase):
+    """ Tests for submit_post_checkout. """
+
+    def setUp(self):
+        super(SubmitPostCheckoutTests, self).setUp()
+        self.user = self.create_user()
+        self.order = self.create_order(status=ORDER.OPEN)
+
+    def test_deferred_until_request_finished(self, mock_get_executor):
+        """ Verify orders placed during a request, in an open transaction, are submitted when the request ends. """
+        request_started.send(sender=self.__class__)
+
+        with transaction.atomic():
+            executor.submit_post_checkout(self, self.order)
+            self.assertFalse(mock_get_executor.return_value.submit.called)
+
+        request_finished.send(sender=self.__class__)
+        mock_get_executor.return_value.submit.assert_called_once_with(
+            executor._run_post_checkout, self, self.order.number, None  # pylint: disable=protected-access
+        )
+
+    def test_discarded_on_request_exception(self, mock_get_executor):
+        """ Verify pending orders are discarded if the request fails, since its transaction is rolled back. """
+        request_started.send(sender=self.__class__)
+
+        with transaction.atomic():
+            executor.submit_post_checkout(self, self.order)
+
+        got_request_exception.send(sender=self.__class__)
+        request_finished.send(sender=self.__class__)
+        self.assertFalse(mock_get_executor.return_value.submit.called)
+
+    def test_synchronous_outside_request(self, mock_get_executor):
+        """ Verify receivers run synchronously for orders placed in an open transaction outside of a request. """
+        with patch.object(post_checkout, 'send') as mock_send:
+            with transaction.atomic():
+                executor.submit_post_checkout(self, self.order)
+
+            mock_send.assert_called_once_with(sender=self, order=self.order, request=None)
+            self.assertFalse(mock_get_executor.return_value.submit.called)
+
+    def test_executor_unavailable(self, mock_get_executor):
+        """ Verify receivers run synchronously if the executor cannot accept the order. """
+        mock_get_executor.return_value.submit.side_effect = ExecutorUnavailableError
+
+        with patch.object(post_checkout, 'send') as mock_send:
+            executor._submit(self, self.order, None)  # pylint: disable=protected-access
+            mock_send.assert_called_once_with(sender=self, order=self.order, request=None)
+
+    def test_run_post_checkout(self, __):
+        """ Verify the executor task sends the post_checkout signal for the order. """
+        with patch.object(post_checkout, 'send') as mock_send:
+            executor._run_post_checkout(self, self.order.number, None)  # pylint: disable=protected-access
+            mock_send.assert_called_once_with(sender=self, order=self.order, request=None)
@@ -5,14 +5,14 @@ from decimal import Decimal
 
 from mock import Mock, patch
 from django.core import mail
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
 from oscar.core.loading import get_model
 from oscar.test import factories
 from oscar.test.newfactories import BasketFactory, ProductFactory, UserFactory
 from testfixtures import LogCapture
 from waffle.models import Sample
 
-from ecommerce.core.models import SegmentClient
+from ecommerce.extensions.analytics.utils import SegmentClient
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.fulfillment.status import ORDER
@@ -190,6 +190,20 @@ class EdxOrderPlacementMixinTests(BusinessIntelligenceMixin, RefundTestMixin, Te
             self.assertTrue(mock_delay.called)
             mock_delay.assert_called_once_with(self.order.number, site_code='edX')
 
+    @override_settings(ASYNC_ORDER_FULFILLMENT_EXECUTOR='in_process')
+    def test_handle_successful_in_process_order(self, __):
+        """
+        Verify that orders selected for async fulfillment are submitted to the in-process executor, if configured.
+        """
+        Sample.objects.update_or_create(name='async_order_fulfillment', defaults={'percent': 100.0})
+        mixin = EdxOrderPlacementMixin()
+
+        with patch('ecommerce.extensions.checkout.mixins.submit_post_checkout') as mock_submit:
+            with patch('ecommerce.extensions.checkout.mixins.fulfill_order.delay') as mock_delay:
+                mixin.handle_successful_order(self.order)
+                mock_submit.assert_called_once_with(mixin, self.order, None)
+                self.assertFalse(mock_delay.called)
+
     def test_place_free_order(self, __):
         """ Verify an order is placed and the basket is submitted. """
         basket = BasketFactory(owner=self.user, site=self.site)
@@ -1,4 +1,6 @@
 import ddt
+from django.core.cache import cache
+from django.test import override_settings
 import httpretty
 import mock
 import requests
@@ -6,6 +8,7 @@ from requests import ConnectionError, Timeout
 
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.extensions.checkout.utils import get_provider_data
+from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.testcases import TestCase
 
 
@@ -24,6 +27,25 @@ class UtilTests(TestCase):
         provider_data = get_provider_data('ASU')
         self.assertDictEqual(provider_data, {"display_name": "Arizona State University"})
 
+    @httpretty.activate
+    @override_settings(CREDIT_PROVIDER_CACHE_TIMEOUT=60)
+    def test_get_provider_data_cached(self):
+        """ Verify provider data is cached for each site. """
+        self.addCleanup(cache.clear)
+        httpretty.register_uri(
+            httpretty.GET, get_lms_url('api/credit/v1/providers/ASU'),
+            body='{"display_name": "Arizona State University"}',
+            content_type="application/json"
+        )
+        for __ in range(2):
+            self.assertDictEqual(get_provider_data('ASU'), {"display_name": "Arizona State University"})
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+        # Providers are cached per site.
+        self.request.site = SiteConfigurationFactory(partner__name='Other').site
+        self.assertDictEqual(get_provider_data('ASU'), {"display_name": "Arizona State University"})
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 2)
+
     @httpretty.activate
     def test_get_provider_data_unavailable_request(self):
         """
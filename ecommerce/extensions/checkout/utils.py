@@ -1,7 +1,10 @@
+import hashlib
 import logging
 import requests
 
 from django.conf import settings
+from django.core.cache import cache
+from threadlocals.threadlocals import get_current_request
 
 from ecommerce.core.url_utils import get_lms_url
 
@@ -12,11 +15,22 @@ logger = logging.getLogger(__name__)
 def get_provider_data(provider_id):
     """Get the provider information for provider id provider.
 
+    The information is cached, for the current site, for CREDIT_PROVIDER_CACHE_TIMEOUT seconds.
+
     Args:
         provider_id(str): Identifier for the provider
 
     Returns: dict
     """
+    # Providers are retrieved from the LMS of the current site, so they are cached per site.
+    site_configuration = get_current_request().site.siteconfiguration
+    cache_key = 'credit_provider_{}_{}'.format(
+        site_configuration.id, hashlib.md5(provider_id.encode('utf-8')).hexdigest()
+    )
+    provider_data = cache.get(cache_key)
+    if provider_data is not None:
+        return provider_data
+
     provider_info_url = get_lms_url('api/credit/v1/providers/{}'.format(provider_id))
     timeout = settings.PROVIDER_DATA_PROCESSING_TIMEOUT
     headers = {
@@ -26,7 +40,9 @@ def get_provider_data(provider_id):
     try:
         response = requests.get(provider_info_url, headers=headers, timeout=timeout)
         if response.status_code == 200:
-            return response.json()
+            provider_data = response.json()
+            cache.set(cache_key, provider_data, settings.CREDIT_PROVIDER_CACHE_TIMEOUT)
+            return provider_data
         else:
             logger.error(
                 'Failed retrieve provider information for %s provider. Provider API returned status code %d. Error: %s',
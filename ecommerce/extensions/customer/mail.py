@@ -0,0 +1,255 @@
+""" Background sending of email messages.
+
+Sending a message with EmailMessage.send() opens, and closes, a connection to the email backend (e.g. an SMTP
+handshake) for every message, while the caller waits. When EMAIL_DISPATCH_MODE is 'background', the customer
+Dispatcher instead queues messages to a BackgroundMailSender, whose thread sends them in batches over a single
+connection, and records the Email audit rows of each batch with a single query.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from Queue import Empty, Full, Queue
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import close_old_connections, transaction
+from oscar.core.loading import get_model
+
+from ecommerce.core.exceptions import ExecutorUnavailableError
+from ecommerce.core.metrics import get_metrics_sink
+
+logger = logging.getLogger(__name__)
+Email = get_model('customer', 'Email')
+
+DIRECT_DISPATCH_MODE = 'direct'
+BACKGROUND_DISPATCH_MODE = 'background'
+
+# Sentinel placed on the queue to stop the worker thread.
+_STOP = object()
+
+_sender = None
+_sender_lock = threading.Lock()
+
+
+def get_background_mail_sender():
+    """ Returns the process-wide sender used to send email messages in the background. """
+    global _sender  # pylint: disable=global-statement
+
+    if _sender is None:
+        with _sender_lock:
+            if _sender is None:
+                _sender = BackgroundMailSender(
+                    'mail',
+                    settings.BACKGROUND_EMAIL_QUEUE_SIZE,
+                    settings.BACKGROUND_EMAIL_BATCH_SIZE,
+                    drain_timeout=settings.BACKGROUND_EMAIL_DRAIN_TIMEOUT
+                )
+
+    return _sender
+
+
+class BackgroundMailSender(object):
+    """ Sends queued email messages on a daemon thread, in batches, over a single email backend connection.
+
+    The connection is opened when a batch is sent, and kept open while more messages are queued. As with
+    BoundedThreadPool, the thread is started lazily, in the process queueing messages, and, on interpreter exit,
+    queued messages are sent for up to drain_timeout seconds.
+
+    The following metrics are reported to the metrics sink:
+
+        mail.<name>.queue_depth (gauge): Number of messages waiting to be sent.
+        mail.<name>.batch_size (timing): Number of messages sent in each batch.
+        mail.<name>.rejected (counter): Messages rejected because the queue was full.
+        mail.<name>.failed (counter): Messages that could not be sent.
+    """
+
+    def __init__(self, name, max_queue_size, batch_size, drain_timeout=None):
+        self.name = name
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.drain_timeout = drain_timeout
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._worker = None
+        self._connection = None
+        self._is_shutdown = False
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._lock:
+            if self._pid == pid:
+                return
+
+            # Threads and connections do not survive a fork. Any inherited from a parent process are discarded.
+            self._queue = Queue(maxsize=self.max_queue_size)
+            self._connection = None
+            self._is_shutdown = False
+            self._worker = threading.Thread(target=self._work, args=(self._queue,), name=self.name)
+            self._worker.daemon = True
+            self._worker.start()
+            self._pid = pid
+
+        atexit.register(self.shutdown, self.drain_timeout)
+
+    def _metric(self, metric):
+        return 'mail.{name}.{metric}'.format(name=self.name, metric=metric)
+
+    def submit(self, message, user=None, html=None):
+        """ Queues the message to be sent.
+
+        Arguments:
+            message (EmailMessage): Message to send.
+            user (User): If provided, an Email audit row, holding the message, is created for this user once the
+                message has been sent.
+            html (str): HTML body of the message, recorded in the audit row.
+
+        Raises:
+            ExecutorUnavailableError: If the queue is full, or the sender has been shut down.
+        """
+        self._ensure_started()
+        sink = get_metrics_sink()
+
+        if self._is_shutdown:
+            raise ExecutorUnavailableError('Mail sender [{}] has been shut down.'.format(self.name))
+
+        try:
+            self._queue.put_nowait((message, user.id if user else None, html or ''))
+        except Full:
+            sink.increment(self._metric('rejected'))
+            raise ExecutorUnavailableError('Mail sender [{}] queue is full.'.format(self.name))
+
+        sink.gauge(self._metric('queue_depth'), self._queue.qsize())
+
+    def _work(self, queue):
+        while True:
+            batch = [queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except Empty:
+                    break
+
+            stop = _STOP in batch
+            items = [item for item in batch if item is not _STOP]
+
+            try:
+                if items:
+                    # Audit rows are written outside of the request/response cycle, so we must manage database
+                    # connections ourselves, as Django does at the start and end of each request.
+                    close_old_connections()
+                    try:
+                        self.send_batch(items)
+                    finally:
+                        close_old_connections()
+
+                if stop or queue.empty():
+                    self._close_connection()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('An unexpected error occurred while sending a batch of [%d] messages on [%s].',
+                                 len(items), self.name)
+            finally:
+                for __ in batch:
+                    queue.task_done()
+
+            if stop:
+                return
+
+    def send_batch(self, items):
+        """ Sends the given messages over the sender's connection, and records the audit rows of those sent.
+
+        Arguments:
+            items (list): Tuples holding each message, the ID of the user for whom an audit row should be
+                created, if any, and the HTML body of the message.
+        """
+        sink = get_metrics_sink()
+        sink.timing(self._metric('batch_size'), len(items))
+        audit_rows = []
+
+        for message, user_id, html in items:
+            # Messages are sent one at a time, so that a message that fails to send does not prevent the
+            # remaining messages from being sent.
+            try:
+                self._send(message)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to send email to %s.', ', '.join(message.recipients()))
+                sink.increment(self._metric('failed'))
+                self._close_connection()
+                continue
+
+            if user_id:
+                audit_rows.append(Email(user_id=user_id, subject=message.subject, body_text=message.body,
+                                        body_html=html))
+
+        if audit_rows:
+            self._create_audit_rows(audit_rows)
+
+    def _create_audit_rows(self, audit_rows):
+        try:
+            with transaction.atomic():
+                Email.objects.bulk_create(audit_rows)
+        except Exception:  # pylint: disable=broad-except
+            # A single invalid row fails the whole insert, so the rows are inserted one at a time, so that only
+            # the audit rows of the invalid rows are lost.
+            logger.exception('Failed to create [%d] email audit rows on [%s]. Retrying one at a time.',
+                             len(audit_rows), self.name)
+            for audit_row in audit_rows:
+                try:
+                    with transaction.atomic():
+                        audit_row.save()
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception('Failed to create the audit row of email [%s] to user [%d].',
+                                     audit_row.subject, audit_row.user_id)
+
+    def _send(self, message):
+        if self._connection is None:
+            self._connection = get_connection()
+            self._connection.open()
+
+        logger.info('Sending email to %s', ', '.join(message.recipients()))
+        self._connection.send_messages([message])
+
+    def _close_connection(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to close the email backend connection of [%s].', self.name)
+
+    def shutdown(self, timeout=None):
+        """ Stops accepting messages, and waits for queued messages to be sent.
+
+        Arguments:
+            timeout (float): Maximum number of seconds to wait. If None, wait until all messages are sent.
+
+        Returns:
+            bool: True if all messages were sent; otherwise, False.
+        """
+        with self._lock:
+            if self._pid != os.getpid() or self._is_shutdown:
+                return True
+
+            self._is_shutdown = True
+            worker = self._worker
+
+        deadline = None if timeout is None else time.time() + timeout
+
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except Full:
+            pass
+
+        worker.join(None if deadline is None else max(deadline - time.time(), 0))
+
+        if worker.is_alive():
+            logger.warning('Mail sender [%s] shut down before sending all messages.', self.name)
+            return False
+
+        logger.info('Mail sender [%s] shut down after sending all messages.', self.name)
+        return True
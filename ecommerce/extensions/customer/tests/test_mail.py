@@ -0,0 +1,85 @@
+from django.core import mail
+from django.core.mail import EmailMessage
+import mock
+from oscar.core.loading import get_model
+from testfixtures import LogCapture
+
+from ecommerce.core.exceptions import ExecutorUnavailableError
+from ecommerce.extensions.customer.mail import BackgroundMailSender
+from ecommerce.tests.testcases import TestCase
+
+Email = get_model('customer', 'Email')
+LOGGER_NAME = 'ecommerce.extensions.customer.mail'
+
+
+class BackgroundMailSenderTests(TestCase):
+    def setUp(self):
+        super(BackgroundMailSenderTests, self).setUp()
+        self.sender = BackgroundMailSender('test-mail', max_queue_size=10, batch_size=5)
+        self.user = self.create_user()
+
+    def create_message(self, recipient='learner@example.com'):
+        return EmailMessage('Subject', 'Body', from_email='from@example.com', to=[recipient])
+
+    def test_submit(self):
+        """ Verify queued messages are sent on the sender's thread. """
+        recipients = ['learner{}@example.com'.format(index) for index in range(3)]
+        for recipient in recipients:
+            self.sender.submit(self.create_message(recipient))
+
+        self.assertTrue(self.sender.shutdown(5))
+        self.assertEqual([message.to[0] for message in mail.outbox], recipients)
+
+    def test_submit_after_shutdown(self):
+        """ Verify messages are rejected once the sender has been shut down. """
+        self.sender.submit(self.create_message())
+        self.sender.shutdown(5)
+
+        with self.assertRaises(ExecutorUnavailableError):
+            self.sender.submit(self.create_message())
+
+    def test_send_batch(self):
+        """ Verify a batch is sent over a single connection, and the audit rows of the messages are created. """
+        messages = [self.create_message(), self.create_message()]
+
+        with mock.patch('ecommerce.extensions.customer.mail.get_connection',
+                        side_effect=mail.get_connection) as mock_get_connection:
+            self.sender.send_batch([(messages[0], self.user.id, '<p>Body</p>'), (messages[1], None, None)])
+
+        self.assertEqual(mock_get_connection.call_count, 1)
+        self.assertEqual(len(mail.outbox), 2)
+
+        email = Email.objects.get()
+        self.assertEqual(email.user, self.user)
+        self.assertEqual(email.subject, 'Subject')
+        self.assertEqual(email.body_html, '<p>Body</p>')
+
+    def test_send_batch_failure(self):
+        """ Verify a message that fails to send is not audited, and does not prevent others from being sent. """
+        failing_message = self.create_message('fail@example.com')
+        message = self.create_message()
+
+        original_send = self.sender._send  # pylint: disable=protected-access
+
+        def send(msg):
+            if msg is failing_message:
+                raise Exception('SMTP error')
+            original_send(msg)
+
+        with mock.patch.object(self.sender, '_send', side_effect=send):
+            self.sender.send_batch(
+                [(failing_message, self.user.id, '<p>Body</p>'), (message, self.user.id, '<p>Body</p>')]
+            )
+
+        self.assertEqual([msg.to for msg in mail.outbox], [message.to])
+        self.assertEqual(Email.objects.count(), 1)
+
+    def test_send_batch_audit_failure(self):
+        """ Verify an audit row that cannot be created does not prevent those of other messages from being created. """
+        messages = [self.create_message(), self.create_message()]
+
+        with LogCapture(LOGGER_NAME):
+            self.sender.send_batch([(messages[0], self.user.id, None), (messages[1], self.user.id, '<p>Body</p>')])
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(Email.objects.get().body_html, '<p>Body</p>')
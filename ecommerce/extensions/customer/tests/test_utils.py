@@ -1,14 +1,17 @@
 from django.conf import settings
 from django.core import mail
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
+import mock
 from oscar.core.loading import get_model
 from oscar.test import factories
 
+from ecommerce.core.exceptions import ExecutorUnavailableError
 from ecommerce.extensions.customer.utils import Dispatcher
 from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.testcases import TestCase
 
 CommunicationEventType = get_model('customer', 'CommunicationEventType')
+Email = get_model('customer', 'Email')
 
 
 class CustomerUtilsTests(TestCase):
@@ -116,3 +119,40 @@ class CustomerUtilsTests(TestCase):
         }
         self.dispatcher.send_email_messages(recipient, messages)
         self.assertEqual(mail.outbox[0].from_email, settings.OSCAR_FROM_EMAIL)
+
+    @override_settings(EMAIL_DISPATCH_MODE='background')
+    def test_send_user_email_messages_background(self):
+        """
+        Ensure emails are queued to the background sender, along with the user for whom they are audited
+        """
+        messages = {
+            'subject': 'The message subject.',
+            'body': 'The message body.',
+            'html': '<p>The message html body.</p>',
+        }
+        with mock.patch('ecommerce.extensions.customer.utils.get_background_mail_sender') as mock_get_sender:
+            self.dispatcher.send_user_email_messages(self.user, messages, self.request.site)
+
+        email = mock_get_sender.return_value.submit.call_args[0][0]
+        mock_get_sender.return_value.submit.assert_called_once_with(email, user=self.user, html=messages['html'])
+        self.assertEqual(email.to, [self.user.email])
+        self.assertEqual(email.from_email, self.site_configuration.from_email)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(Email.objects.exists())
+
+    @override_settings(EMAIL_DISPATCH_MODE='background')
+    def test_send_user_email_messages_background_unavailable(self):
+        """
+        Ensure emails are sent directly if the background sender can not accept them
+        """
+        messages = {
+            'subject': 'The message subject.',
+            'body': 'The message body.',
+            'html': '<p>The message html body.</p>',
+        }
+        with mock.patch('ecommerce.extensions.customer.utils.get_background_mail_sender') as mock_get_sender:
+            mock_get_sender.return_value.submit.side_effect = ExecutorUnavailableError
+            self.dispatcher.send_user_email_messages(self.user, messages, self.request.site)
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(Email.objects.get().user, self.user)
@@ -3,6 +3,9 @@ from django.core.mail import EmailMessage, EmailMultiAlternatives
 
 from oscar.apps.customer.utils import *  # pylint: disable=wildcard-import, unused-wildcard-import
 
+from ecommerce.core.exceptions import ExecutorUnavailableError
+from ecommerce.extensions.customer.mail import BACKGROUND_DISPATCH_MODE, get_background_mail_sender
+
 
 # pylint: disable=abstract-method, function-redefined
 class Dispatcher(Dispatcher):
@@ -12,7 +15,8 @@ class Dispatcher(Dispatcher):
         Dispatch one-off messages to explicitly specified recipient(s).
         """
         if messages['subject'] and messages['body']:
-            self.send_email_messages(recipient, messages, site)
+            if not self.queue_email_messages(recipient, messages, site):
+                self.send_email_messages(recipient, messages, site)
 
     def dispatch_order_messages(self, order, messages, event_type=None, site=None, **kwargs):  # pylint: disable=arguments-differ
         """
@@ -45,20 +49,55 @@ class Dispatcher(Dispatcher):
             self.logger.warning(msg)
             return
 
+        # Is user is signed in, record the event for audit
+        audit_user = user if user.is_authenticated() else None
+
+        if self.queue_email_messages(user.email, messages, site, audit_user=audit_user):
+            return
+
         email = self.send_email_messages(user.email, messages, site)
 
-        # Is user is signed in, record the event for audit
-        if email and user.is_authenticated():
+        if email and audit_user:
             # pylint: disable=protected-access
             Email._default_manager.create(user=user,
                                           subject=email.subject,
                                           body_text=email.body,
                                           body_html=messages['html'])
 
+    def queue_email_messages(self, recipient, messages, site=None, audit_user=None):
+        """
+        Queue email to the specified recipient, to be sent in the background, if
+        EMAIL_DISPATCH_MODE is 'background'. If audit_user is provided, the email
+        is recorded for audit once it has been sent.
+
+        Returns True if the email was queued.
+        """
+        if settings.EMAIL_DISPATCH_MODE != BACKGROUND_DISPATCH_MODE:
+            return False
+
+        email = self.create_email_message(recipient, messages, site)
+        try:
+            get_background_mail_sender().submit(email, user=audit_user, html=messages['html'])
+        except ExecutorUnavailableError:
+            self.logger.warning("Unable to queue email to %s. Sending it directly." % recipient)
+            return False
+
+        return True
+
     def send_email_messages(self, recipient, messages, site=None):  # pylint:disable=arguments-differ
         """
         Plain email sending to the specified recipient
         """
+        email = self.create_email_message(recipient, messages, site)
+        self.logger.info("Sending email to %s" % recipient)
+        email.send()
+
+        return email
+
+    def create_email_message(self, recipient, messages, site=None):
+        """
+        Build the email to the specified recipient
+        """
         from_email = settings.OSCAR_FROM_EMAIL
         if site:
             from_email = site.siteconfiguration.get_from_email()
@@ -75,7 +114,5 @@ class Dispatcher(Dispatcher):
                                  messages['body'],
                                  from_email=from_email,
                                  to=[recipient])
-        self.logger.info("Sending email to %s" % recipient)
-        email.send()
 
         return email
@@ -1,7 +1,9 @@
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from ecommerce.extensions.refund.status import REFUND
-from ecommerce.extensions.refund.tests.factories import RefundFactory
+from ecommerce.extensions.refund.tests.factories import RefundFactory, RefundLineFactory
 from ecommerce.tests.testcases import TestCase
 
 
@@ -103,6 +105,49 @@ class RefundListViewTests(RefundViewTestMixin, TestCase):
         response = self.client.get('{path}?sort=id&dir=desc'.format(path=self.path))
         self.assert_successful_response(response, list(reversed(refunds)))
 
+    def test_pagination(self):
+        """ The view should paginate refunds by ID, in the requested order. """
+        refunds = [RefundFactory() for __ in range(30)]
+        self.client.login(username=self.user.username, password=self.password)
+
+        for direction, ordered_refunds in (('asc', refunds), ('desc', list(reversed(refunds)))):
+            response = self.client.get('{path}?sort=id&dir={dir}'.format(path=self.path, dir=direction))
+            self.assert_successful_response(response, ordered_refunds[:25])
+            self.assertIsNone(response.context['previous_page_url'])
+
+            response = self.client.get(response.context['next_page_url'])
+            self.assert_successful_response(response, ordered_refunds[25:])
+            self.assertIsNone(response.context['next_page_url'])
+
+            response = self.client.get(response.context['previous_page_url'])
+            self.assert_successful_response(response, ordered_refunds[:25])
+            self.assertIsNone(response.context['previous_page_url'])
+
+    def test_invalid_page_cursor(self):
+        """ The view should return HTTP 404 if the page cursor is not an ID. """
+        self.client.login(username=self.user.username, password=self.password)
+        response = self.client.get('{path}?after=abc'.format(path=self.path))
+        self.assertEqual(response.status_code, 404)
+
+    def test_num_queries(self):
+        """ The number of queries made should not depend on the number of refunds, or of their lines. """
+        self.client.login(username=self.user.username, password=self.password)
+        refund = RefundFactory()
+        self.client.get(self.path)
+
+        with CaptureQueriesContext(connection) as single_refund_queries:
+            response = self.client.get(self.path)
+        self.assertContains(response, '<td>{}</td>'.format(refund.num_items))
+
+        for __ in range(24):
+            RefundLineFactory(refund=RefundFactory(), quantity=2)
+
+        with CaptureQueriesContext(connection) as many_refunds_queries:
+            response = self.client.get(self.path)
+        self.assertEqual(len(response.context['refunds']), 25)
+
+        self.assertEqual(len(many_refunds_queries), len(single_refund_queries))
+
 
 class RefundDetailViewTests(RefundViewTestMixin, TestCase):
     def setUp(self):
@@ -1,15 +1,19 @@
+from django.db.models import Sum
 from django.views.generic import ListView, DetailView
 from oscar.core.loading import get_class, get_model
 from oscar.views import sort_queryset
 
-from ecommerce.extensions.dashboard.views import FilterFieldsMixin
+from ecommerce.extensions.dashboard.views import FilterFieldsMixin, KeysetPaginationMixin
 
 Refund = get_model('refund', 'Refund')
 RefundSearchForm = get_class('dashboard.refunds.forms', 'RefundSearchForm')
 
 
-class RefundListView(FilterFieldsMixin, ListView):
-    """ Dashboard view to list refunds. """
+class RefundListView(KeysetPaginationMixin, FilterFieldsMixin, ListView):
+    """ Dashboard view to list refunds.
+
+    Each page is read with a single query, regardless of the number of lines of each refund.
+    """
     model = Refund
     context_object_name = 'refunds'
     template_name = 'dashboard/refunds/refund_list.html'
@@ -29,7 +33,7 @@ class RefundListView(FilterFieldsMixin, ListView):
 
     def get_queryset(self):
         queryset = super(RefundListView, self).get_queryset()
-        queryset = queryset.prefetch_related('lines')
+        queryset = queryset.select_related('order', 'user').annotate(annotated_num_items=Sum('lines__quantity'))
         queryset = sort_queryset(queryset, self.request, ['id'], 'id')
 
         self.form = self.form_class(self.request.GET)
@@ -1,3 +1,4 @@
+from django.http import Http404
 from oscar.apps.dashboard.views import *  # pylint: disable=wildcard-import, unused-wildcard-import
 
 
@@ -39,3 +40,71 @@ class FilterFieldsMixin(object):
         context['exposed_field_ids'] = ['id_{}'.format(field) for field in self.exposed_fields().keys()]
 
         return context
+
+
+class KeysetPaginationMixin(object):
+    """ Paginates a ListView by ranges of IDs ("keyset" pagination), rather than by offset.
+
+    Offset pagination requires the database to count all matching rows, and to skip all rows of the preceding
+    pages. Keyset pagination only reads the rows of the requested page, regardless of how deep the page is.
+
+    Pages are requested with the ``after`` and ``before`` query parameters, holding the ID of the last row of the
+    preceding page, and of the first row of the following page, respectively. The queryset must be ordered by
+    ``id`` or ``-id``. The URLs of the adjacent pages are exposed to templates as ``previous_page_url`` and
+    ``next_page_url``.
+    """
+    previous_page_url = None
+    next_page_url = None
+
+    def _get_cursor(self, param):
+        value = self.request.GET.get(param)
+        if value is None:
+            return None
+
+        try:
+            return int(value)
+        except ValueError:
+            raise Http404('Invalid page cursor [{}].'.format(value))
+
+    def _get_page_url(self, param, cursor):
+        params = self.request.GET.copy()
+        params.pop('after', None)
+        params.pop('before', None)
+        params[param] = cursor
+        return '{path}?{params}'.format(path=self.request.path, params=params.urlencode())
+
+    def paginate_queryset(self, queryset, page_size):
+        descending = list(queryset.query.order_by) == ['-id']
+        after = self._get_cursor('after')
+        before = self._get_cursor('before')
+
+        # One row more than the page size is read to determine whether another page follows.
+        if before is not None:
+            lookup = 'id__gt' if descending else 'id__lt'
+            object_list = list(queryset.filter(**{lookup: before}).reverse()[:page_size + 1])
+            has_previous = len(object_list) > page_size
+            object_list = list(reversed(object_list[:page_size]))
+            has_next = True
+        else:
+            if after is not None:
+                lookup = 'id__lt' if descending else 'id__gt'
+                queryset = queryset.filter(**{lookup: after})
+
+            object_list = list(queryset[:page_size + 1])
+            has_next = len(object_list) > page_size
+            object_list = object_list[:page_size]
+            has_previous = after is not None
+
+        if object_list:
+            if has_previous:
+                self.previous_page_url = self._get_page_url('before', object_list[0].id)
+            if has_next:
+                self.next_page_url = self._get_page_url('after', object_list[-1].id)
+
+        return None, None, object_list, has_previous or has_next
+
+    def get_context_data(self, **kwargs):
+        context = super(KeysetPaginationMixin, self).get_context_data(**kwargs)
+        context['previous_page_url'] = self.previous_page_url
+        context['next_page_url'] = self.next_page_url
+        return context
@@ -6,12 +6,14 @@ can successfully fulfill the product. Success can be reported back based on each
 
 """
 import logging
+from collections import OrderedDict
 
 from django.conf import settings
 from django.utils import importlib
 from django.utils.timezone import now
 
 from ecommerce.extensions.fulfillment import exceptions
+from ecommerce.extensions.fulfillment.instrumentation import FulfillmentTimer, time_module
 from ecommerce.extensions.fulfillment.status import ORDER, LINE
 from ecommerce.extensions.refund.status import REFUND_LINE
 
@@ -45,26 +47,31 @@ def fulfill_order(order, lines):
 
     # Construct a dict of lines by their product type.
     line_items = list(lines.all())
+    order_timer = FulfillmentTimer('fulfillment.order')
 
     try:
-        # Iterate over the Fulfillment Modules defined in our configuration and determine if they support
-        # any of the lines in the order. Fulfill line items in the order they are designated by the configuration.
-        # Remaining line items should be marked with a fulfillment error since we have no configuration that
-        # allows them to be fulfilled.
-        for module_class in get_fulfillment_modules():
-            module = module_class()
-            supported_lines = module.get_supported_lines(line_items)
-            if supported_lines:
-                line_items = list(set(line_items) - set(supported_lines))
-                module.fulfill_product(order, supported_lines)
-
-        # Check to see if any line items in the order have not been accounted for by a FulfillmentModule
-        # Any product does not line up with a module, we have to mark a fulfillment error.
-        for line in line_items:
-            product_type = line.product.get_product_class().name
-            logger.error("Product Type [%s] does not have an associated Fulfillment Module. It cannot be fulfilled.",
-                         product_type)
-            line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
+        with order_timer:
+            # Iterate over the Fulfillment Modules defined in our configuration and determine if they support
+            # any of the lines in the order. Fulfill line items in the order they are designated by the
+            # configuration. Remaining line items should be marked with a fulfillment error since we have no
+            # configuration that allows them to be fulfilled.
+            for module_class in get_fulfillment_modules():
+                module = module_class()
+                supported_lines = module.get_supported_lines(line_items)
+                if supported_lines:
+                    line_items = list(set(line_items) - set(supported_lines))
+                    with time_module(module):
+                        module.fulfill_product(order, supported_lines)
+
+            # Check to see if any line items in the order have not been accounted for by a FulfillmentModule
+            # Any product does not line up with a module, we have to mark a fulfillment error.
+            for line in line_items:
+                product_type = line.product.get_product_class().name
+                logger.error(
+                    "Product Type [%s] does not have an associated Fulfillment Module. It cannot be fulfilled.",
+                    product_type
+                )
+                line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
     except Exception:   # pylint: disable=broad-except
         logger.exception('An unexpected error occurred while fulfilling order [%s].', order.number)
     finally:
@@ -80,10 +87,14 @@ def fulfill_order(order, lines):
 
         elapsed = now() - order.date_placed
         logger.info(
-            "Finished fulfilling order [%s] with status [%s]. [%s] seconds elapsed since placement.",
+            "Finished fulfilling order [%s] with status [%s]. [%s] seconds elapsed since placement. "
+            "Fulfillment took [%d] ms, of which [%d] ms were spent on remote calls, and executed [%d] queries.",
             order.number,
             order.status,
-            elapsed.total_seconds()
+            elapsed.total_seconds(),
+            order_timer.wall_time,
+            order_timer.remote_time,
+            order_timer.query_count
         )
 
         return order  # pylint: disable=lost-exception
@@ -119,29 +130,44 @@ def revoke_fulfillment_for_refund(refund):
     """
     Revokes fulfillment for all lines in a refund.
 
+    Each fulfillment module revokes all of the lines it supports in one batch. The statuses of the refund lines
+    are then updated together.
+
     Returns
         Boolean: True, if revocation of all lines succeeded; otherwise, False.
     """
     succeeded = True
+    refund_lines = list(refund.lines.select_related('order_line__order__user', 'order_line__product'))
+    new_statuses = {}
 
     # Refunds corresponding to a total credit of $0 require no revocation. This also
     # prevents deadlocking with the LMS which occurs when Otto attempts to revoke an
     # automatically-approved refund.
     if refund.total_credit_excl_tax == 0:
-        for refund_line in refund.lines.all():
-            refund_line.set_status(REFUND_LINE.COMPLETE)
+        for refund_line in refund_lines:
+            new_statuses[refund_line] = REFUND_LINE.COMPLETE
     else:
-        # TODO (CCB): As our list of product types and fulfillment modules grows, this may become slow,
-        # and should be updated. Runtime is O(n^2).
-        for refund_line in refund.lines.all():
-            order_line = refund_line.order_line
-            modules = get_fulfillment_modules_for_line(order_line)
+        modules = [module_class() for module_class in get_fulfillment_modules()]
+        refund_lines_by_module = OrderedDict((module, []) for module in modules)
 
+        for refund_line in refund_lines:
             for module in modules:
-                if module().revoke_line(order_line):
-                    refund_line.set_status(REFUND_LINE.COMPLETE)
+                if module.supports_line(refund_line.order_line):
+                    refund_lines_by_module[module].append(refund_line)
+
+        for module, module_refund_lines in refund_lines_by_module.items():
+            if not module_refund_lines:
+                continue
+
+            results = module.revoke_lines([refund_line.order_line for refund_line in module_refund_lines])
+            for refund_line, revoked in zip(module_refund_lines, results):
+                if revoked:
+                    new_statuses[refund_line] = REFUND_LINE.COMPLETE
                 else:
                     succeeded = False
-                    refund_line.set_status(REFUND_LINE.REVOCATION_ERROR)
+                    new_statuses[refund_line] = REFUND_LINE.REVOCATION_ERROR
+
+    if new_statuses:
+        refund.lines.model.bulk_set_status(new_statuses)
 
     return succeeded
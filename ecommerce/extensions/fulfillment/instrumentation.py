@@ -0,0 +1,135 @@
+""" Latency instrumentation for order fulfillment.
+
+Fulfillment work is measured in nested blocks (order, module, line). For each block we record the wall time, the
+time spent waiting on remote services (e.g. the LMS Enrollment API), and the number of database queries executed.
+Measurements are sent to the metrics sink configured by the METRICS_SINK setting, under the following names:
+
+    fulfillment.order.{wall_time,remote_time,queries}
+    fulfillment.module.<module class name>.{wall_time,remote_time,queries}
+    fulfillment.line.<module class name>.{wall_time,remote_time,queries}
+    fulfillment.remote_call.<service>
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.utils import CursorWrapper
+
+from ecommerce.core.metrics import get_metrics_sink
+
+_local = threading.local()
+
+
+def _active_timers():
+    """ Returns the stack of timers currently measuring work on this thread. """
+    if not hasattr(_local, 'timers'):
+        _local.timers = []
+    return _local.timers
+
+
+class QueryCountingCursorWrapper(CursorWrapper):
+    """ Cursor wrapper that counts the queries executed by the cursor against each timer active on this thread. """
+
+    def callproc(self, procname, params=None):
+        _count_query()
+        return super(QueryCountingCursorWrapper, self).callproc(procname, params)
+
+    def execute(self, sql, params=None):
+        _count_query()
+        return super(QueryCountingCursorWrapper, self).execute(sql, params)
+
+    def executemany(self, sql, param_list):
+        _count_query()
+        return super(QueryCountingCursorWrapper, self).executemany(sql, param_list)
+
+
+def _count_query():
+    for timer in _active_timers():
+        timer.query_count += 1
+
+
+def _start_counting_queries():
+    """ Wraps the cursors created by this thread's default database connection to count their queries. """
+    db = connections[DEFAULT_DB_ALIAS]
+    cursor = db.cursor
+
+    def counting_cursor():
+        return QueryCountingCursorWrapper(cursor(), db)
+
+    db.cursor = counting_cursor
+
+
+def _stop_counting_queries():
+    connections[DEFAULT_DB_ALIAS].__dict__.pop('cursor', None)
+
+
+class FulfillmentTimer(object):
+    """ Context manager that measures a block of fulfillment work and reports it to the metrics sink.
+
+    Database queries are counted by wrapping the cursors of the default database connection while timers are active,
+    rather than by logging queries, so that the SQL of each query is not kept in memory. Timers may be nested; remote
+    call time and queries are attributed to every timer active on the current thread.
+
+    Example:
+        >>> with FulfillmentTimer('fulfillment.module.EnrollmentFulfillmentModule') as timer:
+        ...     module.fulfill_product(order, lines)
+        >>> timer.wall_time, timer.remote_time, timer.query_count
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_time = 0.0
+        self.remote_time = 0.0
+        self.query_count = 0
+        self._start = None
+
+    def __enter__(self):
+        timers = _active_timers()
+        if not timers:
+            _start_counting_queries()
+
+        timers.append(self)
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.wall_time = (time.time() - self._start) * 1000
+        timers = _active_timers()
+        timers.remove(self)
+        if not timers:
+            _stop_counting_queries()
+
+        sink = get_metrics_sink()
+        sink.timing('{}.wall_time'.format(self.name), self.wall_time)
+        sink.timing('{}.remote_time'.format(self.name), self.remote_time)
+        sink.histogram('{}.queries'.format(self.name), self.query_count)
+
+
+@contextmanager
+def time_remote_call(service):
+    """ Measures a call to a remote service made while fulfilling an order.
+
+    Arguments:
+        service (str): Name of the remote service (e.g. lms_enrollment), used as the metric name suffix.
+    """
+    start = time.time()
+    try:
+        yield
+    finally:
+        elapsed = (time.time() - start) * 1000
+
+        for timer in _active_timers():
+            timer.remote_time += elapsed
+
+        get_metrics_sink().timing('fulfillment.remote_call.{}'.format(service), elapsed)
+
+
+def time_module(module):
+    """ Returns a timer measuring the fulfillment of all of an order's lines supported by the given module. """
+    return FulfillmentTimer('fulfillment.module.{}'.format(module.__class__.__name__))
+
+
+def time_line(module):
+    """ Returns a timer measuring the fulfillment of a single line by the given module. """
+    return FulfillmentTimer('fulfillment.line.{}'.format(module.__class__.__name__))
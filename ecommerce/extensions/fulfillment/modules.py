@@ -7,19 +7,25 @@ import abc
 import datetime
 import json
 import logging
+import sys
+import threading
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.utils import six
 from oscar.core.loading import get_model
 from rest_framework import status
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError, Timeout
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME
+from ecommerce.core.executor import map_concurrently
 from ecommerce.core.url_utils import get_ecommerce_url, get_lms_enrollment_api_url, get_lms_url
 from ecommerce.courses.models import Course
-from ecommerce.courses.utils import mode_for_seat
+from ecommerce.courses.utils import invalidate_enrollment_status, mode_for_seat
 from ecommerce.extensions.analytics.utils import audit_log, parse_tracking_context
+from ecommerce.extensions.fulfillment.instrumentation import time_line, time_remote_call
 from ecommerce.extensions.fulfillment.status import LINE
 from ecommerce.extensions.voucher.models import OrderLineVouchers
 from ecommerce.extensions.voucher.utils import create_vouchers
@@ -31,6 +37,30 @@ Range = get_model('offer', 'Range')
 Voucher = get_model('voucher', 'Voucher')
 logger = logging.getLogger(__name__)
 
+_enrollment_api_session = None
+_enrollment_api_session_lock = threading.Lock()
+
+
+def get_enrollment_api_session():
+    """ Returns the process-wide session used to make concurrent calls to the LMS Enrollment API.
+
+    The session's connection pool holds up to ENROLLMENT_REVOCATION_CONCURRENCY connections, so that concurrent
+    calls reuse connections rather than opening new ones.
+    """
+    global _enrollment_api_session  # pylint: disable=global-statement
+
+    if _enrollment_api_session is None:
+        with _enrollment_api_session_lock:
+            if _enrollment_api_session is None:
+                pool_size = settings.ENROLLMENT_REVOCATION_CONCURRENCY
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _enrollment_api_session = session
+
+    return _enrollment_api_session
+
 
 class BaseFulfillmentModule(object):  # pragma: no cover
     """
@@ -98,6 +128,20 @@ class BaseFulfillmentModule(object):  # pragma: no cover
         """
         raise NotImplementedError("Revoke method not implemented!")
 
+    def revoke_lines(self, lines):
+        """ Revokes the specified lines.
+
+        Modules that revoke lines by calling remote services should override this method to make the calls
+        concurrently. By default, lines are revoked one at a time.
+
+        Args:
+            lines (List of Lines): Order Lines to be revoked.
+
+        Returns:
+            List of booleans indicating, for each line, whether the product was revoked.
+        """
+        return [self.revoke_line(line) for line in lines]
+
 
 class EnrollmentFulfillmentModule(BaseFulfillmentModule):
     """ Fulfillment Module for enrolling students after a product purchase.
@@ -105,8 +149,8 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
     Allows the enrollment of a student via purchase of a 'seat'.
     """
 
-    def _post_to_enrollment_api(self, data, user):
-        enrollment_api_url = get_lms_enrollment_api_url()
+    def _post_to_enrollment_api(self, data, user, session=None, enrollment_api_url=None):
+        enrollment_api_url = enrollment_api_url or get_lms_enrollment_api_url()
         timeout = settings.ENROLLMENT_FULFILLMENT_TIMEOUT
         headers = {
             'Content-Type': 'application/json',
@@ -121,7 +165,95 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
         if ip:
             headers['X-Forwarded-For'] = ip
 
-        return requests.post(enrollment_api_url, data=json.dumps(data), headers=headers, timeout=timeout)
+        try:
+            with time_remote_call('lms_enrollment'):
+                return (session or requests).post(enrollment_api_url, data=json.dumps(data), headers=headers,
+                                                  timeout=timeout)
+        finally:
+            # The enrollment may have changed even if the call failed (e.g. timed out).
+            invalidate_enrollment_status(data['user'], data['course_details']['course_id'])
+
+    def _fulfill_line(self, order, line):
+        """ Enrolls the order's user in the course associated with the given Seat line, and updates the line status.
+
+        Args:
+            order (Order): The Order associated with the line to be fulfilled.
+            line (Line): Order Line, associated with a "Seat" product.
+        """
+        try:
+            mode = mode_for_seat(line.product)
+            course_key = line.product.attr.course_key
+        except AttributeError:
+            logger.error("Supported Seat Product does not have required attributes, [certificate_type, course_key]")
+            line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
+            return
+        try:
+            provider = line.product.attr.credit_provider
+        except AttributeError:
+            logger.debug("Seat [%d] has no credit_provider attribute. Defaulted to None.", line.product.id)
+            provider = None
+
+        data = {
+            'user': order.user.username,
+            'is_active': True,
+            'mode': mode,
+            'course_details': {
+                'course_id': course_key
+            },
+            'enrollment_attributes': [
+                {
+                    'namespace': 'order',
+                    'name': 'order_number',
+                    'value': order.number
+                }
+            ]
+        }
+        if provider:
+            data['enrollment_attributes'].append(
+                {
+                    'namespace': 'credit',
+                    'name': 'provider_id',
+                    'value': provider
+                }
+            )
+        try:
+            response = self._post_to_enrollment_api(data, user=order.user)
+
+            if response.status_code == status.HTTP_200_OK:
+                line.set_status(LINE.COMPLETE)
+
+                audit_log(
+                    'line_fulfilled',
+                    order_line_id=line.id,
+                    order_number=order.number,
+                    product_class=line.product.get_product_class().name,
+                    course_id=course_key,
+                    mode=mode,
+                    user_id=order.user.id,
+                    credit_provider=provider,
+                )
+            else:
+                try:
+                    data = response.json()
+                    reason = data.get('message')
+                except Exception:  # pylint: disable=broad-except
+                    reason = '(No detail provided.)'
+
+                logger.error(
+                    "Unable to fulfill line [%d] of order [%s] due to a server-side error: %s", line.id,
+                    order.number, reason
+                )
+                line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
+        except ConnectionError:
+            logger.error(
+                "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
+            )
+            line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
+        except Timeout:
+            logger.error(
+                "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
+            )
+            line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
 
     def supports_line(self, line):
         return line.product.get_product_class().name == 'Seat'
@@ -171,128 +303,111 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
             return order, lines
 
         for line in lines:
-            try:
-                mode = mode_for_seat(line.product)
-                course_key = line.product.attr.course_key
-            except AttributeError:
-                logger.error("Supported Seat Product does not have required attributes, [certificate_type, course_key]")
-                line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
-                continue
-            try:
-                provider = line.product.attr.credit_provider
-            except AttributeError:
-                logger.debug("Seat [%d] has no credit_provider attribute. Defaulted to None.", line.product.id)
-                provider = None
-
-            data = {
-                'user': order.user.username,
-                'is_active': True,
-                'mode': mode,
-                'course_details': {
-                    'course_id': course_key
-                },
-                'enrollment_attributes': [
-                    {
-                        'namespace': 'order',
-                        'name': 'order_number',
-                        'value': order.number
-                    }
-                ]
-            }
-            if provider:
-                data['enrollment_attributes'].append(
-                    {
-                        'namespace': 'credit',
-                        'name': 'provider_id',
-                        'value': provider
-                    }
-                )
-            try:
-                response = self._post_to_enrollment_api(data, user=order.user)
-
-                if response.status_code == status.HTTP_200_OK:
-                    line.set_status(LINE.COMPLETE)
-
-                    audit_log(
-                        'line_fulfilled',
-                        order_line_id=line.id,
-                        order_number=order.number,
-                        product_class=line.product.get_product_class().name,
-                        course_id=course_key,
-                        mode=mode,
-                        user_id=order.user.id,
-                        credit_provider=provider,
-                    )
-                else:
-                    try:
-                        data = response.json()
-                        reason = data.get('message')
-                    except Exception:  # pylint: disable=broad-except
-                        reason = '(No detail provided.)'
-
-                    logger.error(
-                        "Unable to fulfill line [%d] of order [%s] due to a server-side error: %s", line.id,
-                        order.number, reason
-                    )
-                    line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
-            except ConnectionError:
-                logger.error(
-                    "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
-                )
-                line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
-            except Timeout:
-                logger.error(
-                    "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
-                )
-                line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
+            with time_line(self):
+                self._fulfill_line(order, line)
+
         logger.info("Finished fulfilling 'Seat' product types for order [%s]", order.number)
         return order, lines
 
+    def _get_revocation_data(self, line):
+        """ Returns the Enrollment API request body that deactivates the enrollment purchased with the given line. """
+        return {
+            'user': line.order.user.username,
+            'is_active': False,
+            'mode': mode_for_seat(line.product),
+            'course_details': {
+                'course_id': line.product.attr.course_key,
+            },
+        }
+
+    def _handle_revocation_response(self, line, response):
+        """ Returns True if the given Enrollment API response indicates the line has been revoked. """
+        if response.status_code == status.HTTP_200_OK:
+            audit_log(
+                'line_revoked',
+                order_line_id=line.id,
+                order_number=line.order.number,
+                product_class=line.product.get_product_class().name,
+                course_id=line.product.attr.course_key,
+                certificate_type=getattr(line.product.attr, 'certificate_type', ''),
+                user_id=line.order.user.id
+            )
+
+            return True
+        else:
+            # check if the error / message are something we can recover from.
+            data = response.json()
+            detail = data.get('message', '(No details provided.)')
+            if response.status_code == 400 and "Enrollment mode mismatch" in detail:
+                # The user is currently enrolled in different mode than the one
+                # we are refunding an order for.  Don't revoke that enrollment.
+                logger.info('Skipping revocation for line [%d]: %s', line.id, detail)
+                return True
+            else:
+                logger.error('Failed to revoke fulfillment of Line [%d]: %s', line.id, detail)
+
+        return False
+
     def revoke_line(self, line):
         try:
             logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
 
-            mode = mode_for_seat(line.product)
-            course_key = line.product.attr.course_key
-            data = {
-                'user': line.order.user.username,
-                'is_active': False,
-                'mode': mode,
-                'course_details': {
-                    'course_id': course_key,
-                },
-            }
-
+            data = self._get_revocation_data(line)
             response = self._post_to_enrollment_api(data, user=line.order.user)
-
-            if response.status_code == status.HTTP_200_OK:
-                audit_log(
-                    'line_revoked',
-                    order_line_id=line.id,
-                    order_number=line.order.number,
-                    product_class=line.product.get_product_class().name,
-                    course_id=course_key,
-                    certificate_type=getattr(line.product.attr, 'certificate_type', ''),
-                    user_id=line.order.user.id
-                )
-
-                return True
-            else:
-                # check if the error / message are something we can recover from.
-                data = response.json()
-                detail = data.get('message', '(No details provided.)')
-                if response.status_code == 400 and "Enrollment mode mismatch" in detail:
-                    # The user is currently enrolled in different mode than the one
-                    # we are refunding an order for.  Don't revoke that enrollment.
-                    logger.info('Skipping revocation for line [%d]: %s', line.id, detail)
-                    return True
-                else:
-                    logger.error('Failed to revoke fulfillment of Line [%d]: %s', line.id, detail)
+            return self._handle_revocation_response(line, response)
         except Exception:  # pylint: disable=broad-except
             logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
 
         return False
 
+    def revoke_lines(self, lines):
+        """ Revokes the specified lines, calling the Enrollment API concurrently over pooled connections.
+
+        Request bodies are built, and responses handled, on the calling thread; only the API calls are made
+        concurrently, on up to ENROLLMENT_REVOCATION_CONCURRENCY threads. The worker threads have no current
+        request, so the Enrollment API URL is determined, from the current site, on the calling thread.
+        """
+        results = [False] * len(lines)
+        requests_to_send = []
+
+        try:
+            enrollment_api_url = get_lms_enrollment_api_url()
+        except Exception:  # pylint: disable=broad-except
+            for line in lines:
+                logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
+            return results
+
+        for index, line in enumerate(lines):
+            try:
+                logger.info('Attempting to revoke fulfillment of Line [%d]...', line.id)
+                requests_to_send.append((index, line, self._get_revocation_data(line), line.order.user))
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
+
+        session = get_enrollment_api_session()
+
+        def send(request):
+            __, __, data, user = request
+            try:
+                response = self._post_to_enrollment_api(
+                    data, user=user, session=session, enrollment_api_url=enrollment_api_url
+                )
+                return response, None
+            except Exception:  # pylint: disable=broad-except
+                return None, sys.exc_info()
+
+        responses = map_concurrently(send, requests_to_send, settings.ENROLLMENT_REVOCATION_CONCURRENCY)
+
+        for (index, line, __, __), (response, exc_info) in zip(requests_to_send, responses):
+            try:
+                if exc_info:
+                    six.reraise(*exc_info)
+                results[index] = self._handle_revocation_response(line, response)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Failed to revoke fulfillment of Line [%d].', line.id)
+
+        return results
+
 
 class CouponFulfillmentModule(BaseFulfillmentModule):
     """ Fulfillment Module for coupons. """
@@ -334,7 +449,8 @@ class CouponFulfillmentModule(BaseFulfillmentModule):
         logger.info("Attempting to fulfill 'Coupon' product types for order [%s]", order.number)
 
         for line in lines:
-            line.set_status(LINE.COMPLETE)
+            with time_line(self):
+                line.set_status(LINE.COMPLETE)
 
         logger.info("Finished fulfilling 'Coupon' product types for order [%s]", order.number)
         return order, lines
@@ -395,36 +511,8 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
         logger.info(msg)
 
         for line in lines:
-            name = 'Enrollment Code Range for {}'.format(line.product.attr.course_key)
-            seat = Product.objects.filter(
-                attributes__name='course_key',
-                attribute_values__value_text=line.product.attr.course_key
-            ).get(
-                attributes__name='certificate_type',
-                attribute_values__value_text=line.product.attr.seat_type
-            )
-            _range, created = Range.objects.get_or_create(name=name)
-            if created:
-                _range.add_product(seat)
-
-            vouchers = create_vouchers(
-                name='Enrollment code voucher [{}]'.format(line.product.title),
-                benefit_type=Benefit.PERCENTAGE,
-                benefit_value=100,
-                catalog=None,
-                coupon=seat,
-                end_datetime=settings.ENROLLMENT_CODE_EXIPRATION_DATE,
-                quantity=line.quantity,
-                start_datetime=datetime.datetime.now(),
-                voucher_type=Voucher.SINGLE_USE,
-                _range=_range
-            )
-
-            line_vouchers = OrderLineVouchers.objects.create(line=line)
-            for voucher in vouchers:
-                line_vouchers.vouchers.add(voucher)
-
-            line.set_status(LINE.COMPLETE)
+            with time_line(self):
+                self._fulfill_line(line)
 
         self.send_email(order)
         logger.info("Finished fulfilling 'Enrollment code' product types for order [%s]", order.number)
@@ -441,6 +529,43 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
         """
         raise NotImplementedError("Revoke method not implemented!")
 
+    def _fulfill_line(self, line):
+        """ Creates the vouchers for the given Enrollment code line, and updates the line status.
+
+        Args:
+            line (Line): Order Line, associated with an Enrollment code product.
+        """
+        name = 'Enrollment Code Range for {}'.format(line.product.attr.course_key)
+        seat = Product.objects.filter(
+            attributes__name='course_key',
+            attribute_values__value_text=line.product.attr.course_key
+        ).get(
+            attributes__name='certificate_type',
+            attribute_values__value_text=line.product.attr.seat_type
+        )
+        _range, created = Range.objects.get_or_create(name=name)
+        if created:
+            _range.add_product(seat)
+
+        vouchers = create_vouchers(
+            name='Enrollment code voucher [{}]'.format(line.product.title),
+            benefit_type=Benefit.PERCENTAGE,
+            benefit_value=100,
+            catalog=None,
+            coupon=seat,
+            end_datetime=settings.ENROLLMENT_CODE_EXIPRATION_DATE,
+            quantity=line.quantity,
+            start_datetime=datetime.datetime.now(),
+            voucher_type=Voucher.SINGLE_USE,
+            _range=_range
+        )
+
+        line_vouchers = OrderLineVouchers.objects.create(line=line)
+        for voucher in vouchers:
+            line_vouchers.vouchers.add(voucher)
+
+        line.set_status(LINE.COMPLETE)
+
     def send_email(self, order):
         """ Sends an email with enrollment code order information. """
         # Note (multi-courses): Change from a course_name to a list of course names.
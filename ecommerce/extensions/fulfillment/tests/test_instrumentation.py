@@ -0,0 +1,85 @@
+"""Tests for the fulfillment latency instrumentation."""
+import itertools
+
+import mock
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.contrib.sites.models import Site
+from django.test.utils import override_settings
+
+from ecommerce.core import metrics
+from ecommerce.core.metrics import get_metrics_sink
+from ecommerce.extensions.fulfillment import api
+from ecommerce.extensions.fulfillment.instrumentation import FulfillmentTimer, time_remote_call
+from ecommerce.extensions.fulfillment.tests.mixins import FulfillmentTestMixin
+from ecommerce.tests.testcases import TestCase
+
+
+@override_settings(METRICS_SINK='ecommerce.core.metrics.HistogramMetricsSink')
+class FulfillmentInstrumentationTests(FulfillmentTestMixin, TestCase):
+    """ Tests for the fulfillment.instrumentation module. """
+
+    def setUp(self):
+        super(FulfillmentInstrumentationTests, self).setUp()
+        metrics._sinks.clear()  # pylint: disable=protected-access
+        self.sink = get_metrics_sink()
+
+    def assert_histogram_count(self, name, count):
+        self.assertEqual(self.sink.snapshot()['histograms'][name]['count'], count)
+
+    def test_timer(self):
+        """ Verify the timer records wall time, remote call time and query count for the block. """
+        with FulfillmentTimer('test') as timer:
+            list(Site.objects.all())
+            list(Site.objects.all())
+
+        self.assertEqual(timer.query_count, 2)
+        self.assertGreaterEqual(timer.wall_time, 0)
+        self.assertEqual(timer.remote_time, 0)
+
+        for metric in ('wall_time', 'remote_time', 'queries'):
+            self.assert_histogram_count('test.{}'.format(metric), 1)
+
+        self.assertEqual(self.sink.snapshot()['histograms']['test.queries']['sum'], 2)
+
+    def test_nested_timers(self):
+        """ Verify remote call time is attributed to all active timers, and queries are counted by each timer. """
+        with mock.patch('ecommerce.extensions.fulfillment.instrumentation.time') as mock_time:
+            # Each reading of the clock advances it by one second.
+            mock_time.time.side_effect = itertools.count()
+
+            with FulfillmentTimer('outer') as outer:
+                list(Site.objects.all())
+
+                with FulfillmentTimer('inner') as inner:
+                    with time_remote_call('test_service'):
+                        list(Site.objects.all())
+
+        self.assertEqual(outer.query_count, 2)
+        self.assertEqual(inner.query_count, 1)
+        self.assertEqual(inner.remote_time, 1000)
+        self.assertEqual(outer.remote_time, inner.remote_time)
+        self.assertEqual(inner.wall_time, 3000)
+        self.assertEqual(outer.wall_time, 5000)
+        self.assert_histogram_count('fulfillment.remote_call.test_service', 1)
+
+    def test_queries_not_logged(self):
+        """ Verify queries are counted without logging them, and the connection's cursors are restored. """
+        with FulfillmentTimer('test') as timer:
+            list(Site.objects.all())
+
+        self.assertEqual(timer.query_count, 1)
+        self.assertFalse(connection.force_debug_cursor)
+        self.assertNotIn('cursor', connections[DEFAULT_DB_ALIAS].__dict__)
+
+        list(Site.objects.all())
+        self.assertEqual(timer.query_count, 1)
+
+    @override_settings(FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule', ])
+    def test_fulfill_order(self):
+        """ Verify fulfilling an order records metrics for the order and each module used. """
+        order = self.generate_open_order()
+        api.fulfill_order(order, order.lines)
+
+        for metric in ('wall_time', 'remote_time', 'queries'):
+            self.assert_histogram_count('fulfillment.order.{}'.format(metric), 1)
+            self.assert_histogram_count('fulfillment.module.FakeFulfillmentModule.{}'.format(metric), 1)
@@ -5,12 +5,14 @@ import json
 import ddt
 import httpretty
 import mock
+from django.core.cache import cache
 from django.test import override_settings
 from oscar.core.loading import get_class, get_model
 from oscar.test import factories
 from oscar.test.newfactories import UserFactory, BasketFactory
 from requests.exceptions import ConnectionError, Timeout
 from testfixtures import LogCapture
+from threadlocals.threadlocals import get_current_request
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, ENROLLMENT_CODE_SWITCH
 from ecommerce.core.tests import toggle_switch
@@ -18,7 +20,7 @@ from ecommerce.core.url_utils import get_lms_enrollment_api_url
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.courses.models import Course
 from ecommerce.courses.tests.factories import CourseFactory
-from ecommerce.courses.utils import mode_for_seat
+from ecommerce.courses.utils import get_enrollment_status_cache_key, mode_for_seat
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
 from ecommerce.extensions.fulfillment.modules import (
     CouponFulfillmentModule, EnrollmentCodeFulfillmentModule, EnrollmentFulfillmentModule
@@ -245,6 +247,23 @@ class EnrollmentFulfillmentModuleTests(CourseCatalogTestMixin, FulfillmentTestMi
                 (logger_name, 'INFO', 'Skipping revocation for line [%d]: %s' % (line.id, message))
             )
 
+    @httpretty.activate
+    @ddt.data(200, 500)
+    def test_enrollment_status_invalidated(self, status):
+        """ Verify the cached status of the enrollment is discarded when the line is fulfilled or revoked. """
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), status=status, body='{}',
+                               content_type=JSON)
+        line = self.order.lines.first()
+        cache_key = get_enrollment_status_cache_key(self.user.username, self.course_id)
+
+        cache.set(cache_key, {'mode': 'audit', 'is_active': True})
+        EnrollmentFulfillmentModule().fulfill_product(self.order, [line])
+        self.assertIsNone(cache.get(cache_key))
+
+        cache.set(cache_key, {'mode': self.certificate_type, 'is_active': True})
+        EnrollmentFulfillmentModule().revoke_lines([line])
+        self.assertIsNone(cache.get(cache_key))
+
     @httpretty.activate
     def test_revoke_product_unexpected_error(self):
         """ If the Enrollment API responds with a non-200 status, the method should log an error and return False. """
@@ -281,6 +300,38 @@ class EnrollmentFulfillmentModuleTests(CourseCatalogTestMixin, FulfillmentTestMi
                 (logger_name, 'ERROR', 'Failed to revoke fulfillment of Line [{}].'.format(line.id))
             )
 
+    @httpretty.activate
+    @override_settings(ENROLLMENT_REVOCATION_CONCURRENCY=2)
+    def test_revoke_lines(self):
+        """ The method should call the Enrollment API once for each line, and return the result for each line. """
+        responses = [
+            httpretty.Response(body='{}', status=200, content_type=JSON),
+            httpretty.Response(body='{"message": "Meh."}', status=500, content_type=JSON),
+        ]
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), responses=responses)
+        line = self.order.lines.first()
+
+        results = EnrollmentFulfillmentModule().revoke_lines([line, line])
+
+        self.assertEqual(sorted(results), [False, True])
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 2)
+
+    @httpretty.activate
+    @override_settings(ENROLLMENT_REVOCATION_CONCURRENCY=2)
+    def test_revoke_lines_without_current_request(self):
+        """ Lines should be revoked even though the threads calling the Enrollment API have no current request. """
+        current_requests = []
+
+        def callback(request, uri, headers):  # pylint: disable=unused-argument
+            current_requests.append(get_current_request())
+            return 200, headers, '{}'
+
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), body=callback, content_type=JSON)
+        line = self.order.lines.first()
+
+        self.assertEqual(EnrollmentFulfillmentModule().revoke_lines([line, line]), [True, True])
+        self.assertEqual(current_requests, [None, None])
+
     @httpretty.activate
     def test_credit_enrollment_module_fulfill(self):
         """Happy path test to ensure we can properly fulfill enrollments."""
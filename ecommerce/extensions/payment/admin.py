@@ -4,6 +4,7 @@ from django.utils.html import format_html
 from oscar.apps.payment.admin import *  # noqa pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-position
 from oscar.core.loading import get_model
 
+ArchivedPaymentProcessorResponse = get_model('payment', 'ArchivedPaymentProcessorResponse')
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
 
@@ -23,3 +24,10 @@ class PaymentProcessorResponseAdmin(admin.ModelAdmin):
         return format_html('<br><br><pre>{}</pre>', pretty_response)
 
     formatted_response.allow_tags = True
+
+
+@admin.register(ArchivedPaymentProcessorResponse)
+class ArchivedPaymentProcessorResponseAdmin(PaymentProcessorResponseAdmin):
+    list_display = ('id', 'processor_name', 'transaction_id', 'basket_id', 'created', 'archived')
+    fields = ('processor_name', 'transaction_id', 'basket_id', 'created', 'archived', 'formatted_response')
+    readonly_fields = fields
@@ -8,3 +8,7 @@ class PaymentConfig(config.PaymentConfig):
         # Register signal handlers
         # noinspection PyUnresolvedReferences
         import ecommerce.extensions.payment.signals  # pylint: disable=unused-variable
+
+        # Import the payment processor classes now, rather than while handling the first request that needs them.
+        from ecommerce.extensions.payment.helpers import get_processor_registry
+        get_processor_registry()
@@ -0,0 +1,26 @@
+""" In-process execution of payment processor notifications acknowledged before they are processed. """
+import threading
+
+from django.conf import settings
+
+from ecommerce.core.executor import BoundedThreadPool
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_notification_executor():
+    """ Returns the process-wide thread pool used to process payment processor notifications. """
+    global _executor  # pylint: disable=global-statement
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedThreadPool(
+                    'payment_notifications',
+                    settings.PAYMENT_NOTIFICATION_WORKERS,
+                    settings.PAYMENT_NOTIFICATION_QUEUE_SIZE,
+                    drain_timeout=settings.PAYMENT_NOTIFICATION_DRAIN_TIMEOUT
+                )
+
+    return _executor
@@ -2,12 +2,17 @@
 import hmac
 import base64
 import hashlib
+import threading
+from collections import OrderedDict
 
 from django.conf import settings
 from django.utils import importlib
 
 from ecommerce.extensions.payment import exceptions
 
+_registries = {}
+_registries_lock = threading.Lock()
+
 
 def get_processor_class(path):
     """Return the payment processor class at the specified path.
@@ -44,6 +49,37 @@ def get_default_processor_class():
     return processor_class
 
 
+def get_processor_registry():
+    """Return the payment processor classes specified in the PAYMENT_PROCESSORS setting, keyed by name.
+
+    The classes are only imported the first time the registry is requested; the registry is then kept
+    for the life of the process.
+
+    Returns:
+        OrderedDict: The payment processor classes, in the order in which they are specified in the setting.
+
+    Raises:
+        ImportError: If no module with the parsed module path exists.
+        AttributeError: If the module located at the parsed module path
+            does not contain a class with the parsed class name.
+    """
+    paths = tuple(settings.PAYMENT_PROCESSORS)
+    registry = _registries.get(paths)
+
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(paths)
+            if registry is None:
+                registry = OrderedDict()
+                for path in paths:
+                    processor_class = get_processor_class(path)
+                    registry[processor_class.NAME] = processor_class
+
+                _registries[paths] = registry
+
+    return registry
+
+
 def get_processor_class_by_name(name):
     """Return the payment processor class corresponding to the specified name.
 
@@ -56,15 +92,12 @@ def get_processor_class_by_name(name):
     Raises:
         ProcessorNotFoundError: If no payment processor with the given name exists.
     """
-    for path in settings.PAYMENT_PROCESSORS:
-        processor_class = get_processor_class(path)
-
-        if name == processor_class.NAME:
-            return processor_class
-
-    raise exceptions.ProcessorNotFoundError(
-        exceptions.PROCESSOR_NOT_FOUND_DEVELOPER_MESSAGE.format(name=name)
-    )
+    try:
+        return get_processor_registry()[name]
+    except KeyError:
+        raise exceptions.ProcessorNotFoundError(
+            exceptions.PROCESSOR_NOT_FOUND_DEVELOPER_MESSAGE.format(name=name)
+        )
 
 
 def sign(message, secret):
@@ -0,0 +1,91 @@
+"""
+Management command that archives old payment processor responses.
+
+Responses are kept for auditing, but are rarely read once the associated payment has been handled. Moving them to a
+compressed archive table keeps the PaymentProcessorResponse table, which is queried while handling payments, small.
+"""
+from __future__ import unicode_literals
+
+import datetime
+import time
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from oscar.core.loading import get_model
+
+ArchivedPaymentProcessorResponse = get_model('payment', 'ArchivedPaymentProcessorResponse')
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+
+
+class Command(BaseCommand):
+    help = 'Move payment processor responses older than a given age to the compressed archive table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-d', '--days',
+                            action='store',
+                            dest='days',
+                            default=180,
+                            type=int,
+                            help='Minimum age, in days, of the responses to be archived.')
+        # Batched archival prevents the entire table from locking up as the command executes.
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Size of each batch of responses to be archived.')
+        # Sleeping between each batch gives MySQL time to process other connections.
+        parser.add_argument('-s', '--sleep-seconds',
+                            action='store',
+                            dest='sleep_seconds',
+                            default=3,
+                            type=int,
+                            help='Seconds to sleep between each batch.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually archive the responses.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=options['days'])
+        queryset = PaymentProcessorResponse.objects.filter(created__lt=cutoff)
+        count = queryset.count()
+
+        if options['commit']:
+            if count:
+                self.stderr.write('Archiving [{count}] responses created before [{cutoff}].'.format(
+                    count=count, cutoff=cutoff))
+
+                batch_size = options['batch_size']
+                sleep_seconds = options['sleep_seconds']
+
+                # Batches are selected by keyset, rather than by offset or ID range, so that each batch is a
+                # single index range scan of exactly batch_size rows, regardless of gaps in the IDs.
+                last_id = 0
+                while True:
+                    responses = list(queryset.filter(id__gt=last_id).order_by('id')[:batch_size])
+                    if not responses:
+                        break
+
+                    last_id = responses[-1].id
+                    self.stderr.write('Archiving responses [{start}] through [{end}].'.format(
+                        start=responses[0].id, end=last_id))
+
+                    with transaction.atomic():
+                        ArchivedPaymentProcessorResponse.objects.bulk_create(
+                            [ArchivedPaymentProcessorResponse.from_response(response) for response in responses]
+                        )
+                        PaymentProcessorResponse.objects.filter(id__in=[response.id for response in responses]).delete()
+
+                    self.stderr.write('Complete. Sleeping.')
+                    time.sleep(sleep_seconds)
+
+                self.stderr.write('All responses archived.')
+            else:
+                self.stderr.write('No responses to archive.')
+        else:
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have archived [{}] responses.'.format(count)
+            self.stderr.write(msg)
@@ -0,0 +1,80 @@
+"""
+Management command that processes CyberSource merchant notifications which were acknowledged, but never processed.
+
+When fast acknowledgement is enabled, notifications are stored, acknowledged, and processed on an in-process executor.
+Notifications queued on a process that exits before processing them (e.g. when it is restarted) remain pending, and
+CyberSource does not resend them. This command should be run periodically (e.g. by cron) to process them.
+"""
+from __future__ import unicode_literals
+
+import datetime
+
+from django.core.management import BaseCommand
+from django.utils import timezone
+from oscar.core.loading import get_model
+from oscar.test.utils import RequestFactory
+
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.payment.views import process_stored_notification
+
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+
+
+class Command(BaseCommand):
+    help = 'Process CyberSource merchant notifications that were acknowledged, but have not been processed.'
+
+    def add_arguments(self, parser):
+        # Notifications are normally processed within seconds of being acknowledged. Younger notifications may still
+        # be queued on the executor of the process that received them.
+        parser.add_argument('-m', '--min-age-minutes',
+                            action='store',
+                            dest='min_age_minutes',
+                            default=10,
+                            type=int,
+                            help='Minimum age, in minutes, of the notifications to be processed.')
+        # Notifications whose processing keeps failing are eventually left for manual review.
+        parser.add_argument('-d', '--max-age-days',
+                            action='store',
+                            dest='max_age_days',
+                            default=3,
+                            type=int,
+                            help='Maximum age, in days, of the notifications to be processed.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually process the notifications.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        queryset = PaymentProcessorResponse.objects.filter(
+            processor_name=Cybersource.NAME,
+            pending=True,
+            created__lt=now - datetime.timedelta(minutes=options['min_age_minutes']),
+            created__gte=now - datetime.timedelta(days=options['max_age_days'])
+        ).select_related('basket__site').order_by('id')
+        responses = list(queryset)
+
+        if not options['commit']:
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have processed [{}] notifications.'.format(len(responses))
+            self.stderr.write(msg)
+            return
+
+        if not responses:
+            self.stderr.write('No notifications to process.')
+            return
+
+        for ppr in responses:
+            self.stderr.write('Processing the notification recorded in entry [{}].'.format(ppr.id))
+            process_stored_notification(ppr.id, self._create_request(ppr))
+
+        remaining = PaymentProcessorResponse.objects.filter(id__in=[ppr.id for ppr in responses], pending=True).count()
+        self.stderr.write('Processed [{processed}] notifications. [{remaining}] remain pending.'.format(
+            processed=len(responses) - remaining, remaining=remaining))
+
+    def _create_request(self, ppr):
+        """ Returns a request for the site of the notification's basket, for use as the current request. """
+        request = RequestFactory().post('/')
+        request.site = ppr.basket.site if ppr.basket else None
+        return request
@@ -0,0 +1,65 @@
+from __future__ import unicode_literals
+from StringIO import StringIO
+import datetime
+
+from django.core.management import call_command
+from django.utils import timezone
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.tests.testcases import TestCase
+
+ArchivedPaymentProcessorResponse = get_model('payment', 'ArchivedPaymentProcessorResponse')
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+
+
+class ArchiveProcessorResponsesCommandTests(TestCase):
+    command = 'archive_processor_responses'
+
+    def setUp(self):
+        super(ArchiveProcessorResponsesCommandTests, self).setUp()
+        basket = factories.BasketFactory()
+
+        self.old_responses = [
+            PaymentProcessorResponse.objects.create(
+                processor_name='paypal', transaction_id='PAY-{}'.format(index), basket=basket,
+                response={'id': index, 'state': 'approved'}
+            )
+            for index in range(5)
+        ]
+        PaymentProcessorResponse.objects.filter(id__in=[response.id for response in self.old_responses]).update(
+            created=timezone.now() - datetime.timedelta(days=200)
+        )
+
+        self.recent_response = PaymentProcessorResponse.objects.create(
+            processor_name='paypal', transaction_id='PAY-recent', response={}
+        )
+
+    def test_without_commit(self):
+        """ Verify the command does not archive responses if the commit flag is not set. """
+        call_command(self.command, commit=False, stderr=StringIO())
+
+        self.assertEqual(PaymentProcessorResponse.objects.count(), 6)
+        self.assertFalse(ArchivedPaymentProcessorResponse.objects.exists())
+
+    def test_with_commit(self):
+        """ Verify the command archives, in batches, responses older than the given age. """
+        call_command(self.command, commit=True, days=180, batch_size=2, sleep_seconds=0, stderr=StringIO())
+
+        self.assertEqual(list(PaymentProcessorResponse.objects.all()), [self.recent_response])
+
+        for response in self.old_responses:
+            archived = ArchivedPaymentProcessorResponse.objects.get(
+                processor_name=response.processor_name, transaction_id=response.transaction_id
+            )
+            self.assertEqual(archived.id, response.id)
+            self.assertEqual(archived.basket_id, response.basket_id)
+            self.assertEqual(archived.response, response.response)
+
+    def test_nothing_to_archive(self):
+        """ Verify the command succeeds when there are no responses to archive. """
+        out = StringIO()
+        call_command(self.command, commit=True, days=365, sleep_seconds=0, stderr=out)
+
+        self.assertEqual(out.getvalue().strip(), 'No responses to archive.')
+        self.assertEqual(PaymentProcessorResponse.objects.count(), 6)
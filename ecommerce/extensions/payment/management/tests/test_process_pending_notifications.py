@@ -0,0 +1,65 @@
+from __future__ import unicode_literals
+from StringIO import StringIO
+import datetime
+
+import mock
+from django.core.management import call_command
+from django.utils import timezone
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.tests.testcases import TestCase
+
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+
+
+class ProcessPendingNotificationsCommandTests(TestCase):
+    command = 'process_pending_notifications'
+
+    def setUp(self):
+        super(ProcessPendingNotificationsCommandTests, self).setUp()
+        self.basket = factories.BasketFactory(site=self.site)
+
+        self.lost = self.create_response('lost', minutes=30)
+        self.queued = self.create_response('queued', minutes=1)
+        self.expired = self.create_response('expired', minutes=5 * 24 * 60)
+        self.processed = self.create_response('processed', minutes=30, pending=False)
+
+    def create_response(self, transaction_id, minutes, pending=True, processor_name='cybersource'):
+        response = PaymentProcessorResponse.objects.create(
+            processor_name=processor_name, transaction_id=transaction_id, basket=self.basket, response={},
+            pending=pending
+        )
+        PaymentProcessorResponse.objects.filter(id=response.id).update(
+            created=timezone.now() - datetime.timedelta(minutes=minutes)
+        )
+        return response
+
+    def call_command(self, **options):
+        def process(ppr_id, request):
+            self.assertEqual(request.site, self.site)
+            PaymentProcessorResponse.objects.filter(id=ppr_id).update(pending=False)
+
+        path = 'ecommerce.extensions.payment.management.commands.process_pending_notifications.' \
+               'process_stored_notification'
+        with mock.patch(path, side_effect=process) as mock_process:
+            call_command(self.command, stderr=StringIO(), **options)
+
+        return [args[0][0] for args in mock_process.call_args_list]
+
+    def test_without_commit(self):
+        """ Verify the command does not process notifications if the commit flag is not set. """
+        self.assertEqual(self.call_command(commit=False), [])
+        self.assertTrue(PaymentProcessorResponse.objects.get(id=self.lost.id).pending)
+
+    def test_with_commit(self):
+        """ Verify the command processes pending notifications within the given age range. """
+        self.assertEqual(self.call_command(commit=True, min_age_minutes=10, max_age_days=3), [self.lost.id])
+        self.assertFalse(PaymentProcessorResponse.objects.get(id=self.lost.id).pending)
+        self.assertTrue(PaymentProcessorResponse.objects.get(id=self.queued.id).pending)
+        self.assertTrue(PaymentProcessorResponse.objects.get(id=self.expired.id).pending)
+
+    def test_nothing_to_process(self):
+        """ Verify the command succeeds when there are no notifications to process. """
+        PaymentProcessorResponse.objects.update(pending=False)
+        self.assertEqual(self.call_command(commit=True), [])
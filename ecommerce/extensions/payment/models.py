@@ -1,3 +1,6 @@
+import json
+import zlib
+
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from jsonfield import JSONField
@@ -15,6 +18,8 @@ class PaymentProcessorResponse(models.Model):
                                on_delete=models.SET_NULL)
     response = JSONField()
     created = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Set for notifications that were acknowledged before being processed, until they have been processed.
+    pending = models.BooleanField(default=False, db_index=True)
 
     class Meta(object):
         index_together = ('processor_name', 'transaction_id')
@@ -22,6 +27,44 @@ class PaymentProcessorResponse(models.Model):
         verbose_name_plural = _('Payment Processor Responses')
 
 
+class ArchivedPaymentProcessorResponse(models.Model):
+    """ Compressed copy of a PaymentProcessorResponse, moved out of that table by archive_processor_responses.
+
+    The ID, processor name, transaction ID, basket ID, and creation time of the original entry are kept uncompressed,
+    and indexed, so that archived responses can still be found when auditing. The basket is not a foreign key, since
+    the baskets of archived responses may since have been deleted.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    processor_name = models.CharField(max_length=255, verbose_name=_('Payment Processor'))
+    transaction_id = models.CharField(max_length=255, verbose_name=_('Transaction ID'), null=True, blank=True)
+    basket_id = models.IntegerField(verbose_name=_('Basket ID'), null=True, blank=True, db_index=True)
+    compressed_response = models.BinaryField()
+    created = models.DateTimeField(db_index=True)
+    archived = models.DateTimeField(auto_now_add=True)
+
+    class Meta(object):
+        index_together = ('processor_name', 'transaction_id')
+        verbose_name = _('Archived Payment Processor Response')
+        verbose_name_plural = _('Archived Payment Processor Responses')
+
+    @classmethod
+    def from_response(cls, processor_response):
+        """ Returns an unsaved archived copy of the given PaymentProcessorResponse. """
+        return cls(
+            id=processor_response.id,
+            processor_name=processor_response.processor_name,
+            transaction_id=processor_response.transaction_id,
+            basket_id=processor_response.basket_id,
+            compressed_response=zlib.compress(json.dumps(processor_response.response)),
+            created=processor_response.created
+        )
+
+    @property
+    def response(self):
+        return json.loads(zlib.decompress(bytes(self.compressed_response)))
+
+
 class Source(AbstractSource):
     card_type = models.CharField(max_length=255, choices=CARD_TYPE_CHOICES, null=True, blank=True)
 
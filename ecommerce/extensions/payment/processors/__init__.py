@@ -1,14 +1,50 @@
 import abc
+import time
 
 from django.conf import settings
 from oscar.core.loading import get_model
 from threadlocals.threadlocals import get_current_request
 import waffle
+from waffle.models import Switch
 
 from ecommerce.core.exceptions import MissingRequestError
 
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
+# Expiration time, and state, of the payment processor switches, as last read from the database.
+_switch_snapshot = None
+
+
+def get_processor_switch_states():
+    """
+    Returns the state of every payment processor switch, keyed by switch name.
+
+    The states are read with a single query, and kept in memory for PAYMENT_PROCESSOR_SWITCH_CACHE_TIMEOUT
+    seconds. The snapshot is invalidated when a switch is saved in this process; other processes see the
+    change once their snapshot expires.
+
+    Returns:
+        dict: Switch names mapped to booleans indicating whether the switch is active.
+    """
+    global _switch_snapshot  # pylint: disable=global-statement
+
+    snapshot = _switch_snapshot
+    if snapshot is None or snapshot[0] < time.time():
+        states = dict(
+            Switch.objects.filter(name__startswith=settings.PAYMENT_PROCESSOR_SWITCH_PREFIX).values_list(
+                'name', 'active'
+            )
+        )
+        snapshot = _switch_snapshot = (time.time() + settings.PAYMENT_PROCESSOR_SWITCH_CACHE_TIMEOUT, states)
+
+    return snapshot[1]
+
+
+def invalidate_processor_switch_states():
+    """ Discards the snapshot of payment processor switch states held by this process. """
+    global _switch_snapshot  # pylint: disable=global-statement
+    _switch_snapshot = None
+
 
 class BasePaymentProcessor(object):  # pragma: no cover
     """Base payment processor class."""
@@ -63,12 +99,20 @@ class BasePaymentProcessor(object):  # pragma: no cover
             MissingRequestError: if no `request` is available
         """
         request = get_current_request()
-        if request:
+        if not request:
+            raise MissingRequestError
+
+        # The configuration is memoized for the request, since it is read many times while handling one.
+        memo = getattr(self, '_configuration_memo', None)
+        if memo is None or memo[0] is not request:
             partner_short_code = request.site.siteconfiguration.partner.short_code
-            return settings.PAYMENT_PROCESSOR_CONFIG[partner_short_code.lower()][self.NAME.lower()]
-        raise MissingRequestError
+            memo = self._configuration_memo = (  # pylint: disable=attribute-defined-outside-init
+                request, settings.PAYMENT_PROCESSOR_CONFIG[partner_short_code.lower()][self.NAME.lower()]
+            )
 
-    def record_processor_response(self, response, transaction_id=None, basket=None):
+        return memo[1]
+
+    def record_processor_response(self, response, transaction_id=None, basket=None, pending=False):
         """
         Save the processor's response to the database for auditing.
 
@@ -78,12 +122,13 @@ class BasePaymentProcessor(object):  # pragma: no cover
         Keyword Arguments:
             transaction_id (string): Identifier for the transaction on the payment processor's servers
             basket (Basket): Basket associated with the payment event (e.g., being purchased)
+            pending (bool): Whether the response has been acknowledged, but has yet to be processed
 
         Return
             PaymentProcessorResponse
         """
         return PaymentProcessorResponse.objects.create(processor_name=self.NAME, transaction_id=transaction_id,
-                                                       response=response, basket=basket)
+                                                       response=response, basket=basket, pending=pending)
 
     @abc.abstractmethod
     def issue_credit(self, source, amount, currency):
@@ -102,4 +147,9 @@ class BasePaymentProcessor(object):  # pragma: no cover
         """
         Returns True if this payment processor is enabled, and False otherwise.
         """
-        return waffle.switch_is_active(settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + cls.NAME)
+        switch_name = settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + cls.NAME
+
+        if not settings.PAYMENT_PROCESSOR_SWITCH_CACHE_TIMEOUT:
+            return waffle.switch_is_active(switch_name)
+
+        return get_processor_switch_states().get(switch_name, getattr(settings, 'WAFFLE_SWITCH_DEFAULT', False))
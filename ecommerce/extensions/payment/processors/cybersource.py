@@ -9,7 +9,6 @@ from decimal import Decimal
 from django.conf import settings
 from oscar.apps.payment.exceptions import UserCancelled, GatewayError, TransactionDeclined
 from oscar.core.loading import get_model
-from suds.client import Client
 from suds.sudsobject import asdict
 from suds.wsse import Security, UsernameToken
 from threadlocals.threadlocals import get_current_request
@@ -22,7 +21,8 @@ from ecommerce.extensions.payment.exceptions import (InvalidSignatureError, Inva
                                                      PartialAuthorizationError)
 from ecommerce.extensions.payment.helpers import sign
 from ecommerce.extensions.payment.processors import BasePaymentProcessor
-from ecommerce.extensions.payment.transport import RequestsTransport
+from ecommerce.extensions.payment.sessions import get_http_session
+from ecommerce.extensions.payment.soap import get_soap_client
 
 logger = logging.getLogger(__name__)
 
@@ -278,7 +278,7 @@ class Cybersource(BasePaymentProcessor):
             token = UsernameToken(self.merchant_id, self.transaction_key)
             security.tokens.append(token)
 
-            client = Client(self.soap_api_url, transport=RequestsTransport())
+            client = get_soap_client(self.soap_api_url, self.merchant_id, session=get_http_session(self.NAME))
             client.set_options(wsse=security)
 
             credit_service = client.factory.create('ns0:CCCreditService')
@@ -1,8 +1,12 @@
 """ PayPal payment processing. """
+import datetime
 from decimal import Decimal
 import logging
+import threading
 from urlparse import urljoin
 
+from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.utils.functional import cached_property
 from oscar.apps.payment.exceptions import GatewayError
@@ -14,6 +18,7 @@ from ecommerce.core.url_utils import get_ecommerce_url, get_lms_url
 from ecommerce.extensions.order.constants import PaymentEventTypeName
 from ecommerce.extensions.payment.processors import BasePaymentProcessor
 from ecommerce.extensions.payment.models import PaypalWebProfile
+from ecommerce.extensions.payment.sessions import get_http_session
 from ecommerce.extensions.payment.utils import middle_truncate
 
 
@@ -26,6 +31,94 @@ ProductClass = get_model('catalogue', 'ProductClass')
 Source = get_model('payment', 'Source')
 SourceType = get_model('payment', 'SourceType')
 
+WEB_PROFILE_ID_CACHE_KEY = 'paypal_web_profile_id_{name}'
+
+_apis = {}
+_apis_lock = threading.Lock()
+
+
+class PaypalApi(paypalrestsdk.Api):
+    """ PayPal API client that makes requests through a shared session, so that connections are kept alive.
+
+    The SDK's own implementation opens a new connection for every request, including token requests. Instances are
+    safe to share between threads; see get_paypal_api.
+    """
+    # Number of seconds before its expiration at which an OAuth token is discarded, so that it does not expire
+    # while a request using it is in flight.
+    TOKEN_EXPIRY_MARGIN = 300
+
+    def __init__(self, options=None, session=None, **kwargs):
+        super(PaypalApi, self).__init__(options, **kwargs)
+        self.session = session or get_http_session(Paypal.NAME)
+        self._token_lock = threading.Lock()
+
+    def get_token_hash(self, authorization_code=None, refresh_token=None):
+        if authorization_code is not None or refresh_token is not None:
+            return super(PaypalApi, self).get_token_hash(authorization_code, refresh_token)
+
+        # Only one thread requests a new client credentials token; the others wait for it.
+        with self._token_lock:
+            return super(PaypalApi, self).get_token_hash()
+
+    def validate_token_hash(self):
+        if self.token_request_at and self.token_hash and self.token_hash.get('expires_in') is not None:
+            age = (datetime.datetime.now() - self.token_request_at).total_seconds()
+            if age > self.token_hash['expires_in'] - self.TOKEN_EXPIRY_MARGIN:
+                self.token_hash = None
+
+    def http_call(self, url, method, **kwargs):
+        response = self.session.request(method, url, proxies=self.proxies, **kwargs)
+        return self.handle_response(response, response.content.decode('utf-8'))
+
+
+def get_paypal_api(configuration):
+    """ Returns the process-wide PayPal API client for the account described by the given configuration.
+
+    Clients are kept for the life of the process, so that their OAuth tokens are reused until shortly before
+    they expire, rather than requested for every processor instance.
+
+    Arguments:
+        configuration (dict): PayPal configuration of a partner, from PAYMENT_PROCESSOR_CONFIG.
+
+    Returns:
+        PaypalApi
+    """
+    key = (configuration['mode'], configuration['client_id'], configuration['client_secret'])
+    api = _apis.get(key)
+
+    if api is None:
+        with _apis_lock:
+            api = _apis.get(key)
+            if api is None:
+                api = _apis[key] = PaypalApi({
+                    'mode': configuration['mode'],
+                    'client_id': configuration['client_id'],
+                    'client_secret': configuration['client_secret']
+                })
+
+    return api
+
+
+def get_web_profile_id(name):
+    """ Returns the ID of the enabled web profile with the given name, or None if there is no such profile.
+
+    The ID is cached for PAYPAL_WEB_PROFILE_CACHE_TIMEOUT seconds. The cache is invalidated whenever a web profile
+    is enabled or disabled.
+    """
+    cache_key = WEB_PROFILE_ID_CACHE_KEY.format(name=name)
+    profile_id = cache.get(cache_key)
+
+    if profile_id is None:
+        try:
+            profile_id = PaypalWebProfile.objects.get(name=name).id
+        except PaypalWebProfile.DoesNotExist:
+            # Cache the absence of a profile, too.
+            profile_id = ''
+
+        cache.set(cache_key, profile_id, settings.PAYPAL_WEB_PROFILE_CACHE_TIMEOUT)
+
+    return profile_id or None
+
 
 class Paypal(BasePaymentProcessor):
     """
@@ -53,11 +146,7 @@ class Paypal(BasePaymentProcessor):
         Returns Paypal API instance with appropriate configuration
         Returns: Paypal API instance
         """
-        return paypalrestsdk.Api({
-            'mode': self.configuration['mode'],
-            'client_id': self.configuration['client_id'],
-            'client_secret': self.configuration['client_secret']
-        })
+        return get_paypal_api(self.configuration)
 
     @property
     def receipt_url(self):
@@ -122,11 +211,9 @@ class Paypal(BasePaymentProcessor):
             }],
         }
 
-        try:
-            web_profile = PaypalWebProfile.objects.get(name=self.DEFAULT_PROFILE_NAME)
-            data['experience_profile_id'] = web_profile.id
-        except PaypalWebProfile.DoesNotExist:
-            pass
+        web_profile_id = get_web_profile_id(self.DEFAULT_PROFILE_NAME)
+        if web_profile_id:
+            data['experience_profile_id'] = web_profile_id
 
         payment = paypalrestsdk.Payment(data, api=self.paypal_api)
         payment.create()
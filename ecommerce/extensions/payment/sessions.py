@@ -0,0 +1,146 @@
+"""Shared, connection-pooled HTTP sessions used by payment processors to call their APIs."""
+import threading
+
+from django.conf import settings
+from django.utils import six
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+from ecommerce.core.metrics import get_metrics_sink
+
+# Only requests using these methods are retried if reading the response fails. Requests that failed to connect are
+# retried regardless of their method, since the processor never received them. Error responses are never retried;
+# they are returned to the caller, which is responsible for handling them.
+IDEMPOTENT_METHODS = frozenset(['DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'])
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class IdempotentRetry(Retry):
+    """ Retry configuration that only retries requests whose response could not be read if they are idempotent.
+
+    urllib3 only applies the method whitelist to retries forced by the status of a response. Read errors (e.g. read
+    timeouts) are otherwise retried for every method, which would send a payment or refund (a POST) again after the
+    processor may already have acted on it.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if error and self._is_read_error(error) and (method or '').upper() not in self.method_whitelist:
+            six.reraise(type(error), error, _stacktrace)
+
+        return super(IdempotentRetry, self).increment(
+            method=method, url=url, response=response, error=error, _pool=_pool, _stacktrace=_stacktrace
+        )
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """ Transport adapter that applies a default timeout to requests, and reports connection pool usage.
+
+    Connection pool usage is reported, via the metrics sink, as two gauges:
+
+        <metric_prefix>.<name>.pool_hits: Number of requests sent over a connection kept alive by the pool.
+        <metric_prefix>.<name>.pool_misses: Number of requests for which a new connection was opened.
+    """
+
+    def __init__(self, name, timeout=None, metric_prefix='payment.http', **kwargs):
+        self.name = name
+        self.timeout = timeout
+        self.metric_prefix = metric_prefix
+        super(PooledHTTPAdapter, self).__init__(**kwargs)
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+
+        try:
+            return super(PooledHTTPAdapter, self).send(request, **kwargs)
+        finally:
+            stats = self.get_stats()
+            sink = get_metrics_sink()
+            sink.gauge('{}.{}.pool_hits'.format(self.metric_prefix, self.name), stats['hits'])
+            sink.gauge('{}.{}.pool_misses'.format(self.metric_prefix, self.name), stats['misses'])
+
+    def get_stats(self):
+        """ Returns the number of requests sent over reused (hits) and new (misses) connections.
+
+        Only connection pools currently held by the adapter are considered.
+        """
+        requests_sent = connections_opened = 0
+        pools = self.poolmanager.pools
+
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:
+                # The pool was evicted since we listed the keys.
+                continue
+
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+
+        return {
+            'hits': max(requests_sent - connections_opened, 0),
+            'misses': connections_opened,
+        }
+
+
+def get_http_options(processor_name):
+    """ Returns the HTTP options for the given processor: the defaults, updated with processor-specific options. """
+    options = dict(settings.PAYMENT_PROCESSOR_HTTP_OPTIONS['default'])
+    options.update(settings.PAYMENT_PROCESSOR_HTTP_OPTIONS.get(processor_name, {}))
+    return options
+
+
+def create_http_session(processor_name):
+    """ Returns a new session configured with the HTTP options of the given processor. """
+    options = get_http_options(processor_name)
+    retries = IdempotentRetry(
+        total=options['max_retries'],
+        backoff_factor=options['backoff_factor'],
+        method_whitelist=IDEMPOTENT_METHODS
+    )
+    adapter = PooledHTTPAdapter(
+        processor_name,
+        timeout=(options['connect_timeout'], options['read_timeout']),
+        pool_connections=options['pool_size'],
+        pool_maxsize=options['pool_size'],
+        max_retries=retries
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session(processor_name):
+    """ Returns the process-wide HTTP session for the given payment processor.
+
+    The session keeps connections to the processor alive between requests, applies the processor's timeouts,
+    and retries failed requests that are safe to retry. Sessions are safe to share between threads.
+
+    Arguments:
+        processor_name (str): Name of the payment processor (e.g. cybersource).
+
+    Returns:
+        requests.Session
+    """
+    session = _sessions.get(processor_name)
+
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(processor_name)
+            if session is None:
+                session = _sessions[processor_name] = create_http_session(processor_name)
+
+    return session
+
+
+def get_http_session_stats():
+    """ Returns the connection pool hits and misses of each payment processor's session, keyed by processor name. """
+    return {
+        name: session.get_adapter('https://').get_stats()
+        for name, session in _sessions.items()
+    }
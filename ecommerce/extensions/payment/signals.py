@@ -2,11 +2,14 @@ import logging
 
 from django.conf import settings
 from django.core.cache import caches
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from waffle.models import Switch
 
 from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_CACHE_KEY
+from ecommerce.extensions.payment.models import PaypalWebProfile
+from ecommerce.extensions.payment.processors import invalidate_processor_switch_states
+from ecommerce.extensions.payment.processors.paypal import WEB_PROFILE_ID_CACHE_KEY
 
 
 logger = logging.getLogger(__name__)
@@ -24,4 +27,17 @@ def invalidate_processor_cache(*_args, **kwargs):
         processor = parts[1]
         logger.info('Switched payment processor [%s] %s.', processor, 'on' if switch.active else 'off')
         caches['default'].delete(PAYMENT_PROCESSOR_CACHE_KEY)
+        invalidate_processor_switch_states()
         logger.info('Invalidated payment processor cache after toggling [%s].', switch.name)
+
+
+@receiver(post_save, sender=PaypalWebProfile)
+@receiver(post_delete, sender=PaypalWebProfile)
+def invalidate_web_profile_cache(*_args, **kwargs):
+    """
+    When PayPal web profiles are enabled or disabled (e.g. by the paypal_profile
+    command), the cached ID of the profile must be invalidated.
+    """
+    profile = kwargs['instance']
+    caches['default'].delete(WEB_PROFILE_ID_CACHE_KEY.format(name=profile.name))
+    logger.info('Invalidated PayPal web profile cache after changing [%s].', profile.name)
@@ -0,0 +1,44 @@
+"""Process-wide cache of SOAP clients used by payment processors."""
+import threading
+
+from django.conf import settings
+from suds.cache import ObjectCache
+from suds.client import Client
+
+from ecommerce.extensions.payment.transport import RequestsTransport
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_soap_client(wsdl_url, key, session=None):
+    """ Returns a SOAP client for the service described by the given WSDL.
+
+    Downloading and parsing a WSDL is slow, so a single client is built for each (key, WSDL URL) pair and kept for
+    the life of the process. The parsed WSDL is also cached on disk, in SOAP_WSDL_CACHE_DIR, so that new processes
+    need not download it. Each call returns a clone of the cached client. Clones share the parsed WSDL and the
+    transport's connection pool, but have their own options, so callers may safely set options (e.g. WS-Security
+    credentials) while other threads use the same service.
+
+    Arguments:
+        wsdl_url (str): URL of the service's WSDL.
+        key (str): Identifies the account using the service (e.g. a merchant ID), so that accounts do not
+            share clients.
+        session (requests.Session): Session used by the client's transport. Only used when the client is built.
+
+    Returns:
+        suds.client.Client
+    """
+    cache_key = (key, wsdl_url)
+    client = _clients.get(cache_key)
+
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(cache_key)
+            if client is None:
+                cache = ObjectCache(location=settings.SOAP_WSDL_CACHE_DIR, days=settings.SOAP_WSDL_CACHE_DAYS)
+                client = _clients[cache_key] = Client(
+                    wsdl_url, transport=RequestsTransport(session=session), cache=cache
+                )
+
+    return client.clone()
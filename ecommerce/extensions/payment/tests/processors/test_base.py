@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.test import override_settings
+
+from ecommerce.core.tests import toggle_switch
+from ecommerce.extensions.payment.processors import get_processor_switch_states, invalidate_processor_switch_states
+from ecommerce.extensions.payment.tests.processors import AnotherDummyProcessor, DummyProcessor
+from ecommerce.tests.testcases import TestCase
+
+
+@override_settings(PAYMENT_PROCESSOR_SWITCH_CACHE_TIMEOUT=60)
+class ProcessorSwitchStateTests(TestCase):
+    def setUp(self):
+        super(ProcessorSwitchStateTests, self).setUp()
+        invalidate_processor_switch_states()
+        self.addCleanup(invalidate_processor_switch_states)
+
+    def test_is_enabled(self):
+        """ Verify the state of all processor switches is read with a single query, and kept in memory. """
+        toggle_switch(settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + DummyProcessor.NAME, True)
+        toggle_switch(settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + AnotherDummyProcessor.NAME, False)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(DummyProcessor.is_enabled())
+            self.assertFalse(AnotherDummyProcessor.is_enabled())
+            self.assertTrue(DummyProcessor.is_enabled())
+
+    def test_switch_saved(self):
+        """ Verify the snapshot is invalidated when a processor switch is saved. """
+        switch_name = settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + DummyProcessor.NAME
+        toggle_switch(switch_name, True)
+        self.assertTrue(get_processor_switch_states()[switch_name])
+
+        toggle_switch(switch_name, False)
+        self.assertFalse(get_processor_switch_states()[switch_name])
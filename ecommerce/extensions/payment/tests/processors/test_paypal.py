@@ -5,11 +5,13 @@ from __future__ import unicode_literals
 import json
 from urlparse import urljoin
 
+import datetime
 import logging
 
 import ddt
 import mock
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test import RequestFactory
 import httpretty
@@ -22,7 +24,7 @@ from testfixtures import LogCapture
 from ecommerce.core.tests import toggle_switch
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.extensions.payment.models import PaypalWebProfile
-from ecommerce.extensions.payment.processors.paypal import Paypal
+from ecommerce.extensions.payment.processors.paypal import get_web_profile_id, Paypal, PaypalApi
 from ecommerce.extensions.payment.tests.mixins import PaypalMixin
 from ecommerce.extensions.payment.tests.processors.mixins import PaymentProcessorTestCaseMixin
 from ecommerce.tests.testcases import TestCase
@@ -66,6 +68,9 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         """
         super(PaypalTests, self).setUp()
 
+        # The ID of the enabled web profile is cached, and database rollbacks do not invalidate the cache.
+        cache.clear()
+
         # Dummy request from which an HTTP Host header can be extracted during
         # construction of absolute URLs
         self.request = RequestFactory().post('/')
@@ -131,6 +136,42 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         else:
             self.assertNotIn('experience_profile_id', payment_creation_payload)
 
+    def test_web_profile_id_cached(self):
+        """ Verify the ID of the enabled web profile is cached until a web profile is enabled or disabled. """
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_web_profile_id(Paypal.DEFAULT_PROFILE_NAME))
+            self.assertIsNone(get_web_profile_id(Paypal.DEFAULT_PROFILE_NAME))
+
+        profile = PaypalWebProfile.objects.create(name=Paypal.DEFAULT_PROFILE_NAME, id='test-profile-id')
+        with self.assertNumQueries(1):
+            self.assertEqual(get_web_profile_id(Paypal.DEFAULT_PROFILE_NAME), profile.id)
+            self.assertEqual(get_web_profile_id(Paypal.DEFAULT_PROFILE_NAME), profile.id)
+
+        profile.delete()
+        self.assertIsNone(get_web_profile_id(Paypal.DEFAULT_PROFILE_NAME))
+
+    def test_paypal_api_shared(self):
+        """ Verify processor instances share the API client, and its OAuth token, of their PayPal account. """
+        self.assertIs(self.processor_class().paypal_api, self.processor.paypal_api)
+        self.assertIsInstance(self.processor.paypal_api, PaypalApi)
+
+    @httpretty.activate
+    def test_paypal_api_token_reused(self):
+        """ Verify the OAuth token is reused until shortly before it expires. """
+        self.mock_oauth2_response()
+        api = PaypalApi({'mode': 'sandbox', 'client_id': 'client-id', 'client_secret': 'client-secret'})
+
+        token_hash = api.get_token_hash()
+        self.assertIs(api.get_token_hash(), token_hash)
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+
+        expires_in = token_hash['expires_in']
+        api.token_request_at = datetime.datetime.now() - datetime.timedelta(
+            seconds=expires_in - PaypalApi.TOKEN_EXPIRY_MARGIN + 1
+        )
+        api.get_token_hash()
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 2)
+
     @httpretty.activate
     @mock.patch.object(Paypal, '_get_error', mock.Mock(return_value=ERROR))
     def test_unexpected_payment_creation_state(self):
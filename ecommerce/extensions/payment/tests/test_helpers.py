@@ -1,4 +1,5 @@
 import ddt
+import mock
 from django.test import override_settings
 
 from ecommerce.extensions.payment import helpers
@@ -22,6 +23,16 @@ class HelperTests(TestCase):
         """ Verify the function returns the first processor class defined in settings. """
         self.assertIs(helpers.get_default_processor_class(), DummyProcessor)
 
+    def test_get_processor_registry(self):
+        """ Verify the function returns the processor classes keyed by name, in order, importing them only once. """
+        registry = helpers.get_processor_registry()
+        self.assertEqual(registry.items(), [(DummyProcessor.NAME, DummyProcessor),
+                                            (AnotherDummyProcessor.NAME, AnotherDummyProcessor)])
+
+        with mock.patch.object(helpers, 'get_processor_class') as mock_get_processor_class:
+            self.assertIs(helpers.get_processor_registry(), registry)
+            self.assertFalse(mock_get_processor_class.called)
+
     @ddt.data(DummyProcessor, AnotherDummyProcessor)
     def test_get_processor_class_by_name(self, processor):
         """ Verify the function returns the appropriate processor class or raises an exception, if not found. """
@@ -0,0 +1,108 @@
+from django.test import override_settings
+import mock
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ReadTimeout, RequestException
+from requests.packages.urllib3.connectionpool import HTTPConnectionPool
+from requests.packages.urllib3.exceptions import ReadTimeoutError
+
+from ecommerce.core.metrics import HistogramMetricsSink
+from ecommerce.core.tests.patched_httpretty import httpretty
+from ecommerce.extensions.payment import sessions
+from ecommerce.extensions.payment.sessions import (get_http_options, get_http_session, get_http_session_stats,
+                                                   IdempotentRetry, IDEMPOTENT_METHODS)
+from ecommerce.tests.testcases import TestCase
+
+API_URL = 'https://example.com/api/'
+HTTP_OPTIONS = {
+    'default': {
+        'pool_size': 3,
+        'connect_timeout': 1,
+        'read_timeout': 2,
+        'max_retries': 4,
+        'backoff_factor': 0.1,
+    },
+    'paypal': {
+        'read_timeout': 10,
+    },
+}
+
+
+@override_settings(PAYMENT_PROCESSOR_HTTP_OPTIONS=HTTP_OPTIONS)
+class HttpSessionTests(TestCase):
+    def setUp(self):
+        super(HttpSessionTests, self).setUp()
+        sessions._sessions.clear()  # pylint: disable=protected-access
+        self.addCleanup(sessions._sessions.clear)  # pylint: disable=protected-access
+
+    def test_get_http_options(self):
+        """ Verify processor-specific options override the defaults. """
+        self.assertEqual(get_http_options('cybersource'), HTTP_OPTIONS['default'])
+
+        expected = dict(HTTP_OPTIONS['default'], read_timeout=10)
+        self.assertEqual(get_http_options('paypal'), expected)
+
+    def test_get_http_session(self):
+        """ Verify a single session is created for each processor, configured with the processor's options. """
+        session = get_http_session('paypal')
+        self.assertIs(get_http_session('paypal'), session)
+        self.assertIsNot(get_http_session('cybersource'), session)
+
+        adapter = session.get_adapter(API_URL)
+        self.assertEqual(adapter.name, 'paypal')
+        self.assertEqual(adapter.timeout, (1, 10))
+        self.assertIsInstance(adapter.max_retries, IdempotentRetry)
+        self.assertEqual(adapter.max_retries.total, 4)
+        self.assertEqual(adapter.max_retries.method_whitelist, IDEMPOTENT_METHODS)
+        self.assertEqual(adapter.poolmanager.connection_pool_kw['maxsize'], 3)
+
+    def test_default_timeout(self):
+        """ Verify the configured timeout is applied only to requests made without one. """
+        adapter = get_http_session('paypal').get_adapter(API_URL)
+        request = requests.Request('GET', API_URL).prepare()
+
+        with mock.patch.object(HTTPAdapter, 'send') as mock_send:
+            adapter.send(request)
+            self.assertEqual(mock_send.call_args[1]['timeout'], (1, 10))
+
+            adapter.send(request, timeout=7)
+            self.assertEqual(mock_send.call_args[1]['timeout'], 7)
+
+    @httpretty.activate
+    def test_pool_stats(self):
+        """ Verify connection pool hits and misses are reported to the metrics sink. """
+        httpretty.register_uri(httpretty.GET, API_URL, body='{}', content_type='application/json')
+        sink = HistogramMetricsSink()
+        session = get_http_session('paypal')
+
+        with mock.patch('ecommerce.extensions.payment.sessions.get_metrics_sink', return_value=sink):
+            for __ in range(3):
+                session.get(API_URL)
+
+        expected = {'hits': 2, 'misses': 1}
+        self.assertEqual(get_http_session_stats(), {'paypal': expected})
+
+        gauges = sink.snapshot()['gauges']
+        self.assertEqual(gauges['payment.http.paypal.pool_hits'], expected['hits'])
+        self.assertEqual(gauges['payment.http.paypal.pool_misses'], expected['misses'])
+
+    def assert_read_timeout_attempts(self, method, attempts, expected_exception):
+        """ Verify a request whose response times out is sent the given number of times. """
+        session = get_http_session('paypal')
+        error = ReadTimeoutError(None, API_URL, 'Read timed out.')
+
+        with mock.patch.object(HTTPConnectionPool, '_make_request', side_effect=error) as mock_make_request:
+            with mock.patch('time.sleep'):
+                with self.assertRaises(expected_exception):
+                    session.request(method, API_URL)
+
+        self.assertEqual(mock_make_request.call_count, attempts)
+
+    def test_read_timeout_not_retried(self):
+        """ Verify requests that are not idempotent are not sent again if their response times out. """
+        self.assert_read_timeout_attempts('POST', 1, ReadTimeout)
+
+    def test_read_timeout_retried(self):
+        """ Verify idempotent requests are retried if their response times out. """
+        # Once retries are exhausted, requests reports the timeout as a connection error.
+        self.assert_read_timeout_attempts('GET', HTTP_OPTIONS['default']['max_retries'] + 1, RequestException)
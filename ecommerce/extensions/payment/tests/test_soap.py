@@ -0,0 +1,35 @@
+import tempfile
+
+import httpretty
+from django.conf import settings
+from django.test import override_settings
+
+from ecommerce.extensions.payment import soap
+from ecommerce.extensions.payment.soap import get_soap_client
+from ecommerce.extensions.payment.tests.mixins import CybersourceMixin
+from ecommerce.tests.testcases import TestCase
+
+
+@override_settings(SOAP_WSDL_CACHE_DIR=tempfile.mkdtemp())
+class GetSoapClientTests(CybersourceMixin, TestCase):
+    """ Tests for get_soap_client. """
+    wsdl_url = settings.PAYMENT_PROCESSOR_CONFIG['edx']['cybersource']['soap_api_url']
+
+    def setUp(self):
+        super(GetSoapClientTests, self).setUp()
+        soap._clients.clear()  # pylint: disable=protected-access
+
+    @httpretty.activate
+    def test_client_cached(self):
+        """ Verify the WSDL is parsed once per key, and clones of the cached client are returned. """
+        self.mock_cybersource_wsdl()
+
+        client = get_soap_client(self.wsdl_url, 'merchant')
+        other = get_soap_client(self.wsdl_url, 'merchant')
+
+        self.assertIsNot(client, other)
+        self.assertIs(client.wsdl, other.wsdl)
+        self.assertIsNot(client.options, other.options)
+        self.assertIs(client.options.transport.session, other.options.transport.session)
+
+        self.assertIsNot(get_soap_client(self.wsdl_url, 'other-merchant').wsdl, client.wsdl)
@@ -1,4 +1,5 @@
 import uuid
+from copy import deepcopy
 
 from suds.transport import Request
 
@@ -42,3 +43,8 @@ class RequestsTransportTests(TestCase):
             'content-type': CONTENT_TYPE
         })
         self.assertEqual(response.message, body)
+
+    def test_deepcopy(self):
+        """ Verify copies of the transport share its session. """
+        transport = RequestsTransport()
+        self.assertIs(deepcopy(transport).session, transport.session)
@@ -1,6 +1,7 @@
 """ Tests of the Payment Views. """
 import ddt
 from django.core.urlresolvers import reverse
+from django.http import HttpResponse
 from django.test.client import RequestFactory
 from factory.django import mute_signals
 import mock
@@ -11,11 +12,14 @@ from oscar.test import factories
 from oscar.test.contextmanagers import mock_signal_receiver
 from testfixtures import LogCapture
 
+from ecommerce.core.exceptions import ExecutorUnavailableError
+from ecommerce.core.tests import toggle_switch
 from ecommerce.extensions.fulfillment.status import ORDER
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
 from ecommerce.extensions.payment.processors.paypal import Paypal
 from ecommerce.extensions.payment.tests.mixins import PaymentEventsMixin, CybersourceMixin, PaypalMixin
-from ecommerce.extensions.payment.views import CybersourceNotifyView, PaypalPaymentExecutionView
+from ecommerce.extensions.payment.views import (CybersourceNotifyView, FAST_ACK_NOTIFICATIONS_SWITCH,
+                                                PaypalPaymentExecutionView, process_stored_notification)
 from ecommerce.core.tests.patched_httpretty import httpretty
 from ecommerce.tests.testcases import TestCase
 
@@ -291,6 +295,179 @@ class CybersourceNotifyViewTests(CybersourceMixin, PaymentEventsMixin, TestCase)
         self.assert_processor_response_recorded(self.processor_name, notification[u'transaction_id'], notification,
                                                 basket=self.basket)
 
+    def _post_fast_ack_notification(self, notification, submit=None):
+        """ Post the notification, with fast acknowledgement enabled, and return the response and mock executor. """
+        toggle_switch(FAST_ACK_NOTIFICATIONS_SWITCH, True)
+        executor = mock.Mock()
+        executor.submit.side_effect = submit or (lambda func, *args: func(*args))
+
+        with mock.patch('ecommerce.extensions.payment.views.get_notification_executor', return_value=executor):
+            response = self.client.post(reverse('cybersource_notify'), notification)
+
+        return response, executor
+
+    @mute_signals(post_checkout)
+    def test_fast_ack_accepted(self):
+        """ Verify that, with fast acknowledgement enabled, verified notifications are stored and queued. """
+        notification = self.generate_notification(
+            self.processor.secret_key,
+            self.basket,
+            billing_address=self.billing_address,
+        )
+
+        response, executor = self._post_fast_ack_notification(notification)
+
+        self.assertEqual(response.status_code, 200)
+        ppr = PaymentProcessorResponse.objects.get(transaction_id=notification[u'transaction_id'])
+        self.assertEqual(executor.submit.call_args[0][:2], (process_stored_notification, ppr.id))
+        self.assertFalse(ppr.pending)
+        self.assertTrue(Order.objects.filter(basket=self.basket).exists())
+        self._assert_payment_data_recorded(notification)
+
+    def test_fast_ack_queued(self):
+        """ Verify notifications remain pending until they have been processed. """
+        notification = self.generate_notification(self.processor.secret_key, self.basket)
+
+        response, executor = self._post_fast_ack_notification(notification, submit=mock.Mock())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(executor.submit.called)
+        ppr = PaymentProcessorResponse.objects.get(transaction_id=notification[u'transaction_id'])
+        self.assertTrue(ppr.pending)
+
+    def test_fast_ack_resent_before_processing(self):
+        """ Verify notifications resent before an earlier copy has been processed are not stored or queued. """
+        notification = self.generate_notification(self.processor.secret_key, self.basket)
+        self.processor.record_processor_response(notification, transaction_id=notification[u'transaction_id'],
+                                                 basket=self.basket, pending=True)
+
+        response, executor = self._post_fast_ack_notification(notification, submit=mock.Mock())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(executor.submit.called)
+        self.assertEqual(
+            PaymentProcessorResponse.objects.filter(transaction_id=notification[u'transaction_id']).count(), 1
+        )
+
+    def test_fast_ack_invalid_copy(self):
+        """ Verify copies with an invalid signature do not keep a notification from being queued. """
+        notification = self.generate_notification(self.processor.secret_key, self.basket)
+        tampered = dict(notification, signature=u'Tampered')
+        self.processor.record_processor_response(tampered, transaction_id=notification[u'transaction_id'],
+                                                 basket=self.basket)
+
+        response, executor = self._post_fast_ack_notification(notification, submit=mock.Mock())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(executor.submit.called)
+
+    def test_fast_ack_duplicate(self):
+        """ Verify duplicate notifications are acknowledged without being stored or queued. """
+        notification = self.generate_notification(self.processor.secret_key, self.basket)
+        self.processor.record_processor_response(notification, transaction_id=notification[u'transaction_id'],
+                                                 basket=self.basket)
+
+        response, executor = self._post_fast_ack_notification(notification)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(executor.submit.called)
+        self.assertEqual(
+            PaymentProcessorResponse.objects.filter(transaction_id=notification[u'transaction_id']).count(), 1
+        )
+
+    def test_fast_ack_invalid_signature(self):
+        """ Verify notifications with an invalid signature are stored, but not queued. """
+        notification = self.generate_notification(self.processor.secret_key, self.basket)
+        notification[u'signature'] = u'Tampered'
+
+        response, executor = self._post_fast_ack_notification(notification)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(executor.submit.called)
+        self.assert_processor_response_recorded(self.processor_name, notification[u'transaction_id'], notification,
+                                                basket=self.basket)
+
+    @mute_signals(post_checkout)
+    def test_fast_ack_executor_unavailable(self):
+        """ Verify notifications are processed before responding if the executor is unavailable. """
+        notification = self.generate_notification(
+            self.processor.secret_key,
+            self.basket,
+            billing_address=self.billing_address,
+        )
+
+        response, __ = self._post_fast_ack_notification(
+            notification, submit=mock.Mock(side_effect=ExecutorUnavailableError)
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Order.objects.filter(basket=self.basket).exists())
+        self._assert_payment_data_recorded(notification)
+
+    def test_process_stored_notification_duplicate(self):
+        """ Verify copies of a notification whose transaction has already been processed are not processed. """
+        notification = self.generate_notification(self.processor.secret_key, self.basket)
+        transaction_id = notification[u'transaction_id']
+        self.processor.record_processor_response(notification, transaction_id=transaction_id, basket=self.basket)
+        ppr = self.processor.record_processor_response(notification, transaction_id=transaction_id,
+                                                       basket=self.basket, pending=True)
+
+        with mock.patch.object(CybersourceNotifyView, 'handle_notification') as mock_handle_notification:
+            process_stored_notification(ppr.id, RequestFactory().post('/'))
+            self.assertFalse(mock_handle_notification.called)
+
+        self.assertFalse(PaymentProcessorResponse.objects.get(id=ppr.id).pending)
+
+    def test_process_stored_notification_earlier_copy(self):
+        """ Verify only the earliest of several pending copies of a notification is processed. """
+        notification = self.generate_notification(self.processor.secret_key, self.basket)
+        transaction_id = notification[u'transaction_id']
+        earlier = self.processor.record_processor_response(notification, transaction_id=transaction_id,
+                                                           basket=self.basket, pending=True)
+        later = self.processor.record_processor_response(notification, transaction_id=transaction_id,
+                                                         basket=self.basket, pending=True)
+
+        with mock.patch.object(CybersourceNotifyView, 'handle_notification',
+                               return_value=HttpResponse()) as mock_handle_notification:
+            process_stored_notification(later.id, RequestFactory().post('/'))
+            self.assertFalse(mock_handle_notification.called)
+
+            process_stored_notification(earlier.id, RequestFactory().post('/'))
+            self.assertEqual(mock_handle_notification.call_count, 1)
+
+        self.assertFalse(PaymentProcessorResponse.objects.filter(transaction_id=transaction_id, pending=True).exists())
+
+    def test_process_stored_notification_payment_recorded(self):
+        """ Verify notifications are not processed again once the payment for their transaction has been recorded. """
+        notification = self.generate_notification(self.processor.secret_key, self.basket)
+        transaction_id = notification[u'transaction_id']
+        ppr = self.processor.record_processor_response(notification, transaction_id=transaction_id,
+                                                       basket=self.basket, pending=True)
+        order = factories.create_order(basket=self.basket, user=self.user)
+        PaymentEvent.objects.create(event_type=PaymentEventType.objects.get_or_create(name='paid')[0], order=order,
+                                    amount=order.total_incl_tax, reference=transaction_id,
+                                    processor_name=self.processor_name)
+
+        with mock.patch.object(CybersourceNotifyView, 'handle_notification') as mock_handle_notification:
+            process_stored_notification(ppr.id, RequestFactory().post('/'))
+            self.assertFalse(mock_handle_notification.called)
+
+        self.assertFalse(PaymentProcessorResponse.objects.get(id=ppr.id).pending)
+
+    @ddt.data((200, False), (400, False), (500, True))
+    @ddt.unpack
+    def test_process_stored_notification_failure(self, status_code, pending):
+        """ Verify notifications remain pending only if processing them failed in a way that may be retried. """
+        notification = self.generate_notification(self.processor.secret_key, self.basket)
+        ppr = self.processor.record_processor_response(notification, transaction_id=notification[u'transaction_id'],
+                                                       basket=self.basket, pending=True)
+
+        with mock.patch.object(CybersourceNotifyView, 'handle_notification',
+                               return_value=HttpResponse(status=status_code)):
+            process_stored_notification(ppr.id, RequestFactory().post('/'))
+
+        self.assertEqual(PaymentProcessorResponse.objects.get(id=ppr.id).pending, pending)
+
 
 @ddt.ddt
 class PaypalPaymentExecutionViewTests(PaypalMixin, PaymentEventsMixin, TestCase):
@@ -12,17 +12,31 @@ class RequestsTransport(HttpAuthenticated):
     This class uses requests, instead of urllib2, to make HTTP requests. This allows us to properly
     verify SSL certificates. This has been adapted from
     http://stackoverflow.com/questions/6277027/suds-over-https-with-cert.
+
+    Requests are made through a session, so that connections are kept alive and reused by subsequent requests.
+    A shared session (e.g. one returned by get_http_session) may be supplied; otherwise, a new session is created.
     """
+    def __init__(self, session=None, **kwargs):
+        HttpAuthenticated.__init__(self, **kwargs)
+        self.session = session or requests.Session()
+
+    def __deepcopy__(self, memo=None):
+        # suds copies the transport whenever a client is cloned. Share the session, and its connection pool, with
+        # the copy.
+        clone = HttpAuthenticated.__deepcopy__(self, memo or {})
+        clone.session = self.session
+        return clone
+
     def open(self, request):
         """ Fetch the WSDL using requests. """
         self.addcredentials(request)
-        resp = requests.get(request.url, data=request.message, headers=request.headers)
+        resp = self.session.get(request.url, data=request.message, headers=request.headers)
         result = io.StringIO(resp.content.decode('utf-8'))
         return result
 
     def send(self, request):
         """ POST to the service using requests. """
         self.addcredentials(request)
-        resp = requests.post(request.url, data=request.message, headers=request.headers)
+        resp = self.session.post(request.url, data=request.message, headers=request.headers)
         result = Reply(resp.status_code, resp.headers, resp.content)
         return result
@@ -6,6 +6,7 @@ import os
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
 from django.core.management import call_command
 from django.db import transaction
+from django.db.models import Q
 from django.http import Http404, HttpResponse, HttpResponseBadRequest
 from django.shortcuts import redirect
 from django.utils.decorators import method_decorator
@@ -14,9 +15,13 @@ from django.views.generic import View
 from oscar.apps.partner import strategy
 from oscar.apps.payment.exceptions import PaymentError, UserCancelled, TransactionDeclined
 from oscar.core.loading import get_class, get_model
+from threadlocals.threadlocals import set_thread_variable
+import waffle
 
+from ecommerce.core.exceptions import ExecutorUnavailableError
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.payment.exceptions import InvalidSignatureError
+from ecommerce.extensions.payment.executor import get_notification_executor
 from ecommerce.extensions.payment.processors.cybersource import Cybersource
 from ecommerce.extensions.payment.processors.paypal import Paypal
 
@@ -30,8 +35,13 @@ Country = get_model('address', 'Country')
 NoShippingRequired = get_class('shipping.methods', 'NoShippingRequired')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 OrderTotalCalculator = get_class('checkout.calculators', 'OrderTotalCalculator')
+PaymentEvent = get_model('order', 'PaymentEvent')
 PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
 
+# When active, CyberSource merchant notifications are acknowledged as soon as they have been verified and stored,
+# and processed on the notification executor.
+FAST_ACK_NOTIFICATIONS_SWITCH = 'fast_ack_cybersource_notifications'
+
 
 class CybersourceNotifyView(EdxOrderPlacementMixin, View):
     """ Validates a response from CyberSource and processes the associated basket/order appropriately. """
@@ -80,11 +90,77 @@ class CybersourceNotifyView(EdxOrderPlacementMixin, View):
 
     def post(self, request):
         """Process a CyberSource merchant notification and place an order for paid products as appropriate."""
+        cybersource_response = request.POST.dict()
+
+        if waffle.switch_is_active(FAST_ACK_NOTIFICATIONS_SWITCH):
+            return self.acknowledge_notification(cybersource_response)
+
+        return self.handle_notification(cybersource_response)
+
+    def acknowledge_notification(self, cybersource_response):
+        """
+        Verify and store a CyberSource merchant notification, and queue it to be processed after responding.
+
+        CyberSource resends notifications that are not acknowledged promptly. Notifications for transactions
+        that have already been recorded, whether or not they have been processed, are therefore acknowledged
+        without being stored or processed again. The stored notification remains pending until it has been
+        processed, so that notifications lost before being processed (e.g. if the process exits) are processed by
+        the process_pending_notifications command. If the queue is full, the notification is processed before
+        responding.
+        """
+        transaction_id = cybersource_response.get('transaction_id')
+        signature_valid = self.payment_processor.is_signature_valid(cybersource_response)
+
+        copies = PaymentProcessorResponse.objects.filter(
+            processor_name=Cybersource.NAME, transaction_id=transaction_id
+        )
+        if signature_valid and transaction_id and is_recorded_notification(copies):
+            logger.info('Received duplicate CyberSource merchant notification for transaction [%s].', transaction_id)
+            return HttpResponse()
+
+        try:
+            basket_id = OrderNumberGenerator().basket_id(cybersource_response.get('req_reference_number'))
+            basket = Basket.objects.filter(id=basket_id).first()
+        except (TypeError, ValueError):
+            basket = None
+
+        # Store the response in the database regardless of its authenticity.
+        ppr = self.payment_processor.record_processor_response(cybersource_response, transaction_id=transaction_id,
+                                                               basket=basket, pending=signature_valid)
+
+        if not signature_valid:
+            logger.error(
+                'Received an invalid CyberSource response. The payment response was recorded in entry [%d].', ppr.id
+            )
+            return HttpResponse(status=400)
+
+        try:
+            get_notification_executor().submit(process_stored_notification, ppr.id, self.request)
+        except ExecutorUnavailableError:
+            logger.warning('CyberSource notification executor is unavailable. Processing entry [%d] synchronously.',
+                           ppr.id)
+            response = self.handle_notification(cybersource_response, ppr=ppr)
+            mark_notification_processed(ppr, response)
+            return response
 
+        return HttpResponse()
+
+    def handle_notification(self, cybersource_response, ppr=None):
+        """
+        Handle a CyberSource merchant notification, placing an order for paid products as appropriate.
+
+        Arguments:
+            cybersource_response (dict): Parameters of the notification.
+
+        Keyword Arguments:
+            ppr (PaymentProcessorResponse): Entry in which the notification has already been recorded, if any.
+
+        Returns:
+            HttpResponse
+        """
         # Note (CCB): Orders should not be created until the payment processor has validated the response's signature.
         # This validation is performed in the handle_payment method. After that method succeeds, the response can be
         # safely assumed to have originated from CyberSource.
-        cybersource_response = request.POST.dict()
         basket = None
         transaction_id = None
 
@@ -105,9 +181,10 @@ class CybersourceNotifyView(EdxOrderPlacementMixin, View):
                 logger.error('Received payment for non-existent basket [%s].', basket_id)
                 return HttpResponse(status=400)
         finally:
-            # Store the response in the database regardless of its authenticity.
-            ppr = self.payment_processor.record_processor_response(cybersource_response, transaction_id=transaction_id,
-                                                                   basket=basket)
+            if ppr is None:
+                # Store the response in the database regardless of its authenticity.
+                ppr = self.payment_processor.record_processor_response(cybersource_response,
+                                                                       transaction_id=transaction_id, basket=basket)
 
         try:
             # Explicitly delimit operations which will be rolled back if an exception occurs.
@@ -163,7 +240,7 @@ class CybersourceNotifyView(EdxOrderPlacementMixin, View):
                 shipping_charge,
                 billing_address,
                 order_total,
-                request=request
+                request=self.request
             )
 
             return HttpResponse()
@@ -172,6 +249,80 @@ class CybersourceNotifyView(EdxOrderPlacementMixin, View):
             return HttpResponse(status=500)
 
 
+def is_recorded_notification(queryset):
+    """
+    Returns True if any of the given PaymentProcessorResponses holds a CyberSource notification with a valid
+    signature.
+
+    Notifications with an invalid signature are recorded as well, and must not keep the genuine notification for
+    the same transaction from being processed.
+    """
+    processor = Cybersource()
+    return any(processor.is_signature_valid(response) for response in queryset.values_list('response', flat=True))
+
+
+def mark_notification_processed(ppr, response):
+    """
+    Mark a pending notification as processed, unless processing failed in a way that may succeed if retried.
+
+    Arguments:
+        ppr (PaymentProcessorResponse): Entry in which the notification was recorded.
+        response (HttpResponse): Response returned by CybersourceNotifyView.handle_notification.
+    """
+    if response.status_code >= 500:
+        logger.warning('Processing of the CyberSource notification recorded in entry [%d] failed. '
+                       'It will be retried by the process_pending_notifications command.', ppr.id)
+        return
+
+    PaymentProcessorResponse.objects.filter(id=ppr.id).update(pending=False)
+
+
+def process_stored_notification(ppr_id, request):
+    """
+    Process a CyberSource merchant notification acknowledged by CybersourceNotifyView. Runs on an executor thread,
+    or in the process_pending_notifications command.
+
+    Notifications that are no longer pending are not processed again. Nor are copies of a notification if an
+    earlier copy was recorded, or a later copy was processed, since that copy is, or was, processed instead.
+    Notifications retried after their payment was recorded (e.g. if processing failed after the order was placed)
+    are not processed again either.
+
+    Arguments:
+        ppr_id (int): ID of the PaymentProcessorResponse in which the notification was recorded.
+        request (HttpRequest): Request in which the notification was received.
+    """
+    # The payment processor, and post-checkout receivers, rely on the current request (e.g. to determine the site).
+    set_thread_variable('request', request)
+
+    try:
+        ppr = PaymentProcessorResponse.objects.get(id=ppr_id)
+
+        if not ppr.pending:
+            logger.info('Entry [%d] has already been processed.', ppr.id)
+            return
+
+        copies = PaymentProcessorResponse.objects.filter(
+            processor_name=ppr.processor_name, transaction_id=ppr.transaction_id
+        ).exclude(id=ppr.id).filter(Q(id__lt=ppr.id) | Q(pending=False))
+        if is_recorded_notification(copies):
+            logger.info('Transaction [%s], recorded in entry [%d], is processed from another entry.',
+                        ppr.transaction_id, ppr.id)
+            PaymentProcessorResponse.objects.filter(id=ppr.id).update(pending=False)
+            return
+
+        if PaymentEvent.objects.filter(processor_name=ppr.processor_name, reference=ppr.transaction_id).exists():
+            logger.info('Payment for transaction [%s], recorded in entry [%d], has already been recorded.',
+                        ppr.transaction_id, ppr.id)
+            PaymentProcessorResponse.objects.filter(id=ppr.id).update(pending=False)
+            return
+
+        view = CybersourceNotifyView()
+        view.request = request  # pylint: disable=attribute-defined-outside-init
+        mark_notification_processed(ppr, view.handle_notification(ppr.response, ppr=ppr))
+    finally:
+        set_thread_variable('request', None)
+
+
 class PaypalPaymentExecutionView(EdxOrderPlacementMixin, View):
     """Execute an approved PayPal payment and place an order for paid products as appropriate."""
     @property
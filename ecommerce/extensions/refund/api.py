@@ -1,11 +1,27 @@
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection
 from oscar.core.loading import get_model
+from threadlocals.threadlocals import get_current_request, set_thread_variable
 
+from ecommerce.core.executor import iter_concurrently
 from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.payment.helpers import get_processor_class_by_name
 
+logger = logging.getLogger(__name__)
 
+Line = get_model('order', 'Line')
 Refund = get_model('refund', 'Refund')
 RefundLine = get_model('refund', 'RefundLine')
 
+APPROVE = 'approve'
+APPROVE_PAYMENT_ONLY = 'approve_payment_only'
+DENY = 'deny'
+REFUND_ACTIONS = (APPROVE, APPROVE_PAYMENT_ONLY, DENY)
+
 
 def find_orders_associated_with_course(user, course_id):
     """
@@ -61,3 +77,171 @@ def create_refunds(orders, course_id):
             refunds.append(refund)
 
     return refunds
+
+
+def find_lines_to_refund_for_course(course_id, usernames=None):
+    """
+    Returns a queryset of the unrefunded lines, of completed orders, associated with the given course.
+
+    Arguments:
+        course_id (str): Identifier of the course associated with the order line(s)
+        usernames (list): If provided, only lines of orders placed by these users are returned.
+
+    Raises:
+        ValueError if course_id is invalid.
+
+    Returns:
+        QuerySet: order lines, ordered by order
+    """
+    if not course_id or not course_id.strip():
+        raise ValueError('"{}" is not a valid course ID.'.format(course_id))
+
+    # Both attribute value conditions must be in the same filter() call so that they apply to a single join.
+    lines = Line.objects.filter(
+        order__status=ORDER.COMPLETE,
+        refund_lines__id__isnull=True,
+        product__attribute_values__attribute__code='course_key',
+        product__attribute_values__value_text=course_id
+    )
+
+    if usernames is not None:
+        lines = lines.filter(order__user__username__in=usernames)
+
+    return lines.select_related('order__user').order_by('order_id', 'id')
+
+
+def create_refunds_for_course(course_id, usernames=None, approve=False, revoke_fulfillment=True):
+    """
+    Creates refunds for all unrefunded lines, of completed orders, associated with the given course.
+
+    Refunds are created in bulk. Refunds corresponding to a total credit of $0 are always approved; other
+    refunds are approved only if requested.
+
+    Arguments:
+        course_id (str): Identifier of the course associated with the order line(s)
+        usernames (list): If provided, only orders placed by these users are refunded.
+        approve (bool): Whether to approve the created refunds.
+        revoke_fulfillment (bool): Whether approval should revoke fulfillment of the refunded lines.
+
+    Raises:
+        ValueError if course_id is invalid.
+
+    Returns:
+        list: refunds created
+    """
+    lines_by_order = OrderedDict()
+    for line in find_lines_to_refund_for_course(course_id, usernames):
+        lines_by_order.setdefault(line.order, []).append(line)
+
+    refunds = Refund.bulk_create_with_lines(lines_by_order)
+
+    if approve:
+        approve_refunds(refunds, revoke_fulfillment=revoke_fulfillment)
+    else:
+        approve_refunds([refund for refund in refunds if refund.total_credit_excl_tax == 0])
+
+    return refunds
+
+
+def get_refund_processor_name(refund):
+    """ Returns the name of the payment processor that will issue the credit for the given refund, if any. """
+    # TODO Update this if we ever support multiple payment sources for a single order.
+    # NOTE: all() is used, rather than first(), so that sources prefetched with the refunds are used.
+    sources = list(refund.order.sources.all())
+    return sources[0].source_type.name if sources else None
+
+
+def process_refunds(refunds, action, request=None):
+    """
+    Approves or denies the given refunds, yielding the result for each refund as soon as it has been processed.
+
+    Refunds are processed on up to REFUND_APPROVAL_WORKERS threads, grouped by the payment processor that will
+    issue their credits. A single instance of each processor, created on the calling thread, issues the credits of
+    its group, so that the processor's configuration and API client are shared by the threads. Each refund is
+    processed in its own thread's database connection, so the refunds must have been committed. Issuing credits
+    and revoking fulfillment require the current site, so the given request is made the current request of each
+    thread while it processes a refund.
+
+    Arguments:
+        refunds (list): refunds to process
+        action (str): One of APPROVE, APPROVE_PAYMENT_ONLY, or DENY.
+        request (HttpRequest): Request whose site the refunds belong to. Defaults to the current request.
+
+    Raises:
+        ValueError if action is invalid.
+
+    Returns:
+        iterator: Each refund, and a boolean indicating whether it was processed successfully
+    """
+    if action not in REFUND_ACTIONS:
+        raise ValueError('The action [{}] is not valid.'.format(action))
+
+    request = request or get_current_request()
+    calling_thread = threading.current_thread()
+
+    processor_names = {}
+    refunds_by_processor = OrderedDict()
+    for refund in refunds:
+        processor_names[refund.id] = get_refund_processor_name(refund)
+        refunds_by_processor.setdefault(processor_names[refund.id], []).append(refund)
+
+    processors = {}
+    if action != DENY:
+        for processor_name in refunds_by_processor:
+            if processor_name is not None:
+                processors[processor_name] = _get_processor(processor_name, request)
+
+    def process(refund):
+        previous_request = get_current_request()
+        set_thread_variable('request', request)
+
+        try:
+            if action == DENY:
+                return refund.deny()
+            return refund.approve(
+                revoke_fulfillment=action == APPROVE, processor=processors.get(processor_names[refund.id])
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Failed to process Refund [%d].', refund.id)
+            return False
+        finally:
+            set_thread_variable('request', previous_request)
+            if threading.current_thread() is not calling_thread:
+                connection.close()
+
+    grouped_refunds = [refund for processor_refunds in refunds_by_processor.values() for refund in processor_refunds]
+    return iter_concurrently(process, grouped_refunds, settings.REFUND_APPROVAL_WORKERS)
+
+
+def _get_processor(processor_name, request):
+    """ Returns an instance of the named payment processor, configured for the site of the given request.
+
+    If the processor cannot be created, None is returned, so that each refund creates its own instance, and fails
+    individually.
+    """
+    previous_request = get_current_request()
+    set_thread_variable('request', request)
+
+    try:
+        return get_processor_class_by_name(processor_name)()
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('Failed to create payment processor [%s] to issue refund credits.', processor_name)
+        return None
+    finally:
+        set_thread_variable('request', previous_request)
+
+
+def approve_refunds(refunds, revoke_fulfillment=True):
+    """
+    Approves the given refunds, as described by process_refunds.
+
+    Arguments:
+        refunds (list): refunds to approve
+        revoke_fulfillment (bool): Whether to revoke fulfillment of the refunded lines.
+
+    Returns:
+        list: booleans indicating, for each refund, whether it was approved
+    """
+    action = APPROVE if revoke_fulfillment else APPROVE_PAYMENT_ONLY
+    results = {refund.id: result for refund, result in process_refunds(refunds, action)}
+    return [results[refund.id] for refund in refunds]
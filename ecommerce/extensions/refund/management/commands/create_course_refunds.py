@@ -0,0 +1,94 @@
+"""
+Management command that creates refunds for all learners of a course (e.g. when the course has been cancelled).
+"""
+from __future__ import unicode_literals
+
+from django.contrib.sites.models import Site
+from django.core.management import BaseCommand, CommandError
+from oscar.test.utils import RequestFactory
+from threadlocals.threadlocals import set_thread_variable
+
+from ecommerce.extensions.refund.api import create_refunds_for_course, find_lines_to_refund_for_course
+
+
+class Command(BaseCommand):
+    help = 'Create refunds for all unrefunded, completed orders associated with a course.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-c', '--course-id',
+                            action='store',
+                            dest='course_id',
+                            default=None,
+                            help='ID of the course whose orders should be refunded.')
+        parser.add_argument('-s', '--site',
+                            action='store',
+                            dest='site',
+                            default=None,
+                            help='Domain of the site whose payment processor configuration is used to issue '
+                                 'credits. Required to create the refunds.')
+        parser.add_argument('-u', '--usernames',
+                            action='store',
+                            dest='usernames',
+                            nargs='+',
+                            default=None,
+                            help='If provided, only orders placed by these users are refunded.')
+        parser.add_argument('--approve',
+                            action='store_true',
+                            dest='approve',
+                            default=False,
+                            help='Approve the refunds, issuing credits and revoking fulfillment.')
+        parser.add_argument('--skip-revocation',
+                            action='store_false',
+                            dest='revoke_fulfillment',
+                            default=True,
+                            help='When approving the refunds, do not revoke fulfillment.')
+        parser.add_argument('--commit',
+                            action='store_true',
+                            dest='commit',
+                            default=False,
+                            help='Actually create the refunds.')
+
+    def handle(self, *args, **options):
+        course_id = options['course_id']
+        usernames = options['usernames']
+
+        try:
+            lines = find_lines_to_refund_for_course(course_id, usernames)
+        except ValueError as e:
+            raise CommandError(e.message)
+
+        if options['commit']:
+            # Approving refunds requires the current site (e.g. to determine the payment processor configuration),
+            # so a request for the site is installed as the current request, as it would be for the API.
+            set_thread_variable('request', self._create_request(options['site']))
+            try:
+                refunds = create_refunds_for_course(
+                    course_id,
+                    usernames=usernames,
+                    approve=options['approve'],
+                    revoke_fulfillment=options['revoke_fulfillment']
+                )
+            finally:
+                set_thread_variable('request', None)
+
+            self.stderr.write('Created [{count}] refunds for course [{course_id}].'.format(
+                count=len(refunds), course_id=course_id))
+        else:
+            msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
+                  'would have refunded [{lines}] lines of [{orders}] orders.'.format(
+                      lines=lines.count(), orders=lines.order_by().values('order_id').distinct().count())
+            self.stderr.write(msg)
+
+    def _create_request(self, domain):
+        """ Returns a request for the site with the given domain, for use as the current request. """
+        if not domain:
+            raise CommandError('A site must be specified, with --site, to create refunds.')
+
+        try:
+            site = Site.objects.get(domain=domain)
+        except Site.DoesNotExist:
+            raise CommandError('Site [{}] does not exist.'.format(domain))
+
+        request = RequestFactory().post('/')
+        request.site = site
+        return request
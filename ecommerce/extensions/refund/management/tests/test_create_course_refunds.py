@@ -0,0 +1,64 @@
+from __future__ import unicode_literals
+from StringIO import StringIO
+
+import ddt
+from django.core.management import call_command, CommandError
+import mock
+from oscar.core.loading import get_model
+from oscar.test.newfactories import UserFactory
+from threadlocals.threadlocals import get_current_request
+
+from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Refund = get_model('refund', 'Refund')
+
+
+@ddt.ddt
+class CreateCourseRefundsCommandTests(RefundTestMixin, TestCase):
+    command = 'create_course_refunds'
+
+    def setUp(self):
+        super(CreateCourseRefundsCommandTests, self).setUp()
+        self.user = UserFactory()
+        self.order = self.create_order(multiple_lines=True)
+        self.other_order = self.create_order(user=UserFactory())
+
+    def test_without_commit(self):
+        """ Verify the command does not create refunds if the commit flag is not set. """
+        out = StringIO()
+        call_command(self.command, course_id=self.course.id, stderr=out)
+
+        self.assertIn('would have refunded [3] lines of [2] orders', out.getvalue())
+        self.assertFalse(Refund.objects.exists())
+
+    def test_with_commit(self):
+        """ Verify the command creates refunds for the given users, and approves them on behalf of the site. """
+        current_sites = []
+
+        def approve(refund, revoke_fulfillment=True, processor=None):  # pylint: disable=unused-argument
+            current_sites.append(get_current_request().site)
+            return True
+
+        with mock.patch.object(Refund, 'approve', autospec=True, side_effect=approve) as mock_approve:
+            call_command(self.command, course_id=self.course.id, usernames=[self.user.username], approve=True,
+                         revoke_fulfillment=False, site=self.site.domain, commit=True, stderr=StringIO())
+
+        refund = Refund.objects.get()
+        self.assert_refund_matches_order(refund, self.order)
+        mock_approve.assert_called_once_with(refund, revoke_fulfillment=False, processor=None)
+        self.assertEqual(current_sites, [self.site])
+        self.assertIsNone(get_current_request())
+
+    @ddt.data(None, 'unknown.example.com')
+    def test_invalid_site(self, site):
+        """ Verify the command fails, without creating refunds, if the site is not specified or does not exist. """
+        with self.assertRaises(CommandError):
+            call_command(self.command, course_id=self.course.id, site=site, commit=True, stderr=StringIO())
+
+        self.assertFalse(Refund.objects.exists())
+
+    def test_invalid_course_id(self):
+        """ Verify the command fails if the course ID is invalid. """
+        with self.assertRaises(CommandError):
+            call_command(self.command, course_id=' ', site=self.site.domain, commit=True, stderr=StringIO())
@@ -1,7 +1,8 @@
 import logging
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from oscar.apps.payment.exceptions import PaymentError
@@ -52,6 +53,58 @@ class StatusMixin(object):
         self.status = new_status
         self.save()
 
+    @classmethod
+    def bulk_set_status(cls, new_statuses):
+        """Set new statuses for several objects, with one update query per status.
+
+        Every transition is validated, as in ``set_status``, before any object is updated. A historical record
+        is created for each updated object, as would be done when saving it.
+
+        Arguments:
+            new_statuses (dict): Objects of this class mapped to their new status.
+
+        Raises:
+            InvalidStatus: If any of the requested transitions is invalid. No object is updated in that case.
+        """
+        ids_by_status = {}
+        for obj, new_status in new_statuses.items():
+            if new_status not in obj.available_statuses():
+                raise InvalidStatus(
+                    " Transition from '{status}' to '{new_status}' is invalid for {model_name} {id}.".format(
+                        new_status=new_status,
+                        model_name=cls.__name__.lower(),
+                        id=obj.id,
+                        status=obj.status
+                    )
+                )
+            ids_by_status.setdefault(new_status, []).append(obj.id)
+
+        modified = now()
+        with transaction.atomic():
+            for new_status, ids in ids_by_status.items():
+                cls.objects.filter(id__in=ids).update(status=new_status, modified=modified)
+
+            for obj, new_status in new_statuses.items():
+                obj.status = new_status
+                obj.modified = modified
+            cls.bulk_create_history(new_statuses.keys(), modified, '~')
+
+    @classmethod
+    def bulk_create_history(cls, objs, history_date, history_type):
+        """Create historical records for objects saved without triggering ``post_save`` (e.g. by a bulk query).
+
+        Arguments:
+            objs (iterable): Objects of this class, in their saved state.
+            history_date (datetime): Date of the change.
+            history_type (str): Type of change: '+' (created), '~' (changed), or '-' (deleted).
+        """
+        history_model = cls.history.model
+        history = []
+        for obj in objs:
+            fields = {field.attname: getattr(obj, field.attname) for field in cls._meta.fields}
+            history.append(history_model(history_date=history_date, history_type=history_type, **fields))
+        history_model.objects.bulk_create(history)
+
     def __str__(self):
         return unicode(self.id)
 
@@ -133,13 +186,91 @@ class Refund(StatusMixin, TimeStampedModel):
 
             return refund
 
+    @classmethod
+    def bulk_create_with_lines(cls, lines_by_order):
+        """Given order lines grouped by order, creates a Refund for each order, with a RefundLine for each line.
+
+        Unlike ``create_with_lines``, the given lines are assumed to be unrefunded, and refunds are created with
+        one insert query for all Refunds and one for all RefundLines. Refunds corresponding to a total credit of
+        $0 are NOT approved; that is left to the caller.
+
+        Arguments:
+            lines_by_order (dict): Unrefunded order lines (list of order.Line) keyed by their order.Order.
+
+        Returns:
+            list: Refunds created, ordered by ID.
+        """
+        if not lines_by_order:
+            return []
+
+        created = now()
+        refund_status = getattr(settings, 'OSCAR_INITIAL_REFUND_STATUS', REFUND.OPEN)
+        refund_line_status = getattr(settings, 'OSCAR_INITIAL_REFUND_LINE_STATUS', REFUND_LINE.OPEN)
+
+        with transaction.atomic():
+            cls.objects.bulk_create([
+                cls(
+                    order=order,
+                    user=order.user,
+                    status=refund_status,
+                    total_credit_excl_tax=sum([line.line_price_excl_tax for line in lines]),
+                    created=created
+                )
+                for order, lines in lines_by_order.items()
+            ])
+
+            # Primary keys are not set by bulk inserts on every database, so the new rows are read back.
+            order_ids = [order.id for order in lines_by_order]
+            refunds = list(
+                cls.objects.filter(order_id__in=order_ids, created=created).select_related('order').order_by('id')
+            )
+            refunds_by_order_id = {refund.order_id: refund for refund in refunds}
+
+            RefundLine.objects.bulk_create([
+                RefundLine(
+                    refund=refunds_by_order_id[order.id],
+                    order_line=line,
+                    line_credit_excl_tax=line.line_price_excl_tax,
+                    quantity=line.quantity,
+                    status=refund_line_status,
+                    created=created
+                )
+                for order, lines in lines_by_order.items()
+                for line in lines
+            ])
+            refund_lines = RefundLine.objects.filter(refund__in=refunds)
+
+            cls.bulk_create_history(refunds, created, '+')
+            RefundLine.bulk_create_history(refund_lines, created, '+')
+
+        for refund in refunds:
+            audit_log(
+                'refund_created',
+                amount=refund.total_credit_excl_tax,
+                currency=refund.currency,
+                order_number=refund.order.number,
+                refund_id=refund.id,
+                user_id=refund.user_id
+            )
+
+        return refunds
+
     @property
     def num_items(self):
-        """Returns the number of items in this refund."""
-        num_items = 0
-        for line in self.lines.all():
-            num_items += line.quantity
-        return num_items
+        """Returns the number of items in this refund.
+
+        Querysets listing many refunds should annotate each refund with the number of items, as
+        ``annotated_num_items`` (e.g. ``annotate(annotated_num_items=Sum('lines__quantity'))``), to avoid
+        counting the items of each refund separately.
+        """
+        if hasattr(self, 'annotated_num_items'):
+            # Refunds without lines are annotated with None.
+            return self.annotated_num_items or 0
+
+        if 'lines' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum([line.quantity for line in self.lines.all()])
+
+        return self.lines.aggregate(num_items=models.Sum('quantity'))['num_items'] or 0
 
     @property
     def can_approve(self):
@@ -151,12 +282,17 @@ class Refund(StatusMixin, TimeStampedModel):
         """Returns a boolean indicating if this Refund can be denied."""
         return self.status == settings.OSCAR_INITIAL_REFUND_STATUS
 
-    def _issue_credit(self):
-        """Issue a credit to the purchaser via the payment processor used for the original order."""
+    def _issue_credit(self, processor=None):
+        """Issue a credit to the purchaser via the payment processor used for the original order.
+
+        Arguments:
+            processor (BasePaymentProcessor): Instance of the order's payment processor, used to issue the credit.
+                If not provided, a new instance is created.
+        """
         try:
             # TODO Update this if we ever support multiple payment sources for a single order.
             source = self.order.sources.first()
-            processor = get_processor_class_by_name(source.source_type.name)()
+            processor = processor or get_processor_class_by_name(source.source_type.name)()
             processor.issue_credit(source, self.total_credit_excl_tax, self.currency)
 
             audit_log(
@@ -180,13 +316,13 @@ class Refund(StatusMixin, TimeStampedModel):
             logger.error('Unable to revoke fulfillment of all lines of Refund [%d].', self.id)
             self.set_status(REFUND.REVOCATION_ERROR)
 
-    def approve(self, revoke_fulfillment=True):
+    def approve(self, revoke_fulfillment=True, processor=None):
         if not self.can_approve:
             logger.debug('Refund [%d] cannot be approved.', self.id)
             return False
         elif self.status in (REFUND.OPEN, REFUND.PAYMENT_REFUND_ERROR):
             try:
-                self._issue_credit()
+                self._issue_credit(processor)
                 self.set_status(REFUND.PAYMENT_REFUNDED)
             except PaymentError:
                 logger.exception('Failed to issue credit for refund [%d].', self.id)
@@ -200,8 +336,7 @@ class Refund(StatusMixin, TimeStampedModel):
             logger.info("Skipping the revocation step for refund [%d].", self.id)
             # Mark the status complete as it does not involve the revocation.
             self.set_status(REFUND.COMPLETE)
-            for refund_line in self.lines.all():
-                refund_line.set_status(REFUND_LINE.COMPLETE)
+            RefundLine.bulk_set_status({refund_line: REFUND_LINE.COMPLETE for refund_line in self.lines.all()})
 
         if self.status == REFUND.COMPLETE:
             post_refund.send_robust(sender=self.__class__, refund=self)
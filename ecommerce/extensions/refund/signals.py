@@ -1,7 +1,8 @@
 from django.dispatch import receiver, Signal
 
 from ecommerce.courses.utils import mode_for_seat
-from ecommerce.extensions.analytics.utils import is_segment_configured, parse_tracking_context, silence_exceptions
+from ecommerce.extensions.analytics.utils import (is_segment_configured, ORDER_LINE_TRACKING_RELATIONS,
+                                                  parse_tracking_context, silence_exceptions)
 
 
 # This signal should be emitted after a refund is completed - payment credited AND fulfillment revoked.
@@ -39,7 +40,9 @@ def track_completed_refund(sender, refund=None, **kwargs):  # pylint: disable=un
                     'price': str(line.line_credit_excl_tax),
                     'quantity': -1 * line.quantity,
                     'category': line.order_line.product.get_product_class().name,
-                } for line in refund.lines.all()
+                } for line in refund.lines.select_related(
+                    *['order_line__{}'.format(relation) for relation in ORDER_LINE_TRACKING_RELATIONS]
+                )
             ],
         },
         context={
@@ -1,11 +1,19 @@
 import ddt
 from django.test import override_settings
+import mock
 from oscar.core.loading import get_model
 from oscar.test.newfactories import UserFactory
+from threadlocals.threadlocals import get_current_request
 
 from ecommerce.extensions.fulfillment.status import ORDER
-from ecommerce.extensions.refund.api import find_orders_associated_with_course, create_refunds
-from ecommerce.extensions.refund.tests.factories import RefundLineFactory
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.payment.processors.paypal import Paypal
+from ecommerce.extensions.payment.tests.processors import DummyProcessor
+from ecommerce.extensions.refund.api import (APPROVE, APPROVE_PAYMENT_ONLY, approve_refunds, create_refunds,
+                                             create_refunds_for_course, DENY, find_lines_to_refund_for_course,
+                                             find_orders_associated_with_course, get_refund_processor_name,
+                                             process_refunds)
+from ecommerce.extensions.refund.tests.factories import RefundFactory, RefundLineFactory
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
 from ecommerce.tests.testcases import TestCase
 
@@ -13,6 +21,7 @@ ProductAttribute = get_model("catalogue", "ProductAttribute")
 ProductClass = get_model("catalogue", "ProductClass")
 Refund = get_model('refund', 'Refund')
 
+DUMMY_PROCESSOR = 'ecommerce.extensions.payment.tests.processors.DummyProcessor'
 OSCAR_INITIAL_REFUND_STATUS = 'REFUND_OPEN'
 OSCAR_INITIAL_REFUND_LINE_STATUS = 'REFUND_LINE_OPEN'
 
@@ -77,3 +86,122 @@ class ApiTests(RefundTestMixin, TestCase):
 
         actual = create_refunds([order], self.course.id)
         self.assertEqual(actual, [])
+
+    def test_find_lines_to_refund_for_course(self):
+        """ The method should return the unrefunded lines of completed orders associated with the course. """
+        other_user = UserFactory()
+        order = self.create_order(multiple_lines=True)
+        other_order = self.create_order(user=other_user)
+        self.create_order(user=other_user, status=ORDER.OPEN)
+        RefundLineFactory(order_line=self.create_order().lines.first())
+
+        actual = find_lines_to_refund_for_course(self.course.id)
+        self.assertEqual(list(actual), list(order.lines.order_by('id')) + list(other_order.lines.all()))
+
+        actual = find_lines_to_refund_for_course(self.course.id, usernames=[other_user.username])
+        self.assertEqual(list(actual), list(other_order.lines.all()))
+
+    @ddt.data('', ' ', None)
+    def test_find_lines_to_refund_for_course_invalid_course_id(self, course_id):
+        """ ValueError should be raised if course_id is invalid. """
+        self.assertRaises(ValueError, find_lines_to_refund_for_course, course_id)
+
+    @ddt.data(False, True)
+    def test_create_refunds_for_course(self, approve):
+        """ The method should create a refund for each eligible order, and approve them only if requested. """
+        orders = [self.create_order(multiple_lines=True), self.create_order(user=UserFactory())]
+
+        with mock.patch.object(Refund, 'approve', autospec=True, return_value=True) as mock_approve:
+            actual = create_refunds_for_course(self.course.id, approve=approve, revoke_fulfillment=False)
+
+        refunds = list(Refund.objects.order_by('id'))
+        self.assertEqual(actual, refunds)
+        for refund, order in zip(refunds, orders):
+            self.assert_refund_matches_order(refund, order)
+
+        expected_calls = [mock.call(refund, revoke_fulfillment=False, processor=None) for refund in refunds] \
+            if approve else []
+        self.assertEqual(mock_approve.call_args_list, expected_calls)
+
+    def test_create_refunds_for_course_free_order(self):
+        """ Refunds corresponding to a total credit of $0 should always be approved. """
+        self.create_order()
+        free_order = self.create_order(user=UserFactory(), free=True)
+
+        with mock.patch.object(Refund, 'approve', autospec=True, return_value=True) as mock_approve:
+            create_refunds_for_course(self.course.id)
+
+        mock_approve.assert_called_once_with(Refund.objects.get(order=free_order), revoke_fulfillment=True,
+                                             processor=None)
+
+    def test_approve_refunds(self):
+        """ The method should approve each refund, and return the result of each approval. """
+        refunds = [self.create_refund(), self.create_refund()]
+
+        with mock.patch.object(Refund, 'approve', autospec=True, side_effect=[True, Exception]):
+            self.assertEqual(approve_refunds(refunds), [True, False])
+
+    @override_settings(REFUND_APPROVAL_WORKERS=2, PAYMENT_PROCESSORS=[DUMMY_PROCESSOR])
+    def test_approve_refunds_concurrently(self):
+        """ Refunds approved on worker threads should be approved with the calling thread's current request, and
+        share an instance of their payment processor. """
+        refunds = [self.create_refund(), self.create_refund()]
+        current_requests = []
+        processors = []
+
+        def approve(refund, revoke_fulfillment=True, processor=None):  # pylint: disable=unused-argument
+            current_requests.append(get_current_request())
+            processors.append(processor)
+            return True
+
+        with mock.patch.object(Refund, 'approve', autospec=True, side_effect=approve):
+            self.assertEqual(approve_refunds(refunds), [True, True])
+
+        self.assertEqual(current_requests, [self.request, self.request])
+        self.assertEqual(get_current_request(), self.request)
+        self.assertIsInstance(processors[0], DummyProcessor)
+        self.assertIs(processors[0], processors[1])
+
+    def test_get_refund_processor_name(self):
+        """ The method should return the name of the processor used to pay for the refunded order, if any. """
+        self.assertEqual(get_refund_processor_name(self.create_refund(processor_name='paypal')), 'paypal')
+        self.assertIsNone(get_refund_processor_name(RefundFactory()))
+
+    @ddt.data(
+        (APPROVE, 'approve', {'revoke_fulfillment': True}),
+        (APPROVE_PAYMENT_ONLY, 'approve', {'revoke_fulfillment': False}),
+        (DENY, 'deny', {}),
+    )
+    @ddt.unpack
+    def test_process_refunds(self, action, method, kwargs):
+        """ The method should process the refunds, grouped by payment processor, and yield the result of each. """
+        refunds = [
+            self.create_refund(processor_name=Cybersource.NAME),
+            self.create_refund(processor_name=Paypal.NAME),
+            self.create_refund(processor_name=Cybersource.NAME),
+        ]
+
+        with mock.patch.object(Refund, method, autospec=True, side_effect=[True, False, True]) as mock_method:
+            actual = list(process_refunds(refunds, action))
+
+        expected_order = [refunds[0], refunds[2], refunds[1]]
+        expected_kwargs = [dict(kwargs) for __ in expected_order]
+        if method == 'approve':
+            # Credits are issued by a single instance of each processor.
+            cybersource = mock_method.call_args_list[0][1]['processor']
+            paypal = mock_method.call_args_list[2][1]['processor']
+            self.assertIsInstance(cybersource, Cybersource)
+            self.assertIsInstance(paypal, Paypal)
+            for refund_kwargs, processor in zip(expected_kwargs, [cybersource, cybersource, paypal]):
+                refund_kwargs['processor'] = processor
+
+        expected_calls = [
+            mock.call(refund, **refund_kwargs) for refund, refund_kwargs in zip(expected_order, expected_kwargs)
+        ]
+        self.assertEqual(mock_method.call_args_list, expected_calls)
+        self.assertEqual(actual, zip(expected_order, [True, False, True]))
+
+    def test_process_refunds_invalid_action(self):
+        """ ValueError should be raised if the action is invalid. """
+        with self.assertRaises(ValueError):
+            list(process_refunds([], 'foo'))
@@ -1,5 +1,8 @@
+from collections import OrderedDict
+
 import ddt
 from django.conf import settings
+from django.db.models import Sum
 import httpretty
 import mock
 from oscar.apps.payment.exceptions import PaymentError
@@ -8,6 +11,7 @@ from oscar.test.newfactories import UserFactory
 from testfixtures import LogCapture
 
 from ecommerce.core.url_utils import get_lms_enrollment_api_url
+from ecommerce.extensions.payment.tests.processors import DummyProcessor
 from ecommerce.extensions.refund import models
 from ecommerce.extensions.refund.exceptions import InvalidStatus
 from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
@@ -58,6 +62,41 @@ class StatusTestsMixin(object):
                 instance.set_status(new_status)
                 self.assertEqual(instance.status, new_status, 'Refund status was not updated!')
 
+    def test_bulk_set_status(self):
+        """ Verify statuses are updated, and recorded in history, when transitioning to valid statuses. """
+        new_statuses = {}
+        for status, valid_statuses in self.pipeline.iteritems():
+            for new_status in valid_statuses:
+                new_statuses[self._get_instance(status=status)] = new_status
+
+        model = self._get_instance().__class__
+        history_count = model.history.count()
+        model.bulk_set_status(new_statuses)
+
+        for instance, new_status in new_statuses.items():
+            self.assertEqual(instance.status, new_status)
+            self.assertEqual(model.objects.get(id=instance.id).status, new_status)
+            self.assertEqual(instance.history.latest('history_date').status, new_status)
+
+        self.assertEqual(model.history.count(), history_count + len(new_statuses))
+
+    def test_bulk_set_status_invalid_status(self):
+        """ Verify no status is updated if any of the requested transitions is invalid. """
+        valid_status, valid_transitions = next(
+            (status, transitions) for status, transitions in self.pipeline.iteritems() if transitions
+        )
+        final_status = next(status for status, transitions in self.pipeline.iteritems() if not transitions)
+        valid_instance = self._get_instance(status=valid_status)
+        invalid_instance = self._get_instance(status=final_status)
+
+        with self.assertRaises(InvalidStatus):
+            valid_instance.__class__.bulk_set_status({
+                valid_instance: valid_transitions[0],
+                invalid_instance: valid_status,
+            })
+
+        self.assertEqual(valid_instance.__class__.objects.get(id=valid_instance.id).status, valid_status)
+
 
 @ddt.ddt
 class RefundTests(RefundTestMixin, StatusTestsMixin, TestCase):
@@ -74,6 +113,13 @@ class RefundTests(RefundTestMixin, StatusTestsMixin, TestCase):
         RefundLineFactory(quantity=3, refund=refund)
         self.assertEqual(refund.num_items, 4)
 
+        # Annotated and prefetched refunds should not require another query.
+        annotated_refund = Refund.objects.annotate(annotated_num_items=Sum('lines__quantity')).get(id=refund.id)
+        prefetched_refund = Refund.objects.prefetch_related('lines').get(id=refund.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(annotated_refund.num_items, 4)
+            self.assertEqual(prefetched_refund.num_items, 4)
+
     def test_all_statuses(self):
         """ Refund.all_statuses should return all possible statuses for a refund. """
         self.assertEqual(Refund.all_statuses(), self.pipeline.keys())
@@ -106,6 +152,48 @@ class RefundTests(RefundTestMixin, StatusTestsMixin, TestCase):
 
         self.assert_refund_matches_order(refund, order)
 
+    def test_bulk_create_with_lines(self):
+        """
+        Given order lines grouped by order, Refund.bulk_create_with_lines should create a Refund, with corresponding
+        RefundLines and historical records, for each order.
+        """
+        orders = [
+            self.create_order(user=UserFactory(), multiple_lines=True),
+            self.create_order(user=UserFactory()),
+        ]
+        lines_by_order = OrderedDict((order, list(order.lines.all())) for order in orders)
+
+        with LogCapture(LOGGER_NAME) as l:
+            refunds = Refund.bulk_create_with_lines(lines_by_order)
+
+            l.check(*[
+                (
+                    LOGGER_NAME,
+                    'INFO',
+                    'refund_created: amount="{}", currency="{}", order_number="{}", '
+                    'refund_id="{}", user_id="{}"'.format(
+                        refund.total_credit_excl_tax,
+                        refund.currency,
+                        refund.order.number,
+                        refund.id,
+                        refund.user.id
+                    )
+                )
+                for refund in refunds
+            ])
+
+        self.assertEqual(refunds, list(Refund.objects.order_by('id')))
+        for refund, order in zip(refunds, orders):
+            self.assert_refund_matches_order(refund, order)
+            self.assertEqual(refund.history.get().history_type, '+')
+            for refund_line in refund.lines.all():
+                self.assertEqual(refund_line.history.get().history_type, '+')
+
+    def test_bulk_create_with_lines_without_lines(self):
+        """ Refund.bulk_create_with_lines should not create any Refunds if no lines are provided. """
+        self.assertEqual(Refund.bulk_create_with_lines({}), [])
+        self.assertFalse(Refund.objects.exists())
+
     def test_create_with_lines_with_existing_refund(self):
         """
         Refund.create_with_lines should not create RefundLines for order lines
@@ -205,6 +293,19 @@ class RefundTests(RefundTestMixin, StatusTestsMixin, TestCase):
                 )
             )
 
+    def test_approve_with_processor(self):
+        """ If a payment processor is provided, the method should use it to issue the credit. """
+        refund = self.create_refund()
+        processor = mock.Mock(NAME=DummyProcessor.NAME)
+
+        with mock.patch.object(Refund, '_revoke_lines', autospec=True):
+            refund.approve(processor=processor)
+
+        processor.issue_credit.assert_called_once_with(
+            refund.order.sources.first(), refund.total_credit_excl_tax, refund.currency
+        )
+        self.assertEqual(refund.status, REFUND.PAYMENT_REFUNDED)
+
     def test_approve_payment_error(self):
         """
         If payment refund fails, the Refund status should be set to Payment Refund Error, and the RefundLine
@@ -0,0 +1,250 @@
+"""Cache of notification HTML templates whose CSS has been inlined.
+
+premailer parses the HTML of an email, and inlines its CSS, from scratch, which is far slower than rendering the
+template itself. Most notification templates only substitute context values into fixed markup, so such templates
+are rendered, and their CSS inlined, once, with a placeholder in place of each value. The result is cached per
+communication type, theme, language and version of the communication type, and each email is rendered by
+replacing the placeholders with the values of its context.
+
+Templates that do more than substitute values (e.g. with {% if %} or {% for %} tags, or filters) cannot be
+rendered ahead of time. Their emails are rendered, and their CSS inlined, individually.
+"""
+import re
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.template import Context, Template, TemplateDoesNotExist
+from django.template.base import TextNode, Variable, VariableNode, render_value_in_context
+from django.template.defaulttags import CommentNode, LoadNode, NowNode
+from django.template.loader import get_template
+from django.template.loader_tags import BlockNode, ExtendsNode
+from django.templatetags.i18n import BlockTranslateNode, TranslateNode
+from django.utils import translation
+from premailer import transform
+
+from ecommerce.theming.helpers import get_current_theme
+
+# Nodes whose output does not depend on the values of the context, or is the value of a context variable.
+SUBSTITUTION_NODES = (
+    BlockNode, BlockTranslateNode, CommentNode, ExtendsNode, LoadNode, NowNode, TextNode, TranslateNode,
+    VariableNode,
+)
+
+# Placeholders are made up of characters that are left untouched when HTML, including URLs, is parsed and
+# serialized. The nonce keeps them from colliding with the content of templates.
+_PLACEHOLDER_NONCE = uuid.uuid4().hex
+_PLACEHOLDER_PATTERN = re.compile(r'{nonce}_(\d+)_{nonce}'.format(nonce=_PLACEHOLDER_NONCE))
+
+# Style blocks and style attributes, whose CSS premailer parses and moves, so placeholders within them are not
+# preserved as they were rendered.
+_STYLE_PATTERN = re.compile(
+    r'<style\b.*?</style\s*>|\bstyle\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)', re.IGNORECASE | re.DOTALL
+)
+
+# Inlined templates, keyed by communication type code, theme, language and version. Each value is a tuple
+# holding the time at which the entry expires, and the InlinedTemplate, or None if the template can not be
+# rendered ahead of time.
+_inlined_templates = {}
+_inlined_templates_lock = threading.Lock()
+
+
+def get_message_template(event_type, attr_name):
+    """ Returns the template of a message of the given communication type.
+
+    As with Oscar's CommunicationEventType.get_messages, the template is read from the model field if it is set,
+    or else from the template file of the communication type.
+
+    Arguments:
+        event_type (CommunicationEventType): Communication type.
+        attr_name (str): Name of the model field holding the template (e.g. 'email_body_html_template').
+
+    Returns:
+        Template, or None if the communication type has no such template.
+    """
+    field = getattr(event_type, attr_name, None)
+    if field is not None:
+        return Template(field)
+
+    template_name = getattr(event_type, '{}_file'.format(attr_name)) % event_type.code.lower()
+    try:
+        return get_template(template_name).template
+    except TemplateDoesNotExist:
+        return None
+
+
+def render_inlined_html(event_type, context):
+    """ Renders the HTML email body of the given communication type, with its CSS inlined.
+
+    Arguments:
+        event_type (CommunicationEventType): Communication type.
+        context (dict): Context with which to render the template.
+
+    Returns:
+        str: HTML of the email, or an empty string if the communication type has no HTML template.
+    """
+    template = get_message_template(event_type, 'email_body_html_template')
+    if template is None:
+        return ''
+
+    inlined = get_inlined_template(event_type, template)
+    if inlined is None:
+        return transform(template.render(Context(context)))
+
+    return inlined.render(context)
+
+
+def get_inlined_template(event_type, template):
+    """ Returns the cached InlinedTemplate for the HTML template of the given communication type.
+
+    Templates are cached for NOTIFICATION_TEMPLATE_CACHE_TIMEOUT seconds. Saving a communication type changes its
+    version, and using another theme or language changes the template, so neither uses the cached template.
+
+    Returns:
+        InlinedTemplate, or None if the template can not be rendered ahead of time, or caching is disabled.
+    """
+    timeout = settings.NOTIFICATION_TEMPLATE_CACHE_TIMEOUT
+    if not timeout:
+        return None
+
+    theme = get_current_theme()
+    key = (
+        event_type.code,
+        theme.theme_dir_name if theme else None,
+        translation.get_language(),
+        event_type.date_updated,
+    )
+
+    now = time.time()
+    entry = _inlined_templates.get(key)
+    if entry is None or entry[0] < now:
+        inlined = InlinedTemplate.from_template(template) if is_substitution_only(template) else None
+        entry = (now + timeout, inlined)
+
+        with _inlined_templates_lock:
+            # Expired entries, including those of earlier versions of communication types, are discarded.
+            for expired_key in [k for k, v in _inlined_templates.items() if v[0] < now]:
+                del _inlined_templates[expired_key]
+            _inlined_templates[key] = entry
+
+    return entry[1]
+
+
+def clear_inlined_templates():
+    """ Discards the inlined templates cached by this process. """
+    with _inlined_templates_lock:
+        _inlined_templates.clear()
+
+
+def is_substitution_only(template, nodelist=None):
+    """ Returns True if the output of the template only depends on its context through the values it outputs.
+
+    Only nodes that output fixed text, or the values of context variables without applying filters, are allowed.
+    Parent templates are checked as well.
+    """
+    for node in template.nodelist if nodelist is None else nodelist:
+        if not isinstance(node, SUBSTITUTION_NODES):
+            return False
+
+        if isinstance(node, ExtendsNode):
+            if not _is_constant(node.parent_name):
+                return False
+            parent_name = node.parent_name.var
+            if isinstance(parent_name, Variable):
+                parent_name = parent_name.literal
+            if not is_substitution_only(template.engine.get_template(parent_name)):
+                return False
+        elif isinstance(node, VariableNode) and not _is_simple(node.filter_expression):
+            return False
+        elif isinstance(node, TranslateNode) and not _is_constant(node.filter_expression):
+            return False
+        elif isinstance(node, BlockTranslateNode):
+            if node.countervar or not all(_is_simple(value) for value in node.extra_context.values()):
+                return False
+
+        for attr in node.child_nodelists:
+            child_nodelist = getattr(node, attr, None)
+            if child_nodelist and not is_substitution_only(template, child_nodelist):
+                return False
+
+    return True
+
+
+def _is_constant(filter_expression):
+    var = filter_expression.var
+    return not filter_expression.filters and (not isinstance(var, Variable) or var.literal is not None)
+
+
+def _is_simple(filter_expression):
+    var = filter_expression.var
+    return _is_constant(filter_expression) or (not filter_expression.filters and len(var.lookups) == 1)
+
+
+class PlaceholderContext(Context):
+    """ Context that resolves every variable it does not hold to a placeholder for the variable's value. """
+
+    def __init__(self, *args, **kwargs):
+        super(PlaceholderContext, self).__init__(*args, **kwargs)
+        self.placeholder_names = []
+        self._placeholders = {}
+
+    def __contains__(self, key):
+        return True
+
+    def __getitem__(self, key):
+        try:
+            return super(PlaceholderContext, self).__getitem__(key)
+        except KeyError:
+            placeholder = self._placeholders.get(key)
+            if placeholder is None:
+                placeholder = self._placeholders[key] = '{nonce}_{index}_{nonce}'.format(
+                    nonce=_PLACEHOLDER_NONCE, index=len(self.placeholder_names)
+                )
+                self.placeholder_names.append(key)
+            return placeholder
+
+    def get(self, key, otherwise=None):
+        return self[key]
+
+
+class InlinedTemplate(object):
+    """ HTML, with its CSS inlined, holding placeholders for the values of context variables. """
+
+    def __init__(self, html, names, string_if_invalid=''):
+        self.html = html
+        self.names = names
+        self.string_if_invalid = string_if_invalid
+
+    @classmethod
+    def from_template(cls, template):
+        """ Renders the template with placeholders, and inlines its CSS.
+
+        Returns:
+            InlinedTemplate, or None if a value is output within a style, or inlining the CSS did not preserve
+            the placeholders.
+        """
+        context = PlaceholderContext()
+        html = template.render(context)
+
+        if any(_PLACEHOLDER_PATTERN.search(match.group(0)) for match in _STYLE_PATTERN.finditer(html)):
+            return None
+
+        inlined_html = transform(html)
+
+        if sorted(_PLACEHOLDER_PATTERN.findall(html)) != sorted(_PLACEHOLDER_PATTERN.findall(inlined_html)):
+            return None
+
+        return cls(inlined_html, context.placeholder_names, template.engine.string_if_invalid)
+
+    def render(self, context):
+        """ Returns the HTML, with the placeholders replaced by the values of the context, escaped as needed. """
+        context = Context(context)
+
+        def replace(match):
+            name = self.names[int(match.group(1))]
+            if name not in context:
+                return self.string_if_invalid % name if '%s' in self.string_if_invalid else self.string_if_invalid
+            return render_value_in_context(context[name], context)
+
+        return _PLACEHOLDER_PATTERN.sub(replace, self.html)
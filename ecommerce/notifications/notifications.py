@@ -1,9 +1,11 @@
 import logging
 
+from django.conf import settings
+from django.template import Context
 from oscar.core.loading import get_model, get_class
-from premailer import transform
 
 from ecommerce.extensions.analytics.utils import parse_tracking_context
+from ecommerce.notifications.cache import get_message_template, render_inlined_html
 
 
 log = logging.getLogger(__name__)
@@ -37,14 +39,39 @@ def send_notification(user, commtype_code, context, site):
         event_type = CommunicationEventType.objects.get(code=commtype_code)
     except CommunicationEventType.DoesNotExist:
         try:
-            messages = CommunicationEventType.objects.get_and_render(commtype_code, context)
+            # Render the communication type's template files.
+            messages = render_messages(CommunicationEventType(code=commtype_code), context)
         except Exception:  # pylint: disable=broad-except
             log.error('Unable to locate a DB entry or templates for communication type [%s]. '
                       'No notification has been sent.', commtype_code)
             return
     else:
-        messages = event_type.get_messages(context)
+        messages = render_messages(event_type, context)
 
     if messages and (messages['body'] or messages['html']):
-        messages['html'] = transform(messages['html'])
         Dispatcher().dispatch_user_messages(user, messages, site)
+
+
+def render_messages(event_type, context):
+    """Render the messages of a communication type.
+
+    Equivalent to Oscar's CommunicationEventType.get_messages, except that the CSS of the HTML email body is
+    inlined, using a cache of the communication type's inlined HTML template.
+
+    Args:
+    event_type(CommunicationEventType): Communication type whose messages are rendered
+    context(dict): context to be used in the messages
+
+    """
+    # Pass base URL for serving images within HTML emails
+    context['static_base_url'] = getattr(settings, 'OSCAR_STATIC_BASE_URL', None)
+
+    messages = {'html': render_inlined_html(event_type, context)}
+    for name, attr_name in (('subject', 'email_subject_template'), ('body', 'email_body_template'),
+                            ('sms', 'sms_template')):
+        template = get_message_template(event_type, attr_name)
+        messages[name] = template.render(Context(context)) if template else ''
+
+    # Ensure the email subject doesn't contain any newlines
+    messages['subject'] = messages['subject'].replace("\n", "").replace("\r", "")
+    return messages
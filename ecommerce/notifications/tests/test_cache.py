@@ -0,0 +1,96 @@
+from django.template import Context, Template
+import mock
+from oscar.core.loading import get_model
+from premailer import transform
+
+from ecommerce.notifications import cache
+from ecommerce.notifications.cache import InlinedTemplate, is_substitution_only, render_inlined_html
+from ecommerce.tests.testcases import TestCase
+
+CommunicationEventType = get_model('customer', 'CommunicationEventType')
+
+HTML_TEMPLATE = """{% load i18n %}
+<html>
+<head><style>p { color: red; }</style></head>
+<body>
+    <p>{% blocktrans %}Hi {{ full_name }},{% endblocktrans %}</p>
+    <a href="{{ receipt_page_url }}">{% trans "View receipt" %}</a>
+</body>
+</html>
+"""
+
+
+class IsSubstitutionOnlyTests(TestCase):
+    def test_substitution_only(self):
+        """ Verify templates that only output text and the values of variables are recognized. """
+        self.assertTrue(is_substitution_only(Template(HTML_TEMPLATE)))
+        self.assertTrue(is_substitution_only(Template('{% extends "customer/email_base.html" %}')))
+
+    def test_not_substitution_only(self):
+        """ Verify templates whose output otherwise depends on their context are not recognized. """
+        for source in ('{% if full_name %}{{ full_name }}{% endif %}', '{{ full_name|upper }}', '{{ user.email }}'):
+            self.assertFalse(is_substitution_only(Template(source)), source)
+
+
+class RenderInlinedHtmlTests(TestCase):
+    def setUp(self):
+        super(RenderInlinedHtmlTests, self).setUp()
+        cache.clear_inlined_templates()
+        self.addCleanup(cache.clear_inlined_templates)
+
+        self.event_type = CommunicationEventType.objects.create(
+            code='TEST', name='Test', email_subject_template='Subject', email_body_template='Body',
+            email_body_html_template=HTML_TEMPLATE
+        )
+
+    def render(self, **context):
+        with mock.patch.object(cache, 'transform', side_effect=transform) as mock_transform:
+            html = render_inlined_html(self.event_type, context)
+        return html, mock_transform.call_count
+
+    def test_render(self):
+        """ Verify the CSS is inlined once, and each email only substitutes its values, escaped. """
+        html, transform_count = self.render(full_name='Ann <Admin>', receipt_page_url='https://example.com/?a=1&b=2')
+        self.assertEqual(transform_count, 1)
+        self.assertIn('<p style="color:red">Hi Ann &lt;Admin&gt;,</p>', html)
+        self.assertIn('href="https://example.com/?a=1&amp;b=2"', html)
+
+        html, transform_count = self.render(full_name='Bob')
+        self.assertEqual(transform_count, 0)
+        self.assertIn('<p style="color:red">Hi Bob,</p>', html)
+        self.assertIn('href=""', html)
+
+    def test_render_matches_full_render(self):
+        """ Verify the email matches that produced by inlining the CSS of the fully rendered template. """
+        context = {'full_name': 'Ann', 'receipt_page_url': 'https://example.com/receipt/'}
+        expected = transform(Template(HTML_TEMPLATE).render(Context(context)))
+        self.assertEqual(self.render(**context)[0], expected)
+
+    def test_render_not_substitution_only(self):
+        """ Verify the CSS of templates that are not substitution-only is inlined for every email. """
+        self.event_type.email_body_html_template = '<p>{% if full_name %}Hi {{ full_name }}{% endif %}</p>'
+        self.event_type.save()
+
+        for __ in range(2):
+            html, transform_count = self.render(full_name='Ann')
+            self.assertEqual(transform_count, 1)
+            self.assertIn('Hi Ann', html)
+
+    def test_save_invalidates_cache(self):
+        """ Verify saving the communication type invalidates its cached template. """
+        self.render(full_name='Ann')
+
+        self.event_type.email_body_html_template = '<p>Hello {{ full_name }}</p>'
+        self.event_type.save()
+
+        html, transform_count = self.render(full_name='Ann')
+        self.assertEqual(transform_count, 1)
+        self.assertIn('Hello Ann', html)
+
+    def test_lost_placeholders(self):
+        """ Verify templates that output values within styles are not cached. """
+        template = Template('<html><head><style>p { color: {{ color }}; }</style></head><body><p>x</p></body></html>')
+        self.assertIsNone(InlinedTemplate.from_template(template))
+
+        template = Template('<html><body><p style="color: {{ color }}">x</p></body></html>')
+        self.assertIsNone(InlinedTemplate.from_template(template))
@@ -1,5 +1,8 @@
 import logging
 
+from celery import group
+from django.conf import settings
+from django.core.cache import cache
 from django.dispatch import receiver
 from oscar.core.loading import get_class, get_model
 import waffle
@@ -8,7 +11,7 @@ from ecommerce_worker.sailthru.v1.tasks import update_course_enrollment
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.utils import mode_for_seat
-from ecommerce.extensions.analytics.utils import silence_exceptions
+from ecommerce.extensions.analytics.utils import ORDER_LINE_TRACKING_RELATIONS, silence_exceptions
 
 
 logger = logging.getLogger(__name__)
@@ -17,6 +20,7 @@ basket_addition = get_class('basket.signals', 'basket_addition')
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
 SAILTHRU_CAMPAIGN = 'sailthru_bid'
+ATTRIBUTE_TYPE_ID_CACHE_KEY = 'sailthru_attribute_type_id'
 
 
 @receiver(post_checkout)
@@ -43,17 +47,16 @@ def process_checkout_complete(sender, order=None, user=None, request=None,  # py
 
     if not message_id:
         saved_id = BasketAttribute.objects.filter(
-            basket=order.basket,
-            attribute_type=_get_attribute_type()
-        )
-        if len(saved_id) > 0:
-            message_id = saved_id[0].value_text
-
-    # loop through lines in order
-    #  If multi product orders become common it may be worthwhile to pass an array of
-    #  orders to the worker in one call to save overhead, however, that would be difficult
-    #  because of the fact that there are different templates for free enroll versus paid enroll
-    for line in order.lines.all():
+            basket_id=order.basket_id,
+            attribute_type_id=_get_attribute_type_id()
+        ).values_list('value_text', flat=True).first()
+        if saved_id:
+            message_id = saved_id
+
+    # There are different templates for free enroll versus paid enroll, so the worker is sent one task per seat.
+    # The tasks are sent as a group, which publishes them to the broker over a single connection.
+    tasks = []
+    for line in order.lines.select_related(*ORDER_LINE_TRACKING_RELATIONS):
 
         # get product
         product = line.product
@@ -66,12 +69,15 @@ def process_checkout_complete(sender, order=None, user=None, request=None,  # py
 
             course_id = product.course_id
 
-            # Tell Sailthru that the purchase is complete asynchronously
-            update_course_enrollment.delay(order.user.email, _build_course_url(course_id),
-                                           False, mode_for_seat(product),
-                                           unit_cost=price, course_id=course_id, currency=order.currency,
-                                           site_code=partner.short_code,
-                                           message_id=message_id)
+            tasks.append(update_course_enrollment.s(order.user.email, _build_course_url(course_id),
+                                                    False, mode_for_seat(product),
+                                                    unit_cost=price, course_id=course_id, currency=order.currency,
+                                                    site_code=partner.short_code,
+                                                    message_id=message_id))
+
+    # Tell Sailthru that the purchase is complete asynchronously
+    if tasks:
+        group(tasks).apply_async()
 
 
 @receiver(basket_addition)
@@ -97,19 +103,12 @@ def process_basket_addition(sender, product=None, user=None, request=None, baske
 
         course_id = product.course_id
 
-        stock_record = product.stockrecords.first()
-        if stock_record:
-            price = stock_record.price_excl_tax
-            currency = stock_record.price_currency
+        price, currency = _get_price(product, basket)
 
         # save Sailthru campaign ID, if there is one
         message_id = request.COOKIES.get('sailthru_bid')
         if message_id and basket:
-            BasketAttribute.objects.update_or_create(
-                basket=basket,
-                attribute_type=_get_attribute_type(),
-                value_text=message_id
-            )
+            _save_campaign_id(basket, message_id)
 
         # inform sailthru if there is a price.  The purpose of this call is to tell Sailthru when
         # an item has been added to the shopping cart so that an abandoned cart message can be sent
@@ -127,10 +126,51 @@ def _build_course_url(course_id):
     return get_lms_url('courses/{}/info'.format(course_id))
 
 
-def _get_attribute_type():
-    """ Read attribute type for Sailthru campaign id"""
-    try:
-        attribute_type = BasketAttributeType.objects.get(name=SAILTHRU_CAMPAIGN)
-    except BasketAttributeType.DoesNotExist:
-        attribute_type = BasketAttributeType.objects.create(name=SAILTHRU_CAMPAIGN)
-    return attribute_type
+def _get_price(product, basket):
+    """ Returns the price and currency of the product.
+
+    The price is read from the basket's line for the product, if the basket has one. Otherwise, the product's
+    first stock record is used.
+    """
+    if basket:
+        # all_lines() queries the basket's lines, unless they were prefetched or already read from this basket.
+        for line in basket.all_lines():
+            if line.product_id == product.id:
+                return line.price_excl_tax, line.price_currency
+
+    stock_record = product.stockrecords.first()
+    if stock_record:
+        return stock_record.price_excl_tax, stock_record.price_currency
+
+    return None, None
+
+
+def _save_campaign_id(basket, message_id):
+    """ Saves the Sailthru campaign ID as an attribute of the basket, unless it is already saved. """
+    attribute_type_id = _get_attribute_type_id()
+    saved_id = BasketAttribute.objects.filter(
+        basket=basket,
+        attribute_type_id=attribute_type_id
+    ).values_list('value_text', flat=True).first()
+
+    if saved_id is None:
+        BasketAttribute.objects.create(basket=basket, attribute_type_id=attribute_type_id, value_text=message_id)
+    elif saved_id != message_id:
+        BasketAttribute.objects.filter(
+            basket=basket,
+            attribute_type_id=attribute_type_id
+        ).update(value_text=message_id)
+
+
+def _get_attribute_type_id():
+    """ Returns the ID of the attribute type for the Sailthru campaign ID, creating the type if needed.
+
+    The ID is cached for SAILTHRU_ATTRIBUTE_TYPE_CACHE_TIMEOUT seconds.
+    """
+    attribute_type_id = cache.get(ATTRIBUTE_TYPE_ID_CACHE_KEY)
+
+    if attribute_type_id is None:
+        attribute_type_id = BasketAttributeType.objects.get_or_create(name=SAILTHRU_CAMPAIGN)[0].id
+        cache.set(ATTRIBUTE_TYPE_ID_CACHE_KEY, attribute_type_id, settings.SAILTHRU_ATTRIBUTE_TYPE_CACHE_TIMEOUT)
+
+    return attribute_type_id
@@ -1,15 +1,19 @@
 """Tests of ecommerce sailthru signal handlers."""
 import logging
 
-from mock import patch
+from mock import ANY, patch
 from oscar.core.loading import get_model
 from oscar.test.factories import create_order
 from oscar.test.newfactories import UserFactory, BasketFactory
+from django.core.cache import cache
+from django.db import connection
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 
 from ecommerce.core.tests import toggle_switch
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.courses.models import Course
+from ecommerce.courses.utils import mode_for_seat
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
 from ecommerce.sailthru.signals import process_checkout_complete, process_basket_addition, SAILTHRU_CAMPAIGN
 from ecommerce.tests.factories import SiteConfigurationFactory
@@ -41,6 +45,27 @@ class SailthruTests(CouponMixin, CourseCatalogTestMixin, TestCase):
         self.course_url = 'http://lms.testserver.fake/courses/edX/toy/2012_Fall/info'
         self.course = Course.objects.create(id=self.course_id, name='Demo Course')
 
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def assert_checkout_tasks_sent(self, mock_group, order, seats, message_id):
+        """ Verify a single group of update_course_enrollment tasks, one per seat, was sent for the order. """
+        mock_group.assert_called_once_with(ANY)
+        mock_group.return_value.apply_async.assert_called_once_with()
+
+        tasks = mock_group.call_args[0][0]
+        self.assertEqual(len(tasks), len(seats))
+        for task, seat in zip(tasks, seats):
+            self.assertEqual(task.task, 'ecommerce_worker.sailthru.v1.tasks.update_course_enrollment')
+            self.assertEqual(task.args, (TEST_EMAIL, self.course_url, False, mode_for_seat(seat)))
+            self.assertEqual(task.kwargs, {
+                'course_id': self.course_id,
+                'currency': order.currency,
+                'message_id': message_id,
+                'site_code': 'edX',
+                'unit_cost': order.total_excl_tax,
+            })
+
     @patch('ecommerce.sailthru.signals.logger.error')
     def test_just_return_signals(self, mock_log_error):
         """
@@ -53,9 +78,10 @@ class SailthruTests(CouponMixin, CourseCatalogTestMixin, TestCase):
         process_basket_addition(None)
         self.assertFalse(mock_log_error.called)
 
+    @patch('ecommerce.sailthru.signals.group')
     @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
     @patch('ecommerce.sailthru.signals.logger.error')
-    def test_just_return_if_partner_not_supported(self, mock_log_error, mock_update_course_enrollment):
+    def test_just_return_if_partner_not_supported(self, mock_log_error, mock_update_course_enrollment, mock_group):
         """
         Ensure that calls just return if enable_sailthru turned off for partner
         """
@@ -69,12 +95,13 @@ class SailthruTests(CouponMixin, CourseCatalogTestMixin, TestCase):
         __, order = self._create_order(99)
         order.site.siteconfiguration = site_configuration
         process_checkout_complete(None, order=order)
-        self.assertFalse(mock_update_course_enrollment.called)
+        self.assertFalse(mock_group.called)
         self.assertFalse(mock_log_error.called)
 
+    @patch('ecommerce.sailthru.signals.group')
     @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
     @patch('ecommerce.sailthru.signals.logger.error')
-    def test_just_return_not_course(self, mock_log_error, mock_update_course_enrollment):
+    def test_just_return_not_course(self, mock_log_error, mock_update_course_enrollment, mock_group):
         """
         Verify data for coupon-related orders is not sent to Sailthru.
         """
@@ -89,46 +116,45 @@ class SailthruTests(CouponMixin, CourseCatalogTestMixin, TestCase):
 
         order = create_order(number=1, basket=basket, user=self.user)
         process_checkout_complete(None, order=order, request=None)
-        self.assertFalse(mock_update_course_enrollment.called)
+        self.assertFalse(mock_group.called)
         self.assertFalse(mock_log_error.called)
 
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
-    def test_process_checkout_complete(self, mock_update_course_enrollment):
+    @patch('ecommerce.sailthru.signals.group')
+    def test_process_checkout_complete(self, mock_group):
         """
         Test that the process_checkout signal handler properly calls the task routine
         """
 
         seat, order = self._create_order(99)
         process_checkout_complete(None, order=order, request=self.request)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         False,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=CAMPAIGN_COOKIE,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
+        self.assert_checkout_tasks_sent(mock_group, order, [seat], CAMPAIGN_COOKIE)
 
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
-    def test_process_checkout_complete_no_request(self, mock_update_course_enrollment):
+    @patch('ecommerce.sailthru.signals.group')
+    def test_process_checkout_complete_multiple_seats(self, mock_group):
+        """
+        Verify a single group of tasks, holding one task per seat, is sent for orders of multiple seats.
+        """
+        verified_seat = self.course.create_or_update_seat('verified', False, 50, self.partner)
+        professional_seat = self.course.create_or_update_seat('professional', False, 50, self.partner)
+
+        basket = BasketFactory()
+        basket.add_product(verified_seat, 1)
+        basket.add_product(professional_seat, 1)
+        order = create_order(number=1, basket=basket, user=self.user)
+        order.total_excl_tax = 50
+
+        process_checkout_complete(None, order=order, request=self.request)
+        self.assert_checkout_tasks_sent(mock_group, order, [verified_seat, professional_seat], CAMPAIGN_COOKIE)
+
+    @patch('ecommerce.sailthru.signals.group')
+    def test_process_checkout_complete_no_request(self, mock_group):
         """
         Test that the process_checkout signal handler properly handles null request
         """
 
         seat, order = self._create_order(99)
         process_checkout_complete(None, order=order)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         False,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=None,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
+        self.assert_checkout_tasks_sent(mock_group, order, [seat], None)
 
     @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
     def test_process_basket_addition(self, mock_update_course_enrollment):
@@ -169,7 +195,7 @@ class SailthruTests(CouponMixin, CourseCatalogTestMixin, TestCase):
         Verify the Sailthru campaign ID is saved as a basket attribute.
         """
 
-        # force exception in _get_attribute_type for coverage
+        # force exception in _get_attribute_type_id for coverage
         BasketAttributeType = get_model('basket', 'BasketAttributeType')
         try:
             basket_attribute = BasketAttributeType.objects.get(name=SAILTHRU_CAMPAIGN)
@@ -194,17 +220,32 @@ class SailthruTests(CouponMixin, CourseCatalogTestMixin, TestCase):
                                                          unit_cost=order.total_excl_tax)
 
         # now call checkout_complete with the same basket to see if campaign id saved and restored
-        process_checkout_complete(None, order=order, request=None)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         False,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=CAMPAIGN_COOKIE,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
+        with patch('ecommerce.sailthru.signals.group') as mock_group:
+            process_checkout_complete(None, order=order, request=None)
+        self.assert_checkout_tasks_sent(mock_group, order, [seat], CAMPAIGN_COOKIE)
+
+    def test_update_campaign_id(self):
+        """
+        Verify the saved Sailthru campaign ID is only written if it has changed.
+        """
+        BasketAttribute = get_model('basket', 'BasketAttribute')
+        # The seat is free, so no update is sent to Sailthru.
+        seat, order = self._create_order(0)
+
+        process_basket_addition(None, request=self.request, user=self.user, product=seat, basket=order.basket)
+        attribute = BasketAttribute.objects.get(basket=order.basket)
+        self.assertEqual(attribute.value_text, CAMPAIGN_COOKIE)
+
+        # The attribute type is cached, and the unchanged value is not written.
+        with CaptureQueriesContext(connection) as context:
+            process_basket_addition(None, request=self.request, user=self.user, product=seat, basket=order.basket)
+        for query in context.captured_queries:
+            self.assertNotIn('basketattributetype', query['sql'])
+            self.assertFalse(query['sql'].startswith(('INSERT', 'UPDATE')))
+
+        self.request.COOKIES['sailthru_bid'] = 'new_bid'
+        process_basket_addition(None, request=self.request, user=self.user, product=seat, basket=order.basket)
+        self.assertEqual(BasketAttribute.objects.get(id=attribute.id).value_text, 'new_bid')
 
     @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
     def test_save_campaign_id_audit(self, mock_update_course_enrollment):
@@ -219,17 +260,9 @@ class SailthruTests(CouponMixin, CourseCatalogTestMixin, TestCase):
         self.assertFalse(mock_update_course_enrollment.called)
 
         # now call checkout_complete with the same basket to see if campaign id saved and restored
-        process_checkout_complete(None, order=order, request=None)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         False,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=CAMPAIGN_COOKIE,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
+        with patch('ecommerce.sailthru.signals.group') as mock_group:
+            process_checkout_complete(None, order=order, request=None)
+        self.assert_checkout_tasks_sent(mock_group, order, [seat], CAMPAIGN_COOKIE)
 
     def _create_order(self, price, mode='verified'):
         seat = self.course.create_or_update_seat(mode, False, price, self.partner, None)
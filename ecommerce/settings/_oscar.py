@@ -132,6 +132,33 @@ PAYMENT_PROCESSOR_CONFIG = {
 }
 
 PAYMENT_PROCESSOR_SWITCH_PREFIX = 'payment_processor_active_'
+
+# Number of seconds for which each process keeps a snapshot of the payment processor switches, rather than
+# checking them individually on every request. Set to 0 to disable the snapshot.
+PAYMENT_PROCESSOR_SWITCH_CACHE_TIMEOUT = 10
+
+# Directory in which parsed SOAP service descriptions (WSDLs), used by payment processors, are cached, and the
+# number of days for which they are cached. If the directory is None, a directory in the system's temporary
+# directory is used.
+SOAP_WSDL_CACHE_DIR = None
+SOAP_WSDL_CACHE_DAYS = 7
+
+# Options for the HTTP sessions payment processors use to call their APIs. The default options may be overridden
+# for a specific processor by adding an entry keyed by the processor's name (e.g. 'paypal'). Timeouts are in
+# seconds. Retries apply to failed connections, and to failed reads of idempotent requests.
+PAYMENT_PROCESSOR_HTTP_OPTIONS = {
+    'default': {
+        'pool_size': 10,
+        'connect_timeout': 5,
+        'read_timeout': 30,
+        'max_retries': 2,
+        'backoff_factor': 0.5,
+    },
+}
+
+# Number of seconds for which the ID of the PayPal web profile sent with payments is cached. The cache is
+# invalidated when web profiles are enabled or disabled.
+PAYPAL_WEB_PROFILE_CACHE_TIMEOUT = 60 * 60
 # END PAYMENT PROCESSING
 
 
@@ -163,6 +190,9 @@ OSCAR_REFUND_LINE_STATUS_PIPELINE = {
     REFUND_LINE.DENIED: (),
     REFUND_LINE.COMPLETE: ()
 }
+
+# Number of threads used to approve or deny refunds in bulk (e.g. for all learners of a course).
+REFUND_APPROVAL_WORKERS = 4
 # END REFUND PROCESSING
 
 # DASHBOARD NAVIGATION MENU
@@ -259,9 +289,28 @@ OSCAR_DASHBOARD_NAVIGATION = [
 # Default timeout for Enrollment API calls
 ENROLLMENT_FULFILLMENT_TIMEOUT = 7
 
+# Maximum number of concurrent Enrollment API calls made when revoking the lines of a refund
+ENROLLMENT_REVOCATION_CONCURRENCY = 8
+
 # Coupon code length
 VOUCHER_CODE_LENGTH = 16
 
 THUMBNAIL_DEBUG = False
 
 OSCAR_FROM_EMAIL = 'testing@example.com'
+
+# Number of seconds for which each process caches the HTML templates of notification emails, rendered with their
+# CSS inlined. Saving a communication type invalidates its cached templates. Set to 0 to disable the cache.
+NOTIFICATION_TEMPLATE_CACHE_TIMEOUT = 60 * 60
+
+# Determines how the customer Dispatcher sends email. 'direct' sends each message, over a new connection to the email
+# backend, before returning. 'background' queues messages to a background thread, which sends them in batches over a
+# single connection, and records their audit rows in bulk. Messages queued while the queue is full are sent directly.
+EMAIL_DISPATCH_MODE = 'direct'
+
+# Maximum number of queued messages, and of messages sent per batch, of the background sender.
+BACKGROUND_EMAIL_QUEUE_SIZE = 1000
+BACKGROUND_EMAIL_BATCH_SIZE = 50
+
+# Number of seconds to wait for queued messages to be sent when the process shuts down.
+BACKGROUND_EMAIL_DRAIN_TIMEOUT = 30
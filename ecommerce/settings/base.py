@@ -171,10 +171,14 @@ TEMPLATES = [
         ),
         'OPTIONS': {
             'loaders': [
-                # ThemeTemplateLoader should come before any other loader to give theme templates
-                # priority over system templates
-                'ecommerce.theming.template_loaders.ThemeTemplateLoader',
-                'django.template.loaders.app_directories.Loader',
+                # ThemeCachedTemplateLoader caches compiled templates for each theme, so that templates are
+                # only read from the filesystem once per theme.
+                ('ecommerce.theming.template_loaders.ThemeCachedTemplateLoader', [
+                    # ThemeTemplateLoader should come before any other loader to give theme templates
+                    # priority over system templates
+                    'ecommerce.theming.template_loaders.ThemeTemplateLoader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
             'context_processors': (
                 'django.contrib.auth.context_processors.auth',
@@ -235,13 +239,26 @@ COMMERCE_API_TIMEOUT = 7
 # Cache course info from course API.
 COURSES_API_CACHE_TIMEOUT = 3600  # Value is in seconds
 
+# Cache the status of users' enrollments, retrieved from the LMS enrollment API. Enrollments changed by fulfilling
+# or revoking orders are invalidated immediately; those changed on the LMS are visible once the status expires.
+ENROLLMENT_STATUS_CACHE_TIMEOUT = 60  # Value is in seconds
+
+# Cache the details of active LMS accounts, retrieved from the LMS user API.
+ACCOUNT_DETAILS_CACHE_TIMEOUT = 60  # Value is in seconds
+
 # PROVIDER DATA PROCESSING
 PROVIDER_DATA_PROCESSING_TIMEOUT = 15  # Value is in seconds.
 CREDIT_PROVIDER_CACHE_TIMEOUT = 600
+CREDIT_ELIGIBILITY_CACHE_TIMEOUT = 60  # Value is in seconds.
+# Maximum number of concurrent calls made to the Credit API when checking eligibility for several courses.
+CREDIT_ELIGIBILITY_CONCURRENCY = 4
 # END URL CONFIGURATION
 
 VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
 
+# Cache the ID of the basket attribute type used to save Sailthru campaign IDs.
+SAILTHRU_ATTRIBUTE_TYPE_CACHE_TIMEOUT = 60 * 60  # Value is in seconds.
+
 # APP CONFIGURATION
 DJANGO_APPS = [
     'django.contrib.admin',
@@ -414,6 +431,10 @@ EXTRA_SCOPE = ['permissions']
 # Specify a key to emit events to the corresponding Segment project. `None` disables tracking.
 # See: https://segment.com/docs/libraries/python/
 SEGMENT_KEY = None
+
+# Maximum number of events queued, for each Segment key, to be sent to Segment in batches by a background thread.
+# Events tracked while the queue is full are dropped.
+SEGMENT_MAX_QUEUE_SIZE = 10000
 # END ANALYTICS
 
 
@@ -500,6 +521,34 @@ CELERY_ALWAYS_EAGER = False
 # END CELERY
 
 
+# ASYNCHRONOUS ORDER FULFILLMENT
+# Determines how orders selected by the async_order_fulfillment Waffle sample are fulfilled. 'celery' sends them
+# to the ecommerce-worker. 'in_process' runs post-checkout receivers on a bounded thread pool in this process,
+# which is useful for deployments without a broker.
+ASYNC_ORDER_FULFILLMENT_EXECUTOR = 'celery'
+
+# Number of threads, and maximum number of queued orders, of the in-process fulfillment executor. Orders
+# submitted while the queue is full are fulfilled synchronously.
+IN_PROCESS_FULFILLMENT_WORKERS = 4
+IN_PROCESS_FULFILLMENT_QUEUE_SIZE = 100
+
+# Number of seconds to wait for queued orders to be fulfilled when the process shuts down.
+IN_PROCESS_FULFILLMENT_DRAIN_TIMEOUT = 30
+# END ASYNCHRONOUS ORDER FULFILLMENT
+
+
+# PAYMENT NOTIFICATIONS
+# Number of threads, and maximum number of queued notifications, of the executor processing payment processor
+# notifications acknowledged before being processed (see the fast_ack_cybersource_notifications Waffle switch).
+# Notifications received while the queue is full are processed before responding.
+PAYMENT_NOTIFICATION_WORKERS = 4
+PAYMENT_NOTIFICATION_QUEUE_SIZE = 200
+
+# Number of seconds to wait for queued notifications to be processed when the process shuts down.
+PAYMENT_NOTIFICATION_DRAIN_TIMEOUT = 30
+# END PAYMENT NOTIFICATIONS
+
+
 THEME_SCSS = 'sass/themes/default.scss'
 
 # Path to the receipt page
@@ -508,6 +557,14 @@ RECEIPT_PAGE_PATH = '/commerce/checkout/receipt/'
 # URL for Course Catalog service
 COURSE_CATALOG_API_URL = 'http://localhost:8008/api/v1/'
 
+# Each process keeps a pool of connections per site and service (e.g. LMS, Course Catalog) called via API clients.
+# Pools hold up to API_CLIENT_POOL_SIZE connections. API_CLIENT_TIMEOUT is the timeout, in seconds, of requests.
+API_CLIENT_POOL_SIZE = 10
+API_CLIENT_TIMEOUT = 7
+
+# Number of seconds before a site's access token expires at which it is renewed.
+ACCESS_TOKEN_REFRESH_MARGIN = 60
+
 # Black-listed course modes not allowed to create coupons with
 BLACK_LIST_COUPON_COURSE_MODES = [u'audit', u'honor']
 
@@ -532,6 +589,9 @@ DEFAULT_SITE_THEME = None
 
 THEME_CACHE_TIMEOUT = 30 * 60
 
+# Cache time out, in seconds, of the theme of each site. Cached themes are invalidated when a site theme is saved.
+SITE_THEME_CACHE_TIMEOUT = 30 * 60
+
 # End Theme settings
 
 
@@ -550,3 +610,24 @@ ENROLLMENT_CODE_EXIPRATION_DATE = datetime.datetime.now() + datetime.timedelta(w
 
 # Affiliate cookie key
 AFFILIATE_COOKIE_KEY = 'affiliate_id'
+
+# METRICS
+# Sink receiving latency and counter metrics (e.g. fulfillment timings). The in-process histogram sink exposes its
+# data, for the serving process, at /metrics/. Use ecommerce.core.metrics.StatsdMetricsSink to send metrics to a
+# statsd daemon, or ecommerce.core.metrics.NullMetricsSink to disable collection.
+METRICS_SINK = 'ecommerce.core.metrics.HistogramMetricsSink'
+
+# Keyword arguments passed to the constructor of METRICS_SINK (e.g. {'host': 'localhost', 'port': 8125}).
+METRICS_SINK_OPTIONS = {}
+# END METRICS
+
+
+# HEALTH CHECKS
+# The dependencies reported by the health endpoint are checked by a background thread of each process every
+# HEALTH_CHECK_INTERVAL seconds, and the endpoint serves the latest results. Results older than
+# HEALTH_CHECK_MAX_AGE seconds are refreshed before responding. Set the interval to 0 to check dependencies on
+# every request. HEALTH_CHECK_TIMEOUT is the timeout, in seconds, of HTTP requests made to other services.
+HEALTH_CHECK_INTERVAL = 10
+HEALTH_CHECK_MAX_AGE = 60
+HEALTH_CHECK_TIMEOUT = 1
+# END HEALTH CHECKS
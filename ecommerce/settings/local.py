@@ -16,6 +16,12 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # END EMAIL CONFIGURATION
 
 
+# TEMPLATE CONFIGURATION
+# Templates are not cached, so that changes made to them are visible without restarting the server.
+TEMPLATES[0]['OPTIONS']['loaders'] = TEMPLATES[0]['OPTIONS']['loaders'][0][1]
+# END TEMPLATE CONFIGURATION
+
+
 # DATABASE CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#databases
 DATABASES = {
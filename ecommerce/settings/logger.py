@@ -11,7 +11,8 @@ def get_logger_config(log_dir='/var/tmp',
                       dev_env=False,
                       debug=False,
                       local_loglevel='INFO',
-                      service_variant='ecommerce'):
+                      service_variant='ecommerce',
+                      audit_log_file=None):
 
     """
     Return the appropriate logging config dictionary. You should assign the
@@ -21,6 +22,9 @@ def get_logger_config(log_dir='/var/tmp',
     instead, application logs will be dropped in log_dir.
 
     "edx_filename" is ignored unless dev_env is set to true since otherwise logging is handled by rsyslogd.
+
+    Audit events are queued, and handled on a background thread. If "audit_log_file" is set, they are also
+    written to that file as JSON, in batches.
     """
 
     # Revert to INFO if an invalid string is passed in
@@ -53,6 +57,7 @@ def get_logger_config(log_dir='/var/tmp',
             },
             'syslog_format': {'format': syslog_format},
             'raw': {'format': '%(message)s'},
+            'audit_json': {'()': 'ecommerce.extensions.analytics.audit.AuditJSONFormatter'},
         },
         'handlers': {
             'console': {
@@ -61,6 +66,10 @@ def get_logger_config(log_dir='/var/tmp',
                 'formatter': 'standard',
                 'stream': sys.stdout,
             },
+            'audit_queue': {
+                'class': 'ecommerce.extensions.analytics.audit.AuditQueueHandler',
+                'target': 'ecommerce.audit',
+            },
         },
         'loggers': {
             'django': {
@@ -88,6 +97,17 @@ def get_logger_config(log_dir='/var/tmp',
                 'propagate': True,
                 'level': 'WARNING'
             },
+            # Audit events are handled, off the request path, by the handlers of ecommerce.audit.
+            'ecommerce.extensions.analytics.utils': {
+                'handlers': ['audit_queue'],
+                'propagate': False,
+                'level': 'INFO'
+            },
+            'ecommerce.audit': {
+                'handlers': handlers,
+                'propagate': False,
+                'level': 'INFO'
+            },
             '': {
                 'handlers': handlers,
                 'level': 'DEBUG',
@@ -96,6 +116,14 @@ def get_logger_config(log_dir='/var/tmp',
         }
     }
 
+    if audit_log_file:
+        logger_config['handlers']['audit_file'] = {
+            'class': 'ecommerce.extensions.analytics.audit.BatchedFileHandler',
+            'formatter': 'audit_json',
+            'filename': audit_log_file,
+        }
+        logger_config['loggers']['ecommerce.audit']['handlers'] = handlers + ['audit_file']
+
     if dev_env:
         edx_file_loc = os.path.join(log_dir, edx_filename)
         logger_config['handlers'].update({
@@ -63,10 +63,32 @@ PASSWORD_HASHERS = (
 
 # ORDER PROCESSING
 EDX_API_KEY = 'replace-me'
+
+# Tests mock different account details, enrollment statuses, credit eligibility and credit providers for the
+# same users and courses.
+ACCOUNT_DETAILS_CACHE_TIMEOUT = 0
+CREDIT_ELIGIBILITY_CACHE_TIMEOUT = 0
+CREDIT_PROVIDER_CACHE_TIMEOUT = 0
+ENROLLMENT_STATUS_CACHE_TIMEOUT = 0
 # END ORDER PROCESSING
 
 
+# HEALTH CHECKS
+# Check dependencies on each request, so that the mocked responses of each test are reported.
+HEALTH_CHECK_INTERVAL = 0
+# END HEALTH CHECKS
+
+
+# REFUND PROCESSING
+# Test data is not committed, so it is not visible to the database connections of other threads.
+REFUND_APPROVAL_WORKERS = 1
+# END REFUND PROCESSING
+
+
 # PAYMENT PROCESSING
+# Database rollbacks between tests do not invalidate the snapshot of payment processor switches.
+PAYMENT_PROCESSOR_SWITCH_CACHE_TIMEOUT = 0
+
 PAYMENT_PROCESSOR_CONFIG = {
     'edx': {
         'cybersource': {
@@ -136,3 +158,7 @@ COMPREHENSIVE_THEME_DIRS = [
 ]
 
 DEFAULT_SITE_THEME = "test-theme"
+
+# Sites are created, with different themes, by each test, and their IDs are reused once the test's transaction is
+# rolled back, so their themes are not cached.
+SITE_THEME_CACHE_TIMEOUT = 0
@@ -67,9 +67,125 @@ $(document).ready(function () {
         $modal.modal( 'show' );
     };
 
+    var getSelectedRefundIds = function () {
+        return $('[data-action=select-refund]:checked').map(function () {
+            return parseInt($(this).val(), 10);
+        }).get();
+    };
+
+    var processRefunds = function (e) {
+        var $btn = $(e.target),
+            decision = $btn.data('decision'),
+            refundIds = getSelectedRefundIds(),
+            xhr = new XMLHttpRequest(),
+            received = 0,
+            processed = 0,
+            succeeded = 0,
+            $bulkButtons = $('[data-action=bulk-process-refunds]');
+
+        var handleResult = function (result) {
+            var $row = $('tr[data-refund-id=' + result.id + ']'),
+                message;
+
+            processed += 1;
+            $row.find('.refund-status').text(result.status);
+
+            if (result.success) {
+                succeeded += 1;
+                $row.find('[data-action=process-refund], [data-action=select-refund]').remove();
+            } else {
+                message = interpolate(
+                    gettext('Failed to process refund #%(refund_id)s. Please try again, or contact the E-Commerce Development Team.'),
+                    {refund_id: result.id},
+                    true
+                );
+                addMessage('alert-error', 'icon-exclamation-sign', message);
+            }
+        };
+
+        // Results are streamed as newline-delimited JSON. Handle each complete line as soon as it is received.
+        var handleResults = function () {
+            var end = xhr.responseText.lastIndexOf('\n');
+
+            if (end < received) {
+                return;
+            }
+
+            $.each(xhr.responseText.substring(received, end).split('\n'), function (index, line) {
+                if (line) {
+                    handleResult(JSON.parse(line));
+                }
+            });
+            received = end + 1;
+        };
+
+        var handleFailure = function () {
+            var message = interpolate(
+                gettext('Failed to process %(count)s refunds. Please try again, or contact the E-Commerce Development Team.'),
+                {count: refundIds.length - processed},
+                true
+            );
+            addMessage('alert-error', 'icon-exclamation-sign', message);
+        };
+
+        e.preventDefault();
+        $bulkButtons.addClass('disabled');
+
+        xhr.open('POST', '/api/v2/refunds/process/');
+        xhr.setRequestHeader('Content-Type', 'application/json');
+        xhr.setRequestHeader('X-CSRFToken', Cookies.get('ecommerce_csrftoken'));
+        xhr.onprogress = handleResults;
+        xhr.onload = function () {
+            var message;
+
+            if (xhr.status === 200) {
+                handleResults();
+                message = interpolate(
+                    gettext('%(succeeded)s of %(count)s refunds have been processed.'),
+                    {succeeded: succeeded, count: refundIds.length},
+                    true
+                );
+                addMessage('alert-success', 'icon-check-sign', message);
+            } else {
+                handleFailure();
+            }
+        };
+        xhr.onerror = handleFailure;
+        xhr.onloadend = function () {
+            $bulkButtons.removeClass('disabled');
+            $('[data-action=select-all-refunds]').prop('checked', false);
+        };
+        xhr.send(JSON.stringify({ids: refundIds, action: decision}));
+
+        // dismiss the modal
+        $('#refundBulkActionModal').modal('hide');
+    };
+
+    var launchRefundBulkActionModal = function (e) {
+        var decision = $(e.target).data('decision'),
+            $modal = $('#refundBulkActionModal');
+
+        if (!getSelectedRefundIds().length) {
+            addMessage('alert-info', 'icon-info-sign', gettext('Select the refunds to be processed.'));
+            return;
+        }
+
+        $modal.find('.modal-body').hide();
+        $modal.find('.modal-body.confirm-' + decision).show();
+        $modal.find('.btn-primary').data('decision', decision);
+        $modal.modal('show');
+    };
+
     // bind clicks on refund action buttons to the modal.
     $( '[data-action=process-refund]' ).click( launchRefundActionModal );
     // bind modal confirmation clicks to the refund processing ajax call.
     $( '#refundActionModal .btn-primary' ).click( processRefund );
 
+    // bind the bulk refund action buttons, and the select-all checkbox.
+    $('[data-action=bulk-process-refunds]').click(launchRefundBulkActionModal);
+    $('#refundBulkActionModal .btn-primary').click(processRefunds);
+    $('[data-action=select-all-refunds]').change(function () {
+        $('[data-action=select-refund]').prop('checked', $(this).prop('checked'));
+    });
+
 });
@@ -18,6 +18,7 @@ from oscar.test import factories
 from social.apps.django_app.default.models import UserSocialAuth
 from threadlocals.threadlocals import set_thread_variable
 
+from ecommerce.core.api_clients import reset_api_clients
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.utils import mode_for_seat
 from ecommerce.extensions.fulfillment.signals import SHIPPING_EVENT_NAME
@@ -267,6 +268,11 @@ class SiteMixin(object):
         self.request.site = self.site
         set_thread_variable('request', self.request)
 
+        # Pooled connections may have been opened, and access tokens retrieved, while HTTP requests were mocked
+        # by another test.
+        reset_api_clients()
+        self.addCleanup(reset_api_clients)
+
 
 class TestServerUrlMixin(object):
     def get_full_url(self, path, site=None):
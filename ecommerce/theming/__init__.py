@@ -8,6 +8,10 @@ Components:
         it will look at system template dirs.
         ThemeFilesFinder looks for static assets inside theme directories. It creates separate storage for each theme.
 
+    Cached Template Loader (ecommerce.theming.template_loaders.ThemeCachedTemplateLoader):
+        Theming aware cached template loader, it wraps the template loaders above and caches compiled templates
+        separately for each theme. The cache is cleared whenever themes are added, removed or renamed.
+
     Static Files Finders (ecommerce.theming.finders.ThemeFilesFinder):
         Theming aware Static files finder.
 
@@ -31,6 +35,11 @@ Components:
         will be "/static/red-theme/images/default-logo.png" and if red-theme does not provide 'images/default-logo.png'
         then corresponding url will be "/static/images/default-logo.png".
 
+        After collecting static assets, it saves a copy of each themed asset under a name that includes a hash of its
+        content (e.g. 'red-theme/images/default-logo.5f3a7e1c0b2d.png'), and writes a theme manifest
+        ('{STATIC_ROOT}/themes.json') of the assets overridden by each theme. Outside of debug mode, themed asset
+        urls are looked up in this manifest, rather than by checking whether the themed asset exists.
+
 Models:
     Site theme (ecommerce.theming.models.SiteTheme):
         Site theme model to store theme info for a given site.
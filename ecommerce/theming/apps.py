@@ -19,6 +19,9 @@ class ThemeAppConfig(AppConfig):
         startup run method, this method is called after the application has successfully initialized.
         Anything that needs to executed once (and only once) the theming app starts can be placed here.
         """
+        # noinspection PyUnresolvedReferences
+        import ecommerce.theming.signals  # pylint: disable=unused-variable
+
         if is_comprehensive_theming_enabled():
             # proceed only if comprehensive theming in enabled
 
@@ -12,6 +12,11 @@ from threadlocals.threadlocals import get_current_request
 
 logger = logging.getLogger(__name__)
 
+# Theme dirs found in each themes dir, and the modification time of the themes dir when they were listed.
+_theme_dirs_index = {}
+# Incremented whenever the theme dirs found in a themes dir change.
+_theme_dirs_version = 0
+
 
 def get_current_site_theme():
     """
@@ -67,7 +72,7 @@ def get_theme_base_dir(theme_dir_name, suppress_error=False):
         (str): Base directory that contains the given theme
     """
     for themes_dir in get_theme_base_dirs():
-        if theme_dir_name in (_dir for _dir in os.listdir(themes_dir) if is_theme_dir(themes_dir / _dir)):
+        if theme_dir_name in get_theme_dirs(themes_dir):
             return themes_dir
 
     if suppress_error:
@@ -187,8 +192,42 @@ def get_themes(themes_dir=None):
 def get_theme_dirs(themes_dir=None):
     """
     Return all theme dirs in given dir.
+
+    The theme dirs of each themes dir are indexed in memory when first requested (i.e. by `enable_theming`, at
+    startup), and listed again only when the modification time of the themes dir changes, which is the case when
+    a theme is added, removed or renamed.
+    """
+    global _theme_dirs_version  # pylint: disable=global-statement
+
+    themes_dir = Path(themes_dir)
+    mtime = os.stat(themes_dir).st_mtime
+    entry = _theme_dirs_index.get(themes_dir)
+
+    if entry is None or entry[0] != mtime:
+        theme_dirs = [_dir for _dir in os.listdir(themes_dir) if is_theme_dir(themes_dir / _dir)]
+        if entry is None or entry[1] != theme_dirs:
+            _theme_dirs_version += 1
+        entry = _theme_dirs_index[themes_dir] = (mtime, theme_dirs)
+
+    return list(entry[1])
+
+
+def get_theme_dirs_version():
+    """
+    Return a number that changes whenever the theme dirs found in any themes dir change, so that anything cached
+    per theme can be discarded.
     """
-    return [_dir for _dir in os.listdir(themes_dir) if is_theme_dir(themes_dir / _dir)]
+    return _theme_dirs_version
+
+
+def clear_theme_dirs_index():
+    """
+    Discard the indexed theme dirs of all themes dirs.
+    """
+    global _theme_dirs_version  # pylint: disable=global-statement
+
+    _theme_dirs_index.clear()
+    _theme_dirs_version += 1
 
 
 def is_theme_dir(_dir):
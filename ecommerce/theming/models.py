@@ -1,6 +1,14 @@
 from django.db import models
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import cache
+
+
+def get_site_theme_cache_key(site_id):
+    """
+    Returns the key under which the theme of the given site is cached.
+    """
+    return 'site_theme_{}'.format(site_id)
 
 
 class SiteTheme(models.Model):
@@ -20,6 +28,9 @@ class SiteTheme(models.Model):
         Get SiteTheme object for given site, returns default site theme if it can not
         find a theme for the given site and `DEFAULT_SITE_THEME` setting has a proper value.
 
+        The theme of each site is cached for `SITE_THEME_CACHE_TIMEOUT` seconds, and invalidated
+        when a SiteTheme of the site is saved or deleted.
+
         Args:
             site (django.contrib.sites.models.Site): site object related to the current site.
 
@@ -29,7 +40,16 @@ class SiteTheme(models.Model):
         if not site:
             return None
 
-        theme = site.themes.first()
+        cache_key = get_site_theme_cache_key(site.id)
+        theme = cache.get(cache_key)
+
+        if theme is None:
+            # Sites without a theme are cached as False, to tell them apart from sites that are not cached.
+            theme = site.themes.first() or False
+            if settings.SITE_THEME_CACHE_TIMEOUT:
+                cache.set(cache_key, theme, settings.SITE_THEME_CACHE_TIMEOUT)
+
+        theme = theme or None
 
         if (not theme) and settings.DEFAULT_SITE_THEME:
             theme = SiteTheme(site=site, theme_dir_name=settings.DEFAULT_SITE_THEME)
@@ -0,0 +1,20 @@
+import logging
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ecommerce.theming.models import SiteTheme, get_site_theme_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=SiteTheme)
+@receiver(post_delete, sender=SiteTheme)
+def invalidate_site_theme(*_args, **kwargs):
+    """
+    When a site theme is changed, the cached theme of its site must be discarded.
+    """
+    site_theme = kwargs['instance']
+    cache.delete(get_site_theme_cache_key(site_theme.site_id))
+    logger.info('Invalidated the cached theme of site [%d].', site_theme.site_id)
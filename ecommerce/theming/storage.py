@@ -2,13 +2,22 @@
 Comprehensive Theming support for Django's collectstatic functionality.
 See https://docs.djangoproject.com/en/1.8/ref/contrib/staticfiles/
 """
+import hashlib
+import json
+import logging
 import os.path
 
 from django.conf import settings
+from django.core.files.base import ContentFile
 from django.utils._os import safe_join
+from django.utils.functional import cached_property
 from django.contrib.staticfiles.storage import StaticFilesStorage
 
-from ecommerce.theming.helpers import get_current_theme, get_theme_base_dir, is_comprehensive_theming_enabled
+from ecommerce.theming.helpers import (
+    get_current_theme, get_theme_base_dir, get_themes, is_comprehensive_theming_enabled
+)
+
+logger = logging.getLogger(__name__)
 
 
 class ThemeStorage(StaticFilesStorage):
@@ -21,6 +30,10 @@ class ThemeStorage(StaticFilesStorage):
     # instead of "images/logo.png"
     prefix = None
 
+    # name of the manifest, written by collectstatic, of the assets overridden by each theme.
+    theme_manifest_name = 'themes.json'
+    theme_manifest_version = '1.0'
+
     def __init__(self, location=None, base_url=None, file_permissions_mode=None,
                  directory_permissions_mode=None, prefix=None):
 
@@ -55,12 +68,37 @@ class ThemeStorage(StaticFilesStorage):
         elif self.prefix:
             prefix = self.prefix
 
-        # join theme prefix with asset name if theme is applied and themed asset exists
-        if prefix and self.themed(name, prefix):
-            name = os.path.join(prefix, name)
+        # use the themed asset if theme is applied and themed asset exists
+        if prefix:
+            name = self.themed_name(name, prefix) or name
 
         return super(ThemeStorage, self).url(name)
 
+    def themed_name(self, name, theme):
+        """
+        Returns the name under which the given theme's override of the asset is stored.
+
+        Outside of debug mode, overrides are looked up in the theme manifest written by collectstatic, and their
+        names include a hash of their content. If there is no manifest, the static files dir is checked instead.
+
+        Args:
+            name: asset name e.g. 'images/logo.png'
+            theme: theme name e.g. 'red-theme', 'edx.org'
+
+        Returns:
+            name of the themed asset, e.g. 'red-theme/images/logo.5f3a7e1c0b2d.png', or None if the asset is not
+            overridden by the given theme
+        """
+        if not settings.DEBUG and self.theme_manifest is not None:
+            if not is_comprehensive_theming_enabled():
+                return None
+            return self.theme_manifest.get(theme, {}).get(name)
+
+        if self.themed(name, theme):
+            return os.path.join(theme, name)
+
+        return None
+
     def themed(self, name, theme):
         """
         Returns True if given asset override is provided by the given theme otherwise returns False.
@@ -92,3 +130,77 @@ class ThemeStorage(StaticFilesStorage):
         # in live mode check static asset in the static files dir defined by "STATIC_ROOT" setting
         else:
             return self.exists(os.path.join(theme, name))
+
+    @cached_property
+    def theme_manifest(self):
+        """
+        Returns the theme manifest, mapping the name of each asset overridden by each theme to the name of its
+        hashed copy, or None if collectstatic has not written a manifest.
+        """
+        try:
+            with self.open(self.theme_manifest_name) as manifest:
+                content = json.loads(manifest.read().decode('utf-8'))
+        except IOError:
+            return None
+        except ValueError:
+            logger.exception('Theme manifest [%s] could not be read.', self.theme_manifest_name)
+            return None
+
+        if content.get('version') != self.theme_manifest_version:
+            logger.warning('Theme manifest [%s] has unsupported version [%s].',
+                           self.theme_manifest_name, content.get('version'))
+            return None
+
+        return content['themes']
+
+    def hashed_name(self, name, content):
+        """
+        Returns the name of the asset, with a hash of the given content inserted before its extension.
+        """
+        root, ext = os.path.splitext(name)
+        return '{root}.{hash}{ext}'.format(root=root, hash=hashlib.md5(content).hexdigest()[:12], ext=ext)
+
+    def post_process(self, paths, dry_run=False, **options):  # pylint: disable=unused-argument
+        """
+        Saves a copy of each themed asset, under a name that includes a hash of its content, and writes the theme
+        manifest used to look up themed assets without checking the static files dir.
+
+        Args:
+            paths: dict of the collected assets, keyed by the path to which they were collected
+                e.g. 'red-theme/images/logo.png'
+            dry_run: if True, nothing is saved
+
+        Yields:
+            tuples of the original path, the hashed path, and True, for each themed asset
+        """
+        if dry_run:
+            return
+
+        themes = {theme.theme_dir_name for theme in get_themes()}
+        manifest = {}
+
+        for path in sorted(paths):
+            theme, __, name = path.partition('/')
+            if theme not in themes or not name:
+                continue
+
+            with self.open(path) as asset:
+                content = asset.read()
+
+            hashed_path = self.hashed_name(path, content)
+            if self.exists(hashed_path):
+                self.delete(hashed_path)
+            self.save(hashed_path, ContentFile(content))
+
+            manifest.setdefault(theme, {})[name] = hashed_path
+            yield path, hashed_path, True
+
+        if self.exists(self.theme_manifest_name):
+            self.delete(self.theme_manifest_name)
+        self.save(self.theme_manifest_name, ContentFile(json.dumps({
+            'version': self.theme_manifest_version,
+            'themes': manifest,
+        }, indent=2, sort_keys=True)))
+
+        # Discard the manifest loaded before collectstatic ran, if any.
+        self.__dict__.pop('theme_manifest', None)
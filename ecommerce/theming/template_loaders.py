@@ -3,11 +3,13 @@ Theming aware template loaders.
 """
 from django.utils._os import safe_join
 from django.core.exceptions import SuspiciousFileOperation
+from django.template.loaders.cached import Loader as CachedLoader
 from django.template.loaders.filesystem import Loader as FilesystemLoader
 
 from threadlocals.threadlocals import get_current_request
 
-from ecommerce.theming.helpers import get_current_theme, get_all_theme_template_dirs
+from ecommerce.theming import helpers
+from ecommerce.theming.helpers import get_current_theme, get_all_theme_template_dirs, get_theme_dirs_version
 
 
 class ThemeTemplateLoader(FilesystemLoader):
@@ -53,3 +55,40 @@ class ThemeTemplateLoader(FilesystemLoader):
             # if request object is not present, then this method is being called inside a management
             # command and return all theme template sources for compression
             return get_all_theme_template_dirs()
+
+
+class ThemeCachedTemplateLoader(CachedLoader):  # pylint: disable=abstract-method
+    """
+    Cached Template loader that caches templates separately for each theme.
+
+    Django's cached loader keys its cache by template name only, so a template found in the theme of the first site
+    to render it would be served to every other site. Templates are instead cached by theme directory name and
+    template name, and the whole cache is discarded whenever themes are added, removed or renamed.
+    """
+    def __init__(self, engine, loaders):
+        self.theme_dirs_version = None
+        super(ThemeCachedTemplateLoader, self).__init__(engine, loaders)
+
+    def cache_key(self, template_name, template_dirs):
+        """
+        Returns the key of the template for the current theme.
+
+        The theme is identified by the directory name of the current site's theme, which, unlike the current
+        theme, is looked up without accessing the filesystem.
+        """
+        if get_current_request():
+            site_theme = helpers.get_current_site_theme()
+            theme_dir_name = site_theme.theme_dir_name if site_theme else ''
+        else:
+            # Outside of requests (e.g. in management commands) templates are looked up in all themes.
+            theme_dir_name = None
+
+        return theme_dir_name, super(ThemeCachedTemplateLoader, self).cache_key(template_name, template_dirs)
+
+    def load_template(self, template_name, template_dirs=None):
+        theme_dirs_version = get_theme_dirs_version()
+        if theme_dirs_version != self.theme_dirs_version:
+            self.reset()
+            self.theme_dirs_version = theme_dirs_version
+
+        return super(ThemeCachedTemplateLoader, self).load_template(template_name, template_dirs)
@@ -1,7 +1,12 @@
 """
 Tests of comprehensive theming.
 """
+import os
+import shutil
+import tempfile
+
 from mock import patch
+from path import Path
 
 from django.test import override_settings
 from django.conf import settings, ImproperlyConfigured
@@ -9,7 +14,7 @@ from django.conf import settings, ImproperlyConfigured
 from ecommerce.tests.testcases import TestCase
 from ecommerce.theming.helpers import (
     get_themes, Theme, get_current_theme, get_current_site_theme,
-    get_all_theme_template_dirs, get_theme_base_dirs, get_theme_base_dir,
+    get_all_theme_template_dirs, get_theme_base_dirs, get_theme_base_dir, get_theme_dirs, clear_theme_dirs_index,
 )
 from ecommerce.theming.test_utils import with_comprehensive_theme
 
@@ -189,3 +194,25 @@ class TestHelpers(TestCase):
         Tests get_theme_base_dir returns None if theme is not found istead of raising an error.
         """
         self.assertIsNone(get_theme_base_dir("non-existent-theme", suppress_error=True))
+
+    def test_get_theme_dirs_index(self):
+        """
+        Tests get_theme_dirs lists a themes dir again only after its modification time changes.
+        """
+        themes_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, themes_dir)
+        self.addCleanup(clear_theme_dirs_index)
+        os.makedirs(themes_dir / 'red-theme' / 'templates')
+        os.makedirs(themes_dir / 'not-a-theme')
+
+        self.assertEqual(get_theme_dirs(themes_dir), ['red-theme'])
+
+        with patch('ecommerce.theming.helpers.os.listdir') as mock_listdir:
+            self.assertEqual(get_theme_dirs(themes_dir), ['red-theme'])
+            self.assertFalse(mock_listdir.called)
+
+        os.makedirs(themes_dir / 'blue-theme' / 'static')
+        mtime = os.stat(themes_dir).st_mtime
+        os.utime(themes_dir, (mtime + 1, mtime + 1))
+
+        self.assertItemsEqual(get_theme_dirs(themes_dir), ['red-theme', 'blue-theme'])
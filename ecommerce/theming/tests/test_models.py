@@ -0,0 +1,54 @@
+"""
+Tests for theming models.
+"""
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.test import override_settings
+
+from ecommerce.tests.testcases import TestCase
+from ecommerce.theming.models import SiteTheme
+
+
+@override_settings(SITE_THEME_CACHE_TIMEOUT=60)
+class SiteThemeTests(TestCase):
+    """
+    Tests for SiteTheme.
+    """
+
+    def setUp(self):
+        super(SiteThemeTests, self).setUp()
+        self.addCleanup(cache.clear)
+        self.test_site, __ = Site.objects.get_or_create(domain='themed.org', name='themed.org')
+
+    def test_get_theme_cached(self):
+        """
+        Tests the theme of a site is retrieved from the database only once.
+        """
+        site_theme = SiteTheme.objects.create(site=self.test_site, theme_dir_name='test-theme-2')
+
+        self.assertEqual(SiteTheme.get_theme(self.test_site), site_theme)
+        with self.assertNumQueries(0):
+            self.assertEqual(SiteTheme.get_theme(self.test_site), site_theme)
+
+    @override_settings(DEFAULT_SITE_THEME=None)
+    def test_get_theme_without_theme_cached(self):
+        """
+        Tests sites without a theme are cached too.
+        """
+        self.assertIsNone(SiteTheme.get_theme(self.test_site))
+        with self.assertNumQueries(0):
+            self.assertIsNone(SiteTheme.get_theme(self.test_site))
+
+    def test_get_theme_invalidated(self):
+        """
+        Tests the cached theme of a site is discarded when a theme of the site is saved or deleted.
+        """
+        site_theme = SiteTheme.objects.create(site=self.test_site, theme_dir_name='test-theme-2')
+        SiteTheme.get_theme(self.test_site)
+
+        site_theme.theme_dir_name = 'test-theme-3'
+        site_theme.save()
+        self.assertEqual(SiteTheme.get_theme(self.test_site).theme_dir_name, 'test-theme-3')
+
+        site_theme.delete()
+        self.assertEqual(SiteTheme.get_theme(self.test_site).theme_dir_name, 'test-theme')
@@ -1,10 +1,15 @@
 """
 Tests for comprehensive theme static files storage classes.
 """
+import json
+import shutil
+import tempfile
+
 from mock import patch
 
 from django.test import override_settings
 from django.conf import settings
+from django.core.files.base import ContentFile
 
 from ecommerce.tests.testcases import TestCase
 from ecommerce.theming.storage import ThemeStorage
@@ -82,3 +87,76 @@ class TestThemeStorage(TestCase):
             expected_path = self.themes_dir / self.enabled_theme / "static" / asset
 
             self.assertEqual(expected_path, returned_path)
+
+
+@override_settings(DEBUG=False)
+class TestThemeStorageManifest(TestCase):
+    """
+    Test the theme manifest written, and used, by comprehensive theming static files storage.
+    """
+
+    def setUp(self):
+        super(TestThemeStorageManifest, self).setUp()
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+        self.enabled_theme = "test-theme"
+        self.storage = ThemeStorage(location=self.static_root, base_url='/static/')
+
+        # Assets as they are saved by collectstatic.
+        self.paths = ["images/default-logo.png", "test-theme/images/default-logo.png", "images/cap.png"]
+        for path in self.paths:
+            self.storage.save(path, ContentFile(path))
+
+    def collect(self):
+        return list(self.storage.post_process({path: (None, path) for path in self.paths}))
+
+    def test_post_process(self):
+        """
+        Verify hashed copies of themed assets, and the theme manifest, are saved.
+        """
+        processed = self.collect()
+        hashed_path = self.storage.hashed_name(
+            "test-theme/images/default-logo.png", "test-theme/images/default-logo.png"
+        )
+
+        self.assertEqual(processed, [("test-theme/images/default-logo.png", hashed_path, True)])
+        self.assertTrue(self.storage.exists(hashed_path))
+        with self.storage.open(ThemeStorage.theme_manifest_name) as manifest:
+            self.assertEqual(json.loads(manifest.read())['themes'], {
+                self.enabled_theme: {"images/default-logo.png": hashed_path},
+            })
+
+    def test_post_process_dry_run(self):
+        """
+        Verify nothing is saved during a dry run.
+        """
+        self.assertEqual(list(self.storage.post_process({path: (None, path) for path in self.paths}, True)), [])
+        self.assertFalse(self.storage.exists(ThemeStorage.theme_manifest_name))
+
+    def test_url(self):
+        """
+        Verify themed asset urls are looked up in the manifest, without checking whether the themed asset exists.
+        """
+        self.collect()
+        storage = ThemeStorage(location=self.static_root, base_url='/static/')
+        theme = Theme(self.enabled_theme, self.enabled_theme, get_theme_base_dir(self.enabled_theme))
+
+        with patch("ecommerce.theming.storage.get_current_theme", return_value=theme):
+            with patch.object(ThemeStorage, "exists") as mock_exists:
+                self.assertEqual(
+                    storage.url("images/default-logo.png"),
+                    "/static/" + storage.theme_manifest[self.enabled_theme]["images/default-logo.png"]
+                )
+                self.assertEqual(storage.url("images/cap.png"), "/static/images/cap.png")
+                self.assertFalse(mock_exists.called)
+
+    def test_url_without_manifest(self):
+        """
+        Verify the static files dir is checked for themed assets if there is no manifest.
+        """
+        theme = Theme(self.enabled_theme, self.enabled_theme, get_theme_base_dir(self.enabled_theme))
+
+        with patch("ecommerce.theming.storage.get_current_theme", return_value=theme):
+            self.assertIsNone(self.storage.theme_manifest)
+            self.assertEqual(self.storage.url("images/default-logo.png"), "/static/test-theme/images/default-logo.png")
+            self.assertEqual(self.storage.url("images/cap.png"), "/static/images/cap.png")
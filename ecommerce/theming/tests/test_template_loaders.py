@@ -0,0 +1,81 @@
+"""
+Tests for theming template loaders.
+"""
+from django.template import engines
+from django.test import RequestFactory
+from mock import patch
+
+from ecommerce.tests.testcases import TestCase
+from ecommerce.theming.helpers import clear_theme_dirs_index
+from ecommerce.theming.template_loaders import ThemeCachedTemplateLoader, ThemeTemplateLoader
+from ecommerce.theming.test_utils import with_comprehensive_theme
+
+TEMPLATE_NAME = 'dashboard/index.html'
+
+
+class TestThemeCachedTemplateLoader(TestCase):
+    """
+    Test ThemeCachedTemplateLoader caches templates for each theme.
+    """
+
+    def setUp(self):
+        super(TestThemeCachedTemplateLoader, self).setUp()
+        # Templates are looked up in the theme of the current site only while processing a request.
+        patcher = patch(
+            'ecommerce.theming.template_loaders.get_current_request', return_value=RequestFactory().get('/')
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.loader = ThemeCachedTemplateLoader(engines['django'].engine, [
+            'ecommerce.theming.template_loaders.ThemeTemplateLoader',
+            'django.template.loaders.app_directories.Loader',
+        ])
+
+    @with_comprehensive_theme('test-theme')
+    def test_templates_cached(self):
+        """
+        Test templates are read from the filesystem only once.
+        """
+        self.loader.load_template(TEMPLATE_NAME)
+
+        with patch.object(ThemeTemplateLoader, 'load_template_source') as mock_load_template_source:
+            self.loader.load_template(TEMPLATE_NAME)
+            self.assertFalse(mock_load_template_source.called)
+
+    def test_templates_cached_per_theme(self):
+        """
+        Test templates found for one theme are not used for other themes.
+        """
+        @with_comprehensive_theme('test-theme')
+        def load_test_theme_template():
+            return self.loader.load_template(TEMPLATE_NAME)[0]
+
+        @with_comprehensive_theme('test-theme-2')
+        def load_test_theme_2_template():
+            return self.loader.load_template(TEMPLATE_NAME)[0]
+
+        test_theme_template = load_test_theme_template()
+        test_theme_2_template = load_test_theme_2_template()
+
+        self.assertIsNot(test_theme_template, test_theme_2_template)
+        self.assertIs(load_test_theme_template(), test_theme_template)
+        self.assertIs(load_test_theme_2_template(), test_theme_2_template)
+
+    @with_comprehensive_theme('test-theme')
+    def test_cache_key_does_not_read_filesystem(self):
+        """
+        Test the cache key is computed from the site theme, without looking the theme up on the filesystem.
+        """
+        with patch('ecommerce.theming.template_loaders.get_current_theme') as mock_get_current_theme:
+            self.assertEqual(self.loader.cache_key(TEMPLATE_NAME, None)[0], 'test-theme')
+            self.assertFalse(mock_get_current_theme.called)
+
+    @with_comprehensive_theme('test-theme')
+    def test_cache_cleared_when_themes_change(self):
+        """
+        Test cached templates are discarded when the theme dirs change.
+        """
+        template = self.loader.load_template(TEMPLATE_NAME)[0]
+        clear_theme_dirs_index()
+        self.assertIsNot(self.loader.load_template(TEMPLATE_NAME)[0], template)
@@ -55,6 +55,7 @@ urlpatterns = AUTH_URLS + [
     url(r'^health/$', core_views.health, name='health'),
     url(r'^i18n/', include('django.conf.urls.i18n')),
     url(r'^jsi18n/$', 'django.views.i18n.javascript_catalog', js_info_dict),
+    url(r'^metrics/$', core_views.MetricsView.as_view(), name='metrics'),
 ]
 
 # Install Oscar extension URLs